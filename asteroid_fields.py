@@ -0,0 +1,110 @@
+"""
+Asteroid Fields
+Finite ore reserves for mining locations. Mining depletes a field's
+reserves; they grow back towards capacity over game time. Regrowth is
+not ticked - a field's reserves are brought up to date in closed form
+when the field is next mined or inspected, so idle fields cost nothing.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional
+
+from data import LOCATIONS
+from config import ASTEROID_RESERVE_CAPACITY, ASTEROID_REGEN_HALF_LIFE
+
+
+class AsteroidField:
+    """Reserves of one mining location, one slot per resource"""
+
+    __slots__ = ("location_id", "resources", "reserves", "capacity", "last_update")
+
+    def __init__(self, location_id: str, game_time: float = 0, reserves: Optional[List[float]] = None):
+        self.location_id = location_id
+        self.resources = tuple(LOCATIONS[location_id].get("resources", []))
+        self.capacity = ASTEROID_RESERVE_CAPACITY
+        self.reserves = array("d", reserves if reserves is not None else [self.capacity] * len(self.resources))
+        self.last_update = game_time
+
+    def regenerate(self, game_time: float):
+        """
+        Bring reserves up to game_time. Each reserve closes the gap to
+        capacity exponentially: half of what is missing grows back every
+        ASTEROID_REGEN_HALF_LIFE game seconds.
+        """
+        elapsed = game_time - self.last_update
+        if elapsed <= 0:
+            return
+        self.last_update = game_time
+
+        remaining = math.exp(-math.log(2) * elapsed / ASTEROID_REGEN_HALF_LIFE)
+        capacity = self.capacity
+        reserves = self.reserves
+        for index in range(len(reserves)):
+            reserves[index] = capacity - (capacity - reserves[index]) * remaining
+
+    def available(self, resource_id: str) -> int:
+        """Whole units of a resource left in the field"""
+        return int(self.reserves[self.resources.index(resource_id)])
+
+    def extract(self, resource_id: str, quantity: int) -> int:
+        """Take up to quantity units. Returns the amount taken."""
+        index = self.resources.index(resource_id)
+        taken = min(quantity, int(self.reserves[index]))
+        self.reserves[index] -= taken
+        return taken
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Reserves by resource for display"""
+        return {
+            resource_id: {"reserve": int(reserve), "capacity": self.capacity,
+                          "percent": reserve / self.capacity * 100 if self.capacity else 0}
+            for resource_id, reserve in zip(self.resources, self.reserves)
+        }
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "reserves": dict(zip(self.resources, (round(r, 3) for r in self.reserves))),
+            "last_update": self.last_update
+        }
+
+    @classmethod
+    def from_dict(cls, location_id: str, data: Dict) -> 'AsteroidField':
+        """Create from saved data (resources added since the save start full)"""
+        field = cls(location_id, data.get("last_update", 0))
+        saved = data.get("reserves", {})
+        for index, resource_id in enumerate(field.resources):
+            if resource_id in saved:
+                field.reserves[index] = min(field.capacity, saved[resource_id])
+        return field
+
+
+class AsteroidFieldManager:
+    """Reserves of every field that has been mined. Untouched fields are full."""
+
+    def __init__(self):
+        self.fields: Dict[str, AsteroidField] = {}
+
+    def get_field(self, location_id: str, game_time: float) -> AsteroidField:
+        """A location's field, regenerated up to game_time"""
+        field = self.fields.get(location_id)
+        if field is None:
+            field = AsteroidField(location_id, game_time)
+            self.fields[location_id] = field
+        else:
+            field.regenerate(game_time)
+        return field
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {location_id: field.to_dict() for location_id, field in self.fields.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AsteroidFieldManager':
+        """Create from saved data"""
+        manager = cls()
+        for location_id, field_data in data.items():
+            if location_id in LOCATIONS:
+                manager.fields[location_id] = AsteroidField.from_dict(location_id, field_data)
+        return manager
@@ -1,10 +1,15 @@
 """
 Shipyard Berth System
-Manages ship storage slots at different locations
+Manages ship storage slots at different locations. The berths only count
+slots; the ships in them are Vessel instances in the fleet registry, and
+occupancy is read from its location index.
 """
 
 from typing import Dict, List, Optional, Tuple
 
+from fleet import FleetRegistry
+from vessels import Vessel
+
 
 class BerthManager:
     """Manages shipyard berths for storing multiple ships"""
@@ -17,15 +22,16 @@ class BerthManager:
         "planet": 40000,           # Planet-side shipyards
     }
 
-    def __init__(self):
-        # Structure: {location_id: {"berths": [ship_id or None, ...], "max_berths": int}}
+    def __init__(self, fleet: Optional[FleetRegistry] = None):
+        # Structure: {location_id: {"berth_count": int, "max_berths": int, "location_type": str}}
         self.shipyards: Dict[str, Dict] = {}
+        self.fleet = fleet if fleet is not None else FleetRegistry()
 
     def initialize_shipyard(self, location_id: str, location_type: str = "standard_station", starting_berths: int = 1):
         """Initialize a shipyard at a location"""
         if location_id not in self.shipyards:
             self.shipyards[location_id] = {
-                "berths": [None] * starting_berths,  # Start with 1 free berth
+                "berth_count": starting_berths,  # Start with 1 free berth
                 "max_berths": 10,  # Maximum berths that can be purchased
                 "location_type": location_type,
             }
@@ -39,7 +45,7 @@ class BerthManager:
         base_price = self.BERTH_PRICES.get(location_type, 35000)
 
         # Price increases with number of berths owned
-        current_berths = len(self.shipyards[location_id]["berths"])
+        current_berths = self.shipyards[location_id]["berth_count"]
         multiplier = 1.0 + (current_berths * 0.2)  # 20% more per berth
 
         return int(base_price * multiplier)
@@ -49,34 +55,27 @@ class BerthManager:
         if location_id not in self.shipyards:
             return False
 
-        return None in self.shipyards[location_id]["berths"]
+        return self.fleet.count_at(location_id) < self.shipyards[location_id]["berth_count"]
 
     def get_empty_berth_index(self, location_id: str) -> Optional[int]:
-        """Get index of first empty berth"""
-        if location_id not in self.shipyards:
-            return None
-
-        berths = self.shipyards[location_id]["berths"]
-        try:
-            return berths.index(None)
-        except ValueError:
+        """Get index of first empty berth (ships fill berths in the order they arrived)"""
+        if not self.has_empty_berth(location_id):
             return None
+        return self.fleet.count_at(location_id)
 
     def get_berth_count(self, location_id: str) -> Tuple[int, int]:
         """Get (used_berths, total_berths) at location"""
         if location_id not in self.shipyards:
             return (0, 0)
 
-        berths = self.shipyards[location_id]["berths"]
-        used = sum(1 for b in berths if b is not None)
-        return (used, len(berths))
+        return (self.fleet.count_at(location_id), self.shipyards[location_id]["berth_count"])
 
     def can_purchase_berth(self, location_id: str) -> bool:
         """Check if player can buy another berth at this location"""
         if location_id not in self.shipyards:
             return False
 
-        current_count = len(self.shipyards[location_id]["berths"])
+        current_count = self.shipyards[location_id]["berth_count"]
         max_berths = self.shipyards[location_id]["max_berths"]
 
         return current_count < max_berths
@@ -99,58 +98,53 @@ class BerthManager:
             return False, f"Insufficient credits. Berth costs {cost:,} CR", 0
 
         # Add new berth
-        self.shipyards[location_id]["berths"].append(None)
+        self.shipyards[location_id]["berth_count"] += 1
 
         return True, f"Purchased berth for {cost:,} CR", cost
 
-    def store_ship(self, location_id: str, ship_id: str, berth_index: Optional[int] = None) -> Tuple[bool, str]:
+    def store_vessel(self, location_id: str, vessel: Vessel) -> Tuple[bool, str, Optional[str]]:
         """
-        Store a ship in a berth
-        Returns: (success, message)
+        Store a ship instance in a free berth
+        Returns: (success, message, fleet id)
         """
         if location_id not in self.shipyards:
-            return False, "No shipyard at this location"
-
-        if berth_index is None:
-            berth_index = self.get_empty_berth_index(location_id)
+            return False, "No shipyard at this location", None
 
+        berth_index = self.get_empty_berth_index(location_id)
         if berth_index is None:
-            return False, "No empty berths available"
-
-        berths = self.shipyards[location_id]["berths"]
-
-        if berth_index >= len(berths):
-            return False, "Invalid berth index"
+            return False, "No empty berths available", None
 
-        if berths[berth_index] is not None:
-            return False, "Berth already occupied"
+        uid = self.fleet.add(vessel, location_id)
+        return True, f"Ship stored in berth {berth_index + 1}", uid
 
-        berths[berth_index] = ship_id
-        return True, f"Ship stored in berth {berth_index + 1}"
+    def store_ship(self, location_id: str, ship_id: str) -> Tuple[bool, str]:
+        """
+        Store a new ship of a class (fresh from the yard) in a free berth
+        Returns: (success, message)
+        """
+        success, message, _ = self.store_vessel(location_id, Vessel(ship_id))
+        return success, message
 
     def remove_ship(self, location_id: str, ship_id: str) -> Tuple[bool, str]:
         """
-        Remove a ship from its berth
+        Remove a ship from its berth - ship_id is a fleet id, or a class id
+        for any ship of that class berthed here other than the piloted one
         Returns: (success, message)
         """
         if location_id not in self.shipyards:
             return False, "No shipyard at this location"
 
-        berths = self.shipyards[location_id]["berths"]
-
-        try:
-            berth_index = berths.index(ship_id)
-            berths[berth_index] = None
-            return True, f"Ship removed from berth {berth_index + 1}"
-        except ValueError:
+        uid = ship_id if self.fleet.location_of(ship_id) == location_id else self.fleet.find(location_id, ship_id)
+        if uid is None:
             return False, "Ship not found in this shipyard"
 
-    def get_ships_at_location(self, location_id: str) -> List[str]:
-        """Get list of ship IDs stored at this location"""
-        if location_id not in self.shipyards:
-            return []
+        berth_index = self.fleet.ships_at(location_id).index(uid)
+        self.fleet.remove(uid)
+        return True, f"Ship removed from berth {berth_index + 1}"
 
-        return [ship_id for ship_id in self.shipyards[location_id]["berths"] if ship_id is not None]
+    def get_ships_at_location(self, location_id: str) -> List[str]:
+        """Get list of ship class IDs stored at this location"""
+        return [self.fleet.ships[uid].vessel_class_id for uid in self.fleet.ships_at(location_id)]
 
     def get_berth_overview(self, location_id: str) -> Dict:
         """Get overview of berths at location"""
@@ -167,9 +161,23 @@ class BerthManager:
         shipyard = self.shipyards[location_id]
         used, total = self.get_berth_count(location_id)
 
+        ships = []
+        for uid in self.fleet.ships_at(location_id):
+            vessel = self.fleet.ships[uid]
+            ships.append({
+                "uid": uid,
+                "vessel_class_id": vessel.vessel_class_id,
+                "name": vessel.name,
+                "hull_percent": vessel.get_hull_percentage(),
+                "modules": sum(len(module_ids) for module_ids in vessel.installed_modules.values()),
+                "active": uid == self.fleet.active_uid
+            })
+        empty = [None] * max(0, total - used)
+
         return {
             "exists": True,
-            "berths": shipyard["berths"].copy(),
+            "berths": [ship["vessel_class_id"] for ship in ships] + empty,
+            "ships": ships + empty,
             "used": used,
             "total": total,
             "can_purchase": self.can_purchase_berth(location_id),
@@ -180,14 +188,27 @@ class BerthManager:
     def to_dict(self) -> Dict:
         """Serialize berth data for saving"""
         return {
-            "shipyards": self.shipyards
+            "shipyards": self.shipyards,
+            "fleet": self.fleet.to_dict()
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'BerthManager':
-        """Load berth data from save"""
-        manager = cls()
-        manager.shipyards = data.get("shipyards", {})
+        """
+        Load berth data from save. Saves from before the fleet registry list
+        a class id per occupied berth; each becomes a fresh ship of that class.
+        """
+        manager = cls(FleetRegistry.from_dict(data.get("fleet", {})))
+        for location_id, shipyard in data.get("shipyards", {}).items():
+            if "berths" in shipyard:
+                shipyard = dict(shipyard)
+                berths = shipyard.pop("berths")
+                shipyard["berth_count"] = len(berths)
+                if "fleet" not in data:
+                    for ship_id in berths:
+                        if ship_id is not None:
+                            manager.fleet.add(Vessel(ship_id), location_id)
+            manager.shipyards[location_id] = shipyard
         return manager
 
 
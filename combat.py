@@ -3,10 +3,116 @@ Combat System
 Handles tactical vessel combat
 """
 
-import random
-from typing import Dict, List, Optional
-from vessels import Vessel
-from data import MODULES, RAW_RESOURCES, RESOURCES, COMMODITIES
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from vessels import Vessel, NPCVessel
+from data import COMMODITIES
+from rng_service import get_stream
+from sampling import (loot_module_table, raw_ore_table, refined_resource_table, commodity_table,
+                      enemy_name_table, enemy_ship_table)
+
+_rng = get_stream("combat")
+
+# NPC prototypes by (vessel class, modules installed in order)
+_npc_prototypes: Dict[Tuple[str, Tuple[str, ...]], NPCVessel] = {}
+
+COMBAT_LOG_SIZE = 50  # Events kept per encounter
+
+
+class CombatEvent:
+    """
+    One combat action (an attack, a destruction, a retreat or a repair).
+    Only the numbers are stored; render() builds the log text when it is
+    actually displayed.
+    """
+
+    __slots__ = ("turn", "kind", "actor", "weapons", "damage", "shield_damage",
+                 "hull_damage", "critical", "success")
+
+    def __init__(self, turn: int, kind: str, actor: str, weapons: Tuple = (), damage: float = 0,
+                 shield_damage: float = 0, hull_damage: float = 0, critical: bool = False,
+                 success: bool = True):
+        self.turn = turn
+        self.kind = kind  # player_attack, enemy_attack, destroyed, retreat or repair
+        self.actor = actor
+        self.weapons = weapons  # (weapon name, damage or None on a miss, critical) per weapon
+        self.damage = damage
+        self.shield_damage = shield_damage
+        self.hull_damage = hull_damage
+        self.critical = critical
+        self.success = success
+
+    @property
+    def hits(self) -> int:
+        return sum(1 for _, damage, _ in self.weapons if damage is not None)
+
+    def render(self) -> str:
+        """Log text for the event"""
+        if self.kind == "destroyed":
+            return "Your vessel has been destroyed!" if self.actor == "player" else f"Enemy {self.actor} destroyed!"
+        if self.kind == "retreat":
+            return "Successfully retreated from combat!" if self.success else "Retreat failed! Enemy blocked your escape."
+        if self.kind == "repair":
+            return f"Repaired {self.damage:.0f} hull damage"
+
+        hits = self.hits
+        weapon_count = len(self.weapons)
+        if hits == 0:
+            if self.kind == "player_attack":
+                return f"All weapons missed! ({weapon_count} weapons)"
+            return f"Enemy {self.actor}'s weapons all missed! ({weapon_count} weapons)"
+
+        if self.kind == "player_attack":
+            msg = f"{'CRITICAL! ' if self.critical else ''}{hits}/{weapon_count} weapons hit for {self.damage:.0f} total damage!"
+        else:
+            msg = f"Enemy {self.actor} fired {hits}/{weapon_count} weapons for {self.damage:.0f} total damage!"
+
+        if self.shield_damage > 0:
+            msg += f"\n  └─ {self.shield_damage:.0f} to shields"
+        if self.hull_damage > 0:
+            msg += f"\n  └─ {self.hull_damage:.0f} to hull"
+
+        details = []
+        for name, damage, is_crit in self.weapons:
+            if damage is None:
+                details.append(f"{name}: MISS")
+            else:
+                details.append(f"{name}: {damage:.0f}{' [CRIT]' if is_crit else ''}")
+        msg += f"\n  Weapons: {', '.join(details)}"
+        return msg
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+class CombatLog:
+    """Fixed-size ring buffer of combat events; the oldest drop off"""
+
+    def __init__(self, size: int = COMBAT_LOG_SIZE):
+        self.events: deque = deque(maxlen=size)
+
+    def append(self, event: CombatEvent):
+        self.events.append(event)
+
+    def recent(self, last_n: int = 5) -> List[CombatEvent]:
+        """Most recent events, oldest first"""
+        if last_n <= 0:
+            return []
+        count = len(self.events)
+        return [self.events[i] for i in range(max(0, count - last_n), count)]
+
+    def render(self, last_n: int = 5) -> List[str]:
+        """Text of the most recent events"""
+        return [event.render() for event in self.recent(last_n)]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+def result_text(result: Dict) -> str:
+    """Text for the result of a combat action"""
+    event = result.get("event")
+    return event.render() if event is not None else result.get("message", "")
 
 
 class CombatEncounter:
@@ -19,7 +125,7 @@ class CombatEncounter:
         self.player_level = player_level
 
         self.turn_number = 0
-        self.combat_log: List[str] = []
+        self.combat_log = CombatLog()
         self.is_active = True
 
         self.player_actions_used = 0
@@ -32,23 +138,12 @@ class CombatEncounter:
         """Calculate credits and XP rewards based on player level"""
         from data import NPC_ENEMY_TEMPLATES
 
-        # Determine which template based on player level
-        if self.player_level <= 5:
-            template_key = "level_1_5"
-        elif self.player_level <= 10:
-            template_key = "level_6_10"
-        elif self.player_level <= 15:
-            template_key = "level_11_15"
-        elif self.player_level <= 20:
-            template_key = "level_16_20"
-        else:
-            template_key = "level_21_plus"
-
-        template = NPC_ENEMY_TEMPLATES[template_key]
+        # Same template enemies are spawned from at this level
+        template = NPC_ENEMY_TEMPLATES[get_enemy_template_key(self.player_level)]
 
         # Random reward within range
-        credits = random.randint(*template["credits_reward"])
-        xp = random.randint(*template["xp_reward"])
+        credits = _rng.randint(*template["credits_reward"])
+        xp = _rng.randint(*template["xp_reward"])
 
         # Generate loot drops
         loot = self._generate_loot()
@@ -65,57 +160,46 @@ class CombatEncounter:
 
         # 1. Modules (lowest drop rate - 15-25% chance)
         module_chance = base_chance * 0.3
-        if random.random() < module_chance:
-            # Get appropriate tier modules based on player level
-            tier = "t1"
-            if self.player_level >= 10:
-                tier = "t2"
-
-            # Get all modules of this tier
-            available_modules = [m_id for m_id, m_data in MODULES.items()
-                               if tier in m_id and m_data.get("tier", 1) <= 2]
+        if _rng.random() < module_chance:
+            # Modules of the tier for the player's level
+            available_modules = loot_module_table(self.player_level)
 
             if available_modules:
-                module_id = random.choice(available_modules)
+                module_id = available_modules.draw(_rng)
                 loot[module_id] = 1
 
         # 2. Raw ore (40-50% chance)
         ore_chance = base_chance * 0.6
-        if random.random() < ore_chance:
-            ore_list = list(RAW_RESOURCES.keys())
-            ore_id = random.choice(ore_list)
-            quantity = random.randint(3, 10 + self.player_level)
+        if _rng.random() < ore_chance:
+            ore_id = raw_ore_table().draw(_rng)
+            quantity = _rng.randint(3, 10 + self.player_level)
             loot[ore_id] = quantity
 
         # 3. Refined ore (30-40% chance)
         refined_chance = base_chance * 0.5
-        if random.random() < refined_chance:
-            # Get refined resources
-            refined_list = [r_id for r_id in RESOURCES.keys() if r_id not in RAW_RESOURCES]
+        if _rng.random() < refined_chance:
+            refined_list = refined_resource_table()
             if refined_list:
-                refined_id = random.choice(refined_list)
-                quantity = random.randint(2, 5 + int(self.player_level / 2))
+                refined_id = refined_list.draw(_rng)
+                quantity = _rng.randint(2, 5 + int(self.player_level / 2))
                 loot[refined_id] = quantity
 
         # 4. Commodities (50-60% chance)
         commodity_chance = base_chance * 0.8
-        if random.random() < commodity_chance:
-            # Pick random commodity - prefer lower cost items
-            commodity_list = list(COMMODITIES.keys())
-
-            # Weight selection toward cheaper items (more common loot)
-            commodity_id = random.choice(commodity_list)
+        if _rng.random() < commodity_chance:
+            # Pick random commodity - cheaper items drop in larger quantities
+            commodity_id = commodity_table().draw(_rng)
             commodity_data = COMMODITIES[commodity_id]
 
             # Less expensive = more quantity
             if commodity_data["base_price"] < 50:
-                quantity = random.randint(5, 20)
+                quantity = _rng.randint(5, 20)
             elif commodity_data["base_price"] < 200:
-                quantity = random.randint(2, 10)
+                quantity = _rng.randint(2, 10)
             elif commodity_data["base_price"] < 1000:
-                quantity = random.randint(1, 5)
+                quantity = _rng.randint(1, 5)
             else:
-                quantity = random.randint(1, 2)
+                quantity = _rng.randint(1, 2)
 
             loot[commodity_id] = quantity
 
@@ -127,7 +211,7 @@ class CombatEncounter:
             return {"success": False, "message": "Combat has ended"}
 
         # Get player weapons
-        player_weapons = self.player_vessel.installed_modules.get("weapon", [])
+        player_weapons = self.player_vessel.get_stats().weapons
 
         if not player_weapons:
             return {"success": False, "message": "No weapons installed"}
@@ -136,21 +220,19 @@ class CombatEncounter:
         hits = 0
         misses = 0
         critical_hits = 0
-        weapon_details = []
-        enemy_evasion = self.enemy_vessel.get_evasion_chance()
+        weapon_results = []
+        enemy_evasion = self.enemy_vessel.get_stats().evasion
 
         # Fire ALL weapons
-        for weapon_id in player_weapons:
-            weapon_data = MODULES[weapon_id]
-
+        for weapon_data in player_weapons:
             # Calculate hit chance
             base_accuracy = weapon_data.get("accuracy", 0.85)
             hit_chance = base_accuracy * (1 - enemy_evasion) * (1 + skill_bonus)
 
             # Determine if hit
-            if random.random() > hit_chance:
+            if _rng.random() > hit_chance:
                 misses += 1
-                weapon_details.append(f"{weapon_data['name']}: MISS")
+                weapon_results.append((weapon_data["name"], None, False))
                 continue
 
             # Calculate damage for this weapon
@@ -158,7 +240,7 @@ class CombatEncounter:
             damage_multiplier = 1.0 + skill_bonus
 
             # Critical hit chance (per weapon)
-            is_crit = random.random() < 0.15
+            is_crit = _rng.random() < 0.15
             if is_crit:
                 damage_multiplier *= 2.0
                 critical_hits += 1
@@ -168,42 +250,29 @@ class CombatEncounter:
             hits += 1
 
             # Track weapon performance
-            crit_label = " [CRIT]" if is_crit else ""
-            weapon_details.append(f"{weapon_data['name']}: {weapon_damage:.0f}{crit_label}")
+            weapon_results.append((weapon_data["name"], weapon_damage, is_crit))
 
         # Check if all weapons missed
         if hits == 0:
-            msg = f"All weapons missed! ({misses} weapons)"
-            self.combat_log.append(msg)
-            return {"success": True, "message": msg, "hit": False}
+            event = CombatEvent(self.turn_number, "player_attack", "player", tuple(weapon_results))
+            self.combat_log.append(event)
+            return {"success": True, "event": event, "hit": False}
 
         # Apply total damage to enemy
         damage_report = self.enemy_vessel.take_damage(total_damage)
 
-        # Generate detailed message
-        weapon_count = len(player_weapons)
-        msg = f"{'CRITICAL! ' if critical_hits > 0 else ''}{hits}/{weapon_count} weapons hit for {total_damage:.0f} total damage!"
-
-        if damage_report["shield_damage"] > 0:
-            msg += f"\n  └─ {damage_report['shield_damage']:.0f} to shields"
-
-        if damage_report["hull_damage"] > 0:
-            msg += f"\n  └─ {damage_report['hull_damage']:.0f} to hull"
-
-        # Add weapon breakdown
-        msg += f"\n  Weapons: {', '.join(weapon_details)}"
-
-        self.combat_log.append(msg)
+        event = CombatEvent(self.turn_number, "player_attack", "player", tuple(weapon_results), total_damage,
+                            damage_report["shield_damage"], damage_report["hull_damage"], critical_hits > 0)
+        self.combat_log.append(event)
 
         # Check if enemy destroyed
         if damage_report["destroyed"]:
             self.is_active = False
-            destroy_msg = f"Enemy {self.enemy_name} destroyed!"
-            self.combat_log.append(destroy_msg)
+            self.combat_log.append(CombatEvent(self.turn_number, "destroyed", self.enemy_name))
 
         return {
             "success": True,
-            "message": msg,
+            "event": event,
             "hit": True,
             "damage": total_damage,
             "critical": critical_hits > 0,
@@ -218,7 +287,7 @@ class CombatEncounter:
             return {"success": False, "message": "Combat has ended"}
 
         # Get enemy weapons
-        enemy_weapons = self.enemy_vessel.installed_modules.get("weapon", [])
+        enemy_weapons = self.enemy_vessel.get_stats().weapons
 
         if not enemy_weapons:
             return {"success": False, "message": "Enemy has no weapons"}
@@ -226,21 +295,19 @@ class CombatEncounter:
         total_damage = 0
         hits = 0
         misses = 0
-        weapon_details = []
-        player_evasion = self.player_vessel.get_evasion_chance()
+        weapon_results = []
+        player_evasion = self.player_vessel.get_stats().evasion
 
         # Fire ALL weapons
-        for weapon_id in enemy_weapons:
-            weapon_data = MODULES[weapon_id]
-
+        for weapon_data in enemy_weapons:
             # Calculate hit chance
             base_accuracy = weapon_data.get("accuracy", 0.85)
             hit_chance = base_accuracy * (1 - player_evasion)
 
             # Determine if hit
-            if random.random() > hit_chance:
+            if _rng.random() > hit_chance:
                 misses += 1
-                weapon_details.append(f"{weapon_data['name']}: MISS")
+                weapon_results.append((weapon_data["name"], None, False))
                 continue
 
             # Calculate damage for this weapon (reduced by 20% for pirates)
@@ -249,41 +316,29 @@ class CombatEncounter:
             hits += 1
 
             # Track weapon performance
-            weapon_details.append(f"{weapon_data['name']}: {base_damage:.0f}")
+            weapon_results.append((weapon_data["name"], base_damage, False))
 
         # Check if all weapons missed
         if hits == 0:
-            msg = f"Enemy {self.enemy_name}'s weapons all missed! ({misses} weapons)"
-            self.combat_log.append(msg)
-            return {"success": True, "message": msg, "hit": False}
+            event = CombatEvent(self.turn_number, "enemy_attack", self.enemy_name, tuple(weapon_results))
+            self.combat_log.append(event)
+            return {"success": True, "event": event, "hit": False}
 
         # Apply total damage to player
         damage_report = self.player_vessel.take_damage(total_damage)
 
-        # Generate detailed message
-        weapon_count = len(enemy_weapons)
-        msg = f"Enemy {self.enemy_name} fired {hits}/{weapon_count} weapons for {total_damage:.0f} total damage!"
-
-        if damage_report["shield_damage"] > 0:
-            msg += f"\n  └─ {damage_report['shield_damage']:.0f} to shields"
-
-        if damage_report["hull_damage"] > 0:
-            msg += f"\n  └─ {damage_report['hull_damage']:.0f} to hull"
-
-        # Add weapon breakdown
-        msg += f"\n  Weapons: {', '.join(weapon_details)}"
-
-        self.combat_log.append(msg)
+        event = CombatEvent(self.turn_number, "enemy_attack", self.enemy_name, tuple(weapon_results), total_damage,
+                            damage_report["shield_damage"], damage_report["hull_damage"])
+        self.combat_log.append(event)
 
         # Check if player destroyed
         if damage_report["destroyed"]:
             self.is_active = False
-            destroy_msg = f"Your vessel has been destroyed!"
-            self.combat_log.append(destroy_msg)
+            self.combat_log.append(CombatEvent(self.turn_number, "destroyed", "player"))
 
         return {
             "success": True,
-            "message": msg,
+            "event": event,
             "hit": True,
             "damage": total_damage,
             "player_destroyed": damage_report["destroyed"],
@@ -294,43 +349,40 @@ class CombatEncounter:
     def attempt_retreat(self) -> Dict:
         """Player attempts to retreat from combat"""
         # Success chance based on speed difference
-        player_speed = self.player_vessel.get_effective_speed()
-        enemy_speed = self.enemy_vessel.get_effective_speed()
+        player_speed = self.player_vessel.get_stats().speed
+        enemy_speed = self.enemy_vessel.get_stats().speed
 
         speed_ratio = player_speed / max(enemy_speed, 1)
         retreat_chance = min(0.9, 0.4 + (speed_ratio * 0.3))
 
-        if random.random() < retreat_chance:
+        if _rng.random() < retreat_chance:
             self.is_active = False
-            msg = "Successfully retreated from combat!"
-            self.combat_log.append(msg)
-            return {"success": True, "message": msg, "retreated": True}
+            event = CombatEvent(self.turn_number, "retreat", "player")
+            self.combat_log.append(event)
+            return {"success": True, "event": event, "retreated": True}
         else:
-            msg = "Retreat failed! Enemy blocked your escape."
-            self.combat_log.append(msg)
+            event = CombatEvent(self.turn_number, "retreat", "player", success=False)
+            self.combat_log.append(event)
 
             # Enemy gets free attack
             enemy_result = self.enemy_attack()
 
-            return {"success": True, "message": msg, "retreated": False,
+            return {"success": True, "event": event, "retreated": False,
                    "enemy_attack": enemy_result}
 
     def repair_hull(self, amount: float) -> Dict:
         """Use repair systems"""
         self.player_vessel.repair(hull_amount=amount)
-        msg = f"Repaired {amount:.0f} hull damage"
-        self.combat_log.append(msg)
-        return {"success": True, "message": msg}
+        event = CombatEvent(self.turn_number, "repair", "player", damage=amount)
+        self.combat_log.append(event)
+        return {"success": True, "event": event}
 
     def next_turn(self):
         """Advance to next combat turn"""
         self.turn_number += 1
 
         # Shields regenerate slightly each turn
-        player_shield_regen = 0
-        for module_id in self.player_vessel.installed_modules.get("defense", []):
-            module_data = MODULES.get(module_id, {})
-            player_shield_regen += module_data.get("recharge_rate", 0)
+        player_shield_regen = self.player_vessel.get_stats().shield_recharge
 
         if player_shield_regen > 0:
             self.player_vessel.recharge_shields(player_shield_regen)
@@ -361,47 +413,91 @@ class CombatEncounter:
 
     def get_combat_log(self, last_n: int = 5) -> List[str]:
         """Get recent combat log entries"""
-        return self.combat_log[-last_n:]
-
-
-def create_enemy_vessel(difficulty: str = "normal", player_level: int = 1) -> tuple[Vessel, str]:
-    """Create an enemy vessel based on difficulty and player level"""
-    # Map difficulty to level-based templates
-    from data import NPC_ENEMY_TEMPLATES
-
-    # Determine which template to use based on player level
+        return self.combat_log.render(last_n)
+
+
+def get_npc_prototype(vessel_class: str, modules: Tuple[str, ...]) -> NPCVessel:
+    """
+    Prototype NPC for a ship type and module loadout. Built once as a
+    full Vessel (slot and tier checks apply, failed installs are skipped)
+    and cached; spawning clones it.
+    """
+    key = (vessel_class, modules)
+    prototype = _npc_prototypes.get(key)
+    if prototype is None:
+        vessel = Vessel(vessel_class)
+        for module_id in modules:
+            vessel.install_module(module_id)
+        prototype = NPCVessel.from_vessel(vessel)
+        _npc_prototypes[key] = prototype
+    return prototype
+
+
+def spawn_npc_vessel(vessel_class: str, modules: Tuple[str, ...],
+                     hull_scale: float = 1.0, shield_scale: float = 1.0) -> NPCVessel:
+    """Spawn an NPC vessel by cloning its cached prototype"""
+    return get_npc_prototype(vessel_class, modules).clone(hull_scale, shield_scale)
+
+
+def npc_vessel_from_dict(data: Dict) -> NPCVessel:
+    """Recreate a saved NPC vessel"""
+    installed = data["installed_modules"]
+    modules = tuple(module_id for module_type in ("weapon", "defense", "utility", "engine")
+                    for module_id in installed.get(module_type, []))
+    npc = spawn_npc_vessel(data["vessel_class_id"], modules)
+    npc.max_hull_hp = data["max_hull_hp"]
+    npc.current_hull_hp = data["current_hull_hp"]
+    npc.current_shields = data["current_shields"]
+    return npc
+
+
+def get_enemy_template_key(player_level: int) -> str:
+    """NPC_ENEMY_TEMPLATES entry used for enemies at a player level"""
     if player_level <= 5:
-        template_key = "level_1_5"
+        return "level_1_5"
     elif player_level <= 10:
-        template_key = "level_6_10"
+        return "level_6_10"
     elif player_level <= 15:
-        template_key = "level_11_15"
+        return "level_11_15"
     elif player_level <= 20:
-        template_key = "level_16_20"
+        return "level_16_20"
     else:
-        template_key = "level_21_plus"
+        return "level_21_plus"
+
+
+def create_enemy_vessel(difficulty: str = "normal", player_level: int = 1) -> tuple[NPCVessel, str]:
+    """Create an enemy vessel based on difficulty and player level"""
+    # Map difficulty to level-based templates
+    from data import NPC_ENEMY_TEMPLATES
 
+    template_key = get_enemy_template_key(player_level)
     template = NPC_ENEMY_TEMPLATES[template_key]
 
     # Choose random enemy name and ship
-    enemy_name = random.choice(template["names"])
-    vessel_class = random.choice(template["ship_types"])
+    enemy_name = enemy_name_table(template_key).draw(_rng)
+    vessel_class = enemy_ship_table(template_key).draw(_rng)
 
-    enemy_vessel = Vessel(vessel_class)
+    # Template weapons and defenses, with hull and shields reduced by 20%
+    modules = tuple(template["weapon_setups"]) + tuple(template["defense_setups"])
+    enemy_vessel = spawn_npc_vessel(vessel_class, modules, hull_scale=0.8, shield_scale=0.8)
 
-    # Reduce hull and shields by 20%
-    enemy_vessel.max_hull_hp *= 0.8
-    enemy_vessel.current_hull_hp *= 0.8
+    return enemy_vessel, enemy_name
 
-    # Equip weapons
-    for weapon_id in template["weapon_setups"]:
-        enemy_vessel.install_module(weapon_id)
 
-    # Equip defenses
-    for defense_id in template["defense_setups"]:
-        enemy_vessel.install_module(defense_id)
+def create_pirate_wing(player_level: int, wing_size: int) -> tuple[List[NPCVessel], str]:
+    """Create a wing of pirate vessels for a fleet battle"""
+    from data import NPC_ENEMY_TEMPLATES
 
-    # Reduce current shields by 20% after modules are installed
-    enemy_vessel.current_shields *= 0.8
+    template_key = get_enemy_template_key(player_level)
+    template = NPC_ENEMY_TEMPLATES[template_key]
+    wing_name = enemy_name_table(template_key).draw(_rng)
+    modules = tuple(template["weapon_setups"]) + tuple(template["defense_setups"])
 
-    return enemy_vessel, enemy_name
+    ship_types = enemy_ship_table(template_key)
+    wing = []
+    for number in range(1, wing_size + 1):
+        vessel = spawn_npc_vessel(ship_types.draw(_rng), modules, hull_scale=0.8, shield_scale=0.8)
+        vessel.name = f"{wing_name} {number}"
+        wing.append(vessel)
+
+    return wing, f"{wing_name} Wing"
@@ -0,0 +1,283 @@
+"""
+Combat Outcome Estimator
+Monte Carlo estimate of how a fight would go, so players and bots can
+decide whether to engage or retreat. Thousands of fights are simulated
+at once with NumPy, following the same rules as CombatEncounter.
+"""
+
+import hashlib
+import random
+from typing import Dict, List, Optional, Tuple
+
+from vessels import Combatant
+from combat import get_enemy_template_key, spawn_npc_vessel
+from data import NPC_ENEMY_TEMPLATES
+
+# Optional NumPy (falls back to a slower pure-Python simulation with fewer runs)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+DEFAULT_RUNS = 2000 if HAS_NUMPY else 200
+MAX_TURNS = 50  # Fights still going after this many turns count as unresolved
+CRIT_CHANCE = 0.15
+ENEMY_DAMAGE_MULTIPLIER = 0.8  # Pirates deal 20% less damage
+ENEMY_SHIELD_REGEN = 50
+ESTIMATE_CACHE_SIZE = 256
+
+# Hull and shields are bucketed to this fraction of their maximum, so
+# estimates are reused across the small changes of a running fight
+STATE_BUCKET = 0.05
+
+
+class CombatEstimate:
+    """Outcome statistics of a batch of simulated fights"""
+
+    def __init__(self, runs: int, wins: int, losses: int, total_turns: float,
+                 total_hull_loss: float, retreat_chance: float):
+        self.runs = runs
+        self.win_probability = wins / runs
+        self.loss_probability = losses / runs
+        self.expected_turns = total_turns / runs
+        self.expected_hull_loss = total_hull_loss / runs
+        self.retreat_chance = retreat_chance
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "runs": self.runs,
+            "win_probability": self.win_probability,
+            "loss_probability": self.loss_probability,
+            "expected_turns": self.expected_turns,
+            "expected_hull_loss": self.expected_hull_loss,
+            "retreat_chance": self.retreat_chance
+        }
+
+    def get_summary(self) -> str:
+        """One-line summary for the combat view"""
+        return (f"Win {self.win_probability * 100:.0f}% | ~{self.expected_turns:.1f} turns | "
+                f"Hull loss ~{self.expected_hull_loss:.0f} | Retreat {self.retreat_chance * 100:.0f}%")
+
+
+class _Side:
+    """Combat numbers of one side, as the simulation needs them"""
+
+    __slots__ = ("hull", "max_hull", "shields", "shield_capacity", "shield_regen",
+                 "armor_reduction", "evasion", "speed", "weapons")
+
+    def __init__(self, vessel: Combatant, hull: float, shields: float, shield_regen: float,
+                 damage_multiplier: float = 1.0):
+        stats = vessel.get_stats()
+        self.hull = hull
+        self.max_hull = vessel.max_hull_hp
+        self.shields = shields
+        self.shield_capacity = stats.shield_capacity
+        self.shield_regen = shield_regen
+        self.armor_reduction = stats.armor_reduction
+        self.evasion = stats.evasion
+        self.speed = stats.speed
+        # (accuracy, damage) per weapon
+        self.weapons = [(w.get("accuracy", 0.85), w.get("damage", 100) * damage_multiplier) for w in stats.weapons]
+
+
+_cache: Dict[Tuple, CombatEstimate] = {}
+
+
+def _bucket(value: float, maximum: float) -> float:
+    """Round a hull/shield value to its bucket"""
+    if maximum <= 0:
+        return value
+    step = maximum * STATE_BUCKET
+    return round(value / step) * step
+
+
+def _loadout_key(vessel: Combatant) -> Tuple:
+    """Identity of a vessel's ship type and modules"""
+    modules = vessel.installed_modules
+    return (vessel.vessel_class_id,) + tuple(tuple(modules.get(t, [])) for t in ("weapon", "defense", "utility", "engine"))
+
+
+def _seed_for(key: Tuple) -> int:
+    """Stable simulation seed - estimates never draw from the game's random streams"""
+    return int.from_bytes(hashlib.sha256(repr(key).encode()).digest()[:8], "big")
+
+
+def _retreat_chance(player: _Side, enemy: _Side) -> float:
+    """Same formula as CombatEncounter.attempt_retreat"""
+    speed_ratio = player.speed / max(enemy.speed, 1)
+    return min(0.9, 0.4 + (speed_ratio * 0.3))
+
+
+def _simulate_numpy(player: _Side, enemy: _Side, runs: int, skill_bonus: float, seed: int) -> Tuple[int, int, float, float]:
+    """Simulate runs fights in parallel. Returns (wins, losses, total turns, total hull loss)."""
+    gen = np.random.default_rng(seed)
+
+    # Player volley - hit chance and damage per weapon
+    p_hit = np.array([acc * (1 - enemy.evasion) * (1 + skill_bonus) for acc, _ in player.weapons])
+    p_dmg = np.array([dmg * (1.0 + skill_bonus) for _, dmg in player.weapons])
+    e_hit = np.array([acc * (1 - player.evasion) for acc, _ in enemy.weapons])
+    e_dmg = np.array([dmg for _, dmg in enemy.weapons])
+
+    p_hull = np.full(runs, float(player.hull))
+    p_shields = np.full(runs, float(player.shields))
+    e_hull = np.full(runs, float(enemy.hull))
+    e_shields = np.full(runs, float(enemy.shields))
+    turns = np.zeros(runs)
+    won = np.zeros(runs, dtype=bool)
+    lost = np.zeros(runs, dtype=bool)
+    active = np.arange(runs)
+
+    def apply(damage, shields, hull, armor_reduction):
+        absorbed = np.minimum(damage, np.maximum(shields, 0))
+        return shields - absorbed, np.maximum(0, hull - (damage - absorbed) * armor_reduction)
+
+    for turn in range(1, MAX_TURNS + 1):
+        if active.size == 0:
+            break
+        n = active.size
+        turns[active] = turn
+
+        # Player fires every weapon; each hit may crit for double damage
+        if p_dmg.size:
+            hits = gen.random((n, p_dmg.size)) <= p_hit
+            crits = gen.random((n, p_dmg.size)) < CRIT_CHANCE
+            damage = (hits * p_dmg * np.where(crits, 2.0, 1.0)).sum(axis=1)
+            e_shields[active], e_hull[active] = apply(damage, e_shields[active], e_hull[active], enemy.armor_reduction)
+
+        killed = e_hull[active] <= 0
+        won[active[killed]] = True
+        active = active[~killed]
+        if active.size == 0:
+            break
+
+        # Surviving enemies return fire
+        if e_dmg.size:
+            hits = gen.random((active.size, e_dmg.size)) <= e_hit
+            damage = (hits * e_dmg).sum(axis=1)
+            p_shields[active], p_hull[active] = apply(damage, p_shields[active], p_hull[active], player.armor_reduction)
+
+        destroyed = p_hull[active] <= 0
+        lost[active[destroyed]] = True
+        active = active[~destroyed]
+
+        # Shield regeneration between turns
+        p_shields[active] = np.minimum(player.shield_capacity, p_shields[active] + player.shield_regen)
+        e_shields[active] = np.minimum(enemy.shield_capacity, e_shields[active] + ENEMY_SHIELD_REGEN)
+
+    hull_loss = float((player.hull - p_hull).sum())
+    return int(won.sum()), int(lost.sum()), float(turns.sum()), hull_loss
+
+
+def _simulate_python(player: _Side, enemy: _Side, runs: int, skill_bonus: float, seed: int) -> Tuple[int, int, float, float]:
+    """Pure-Python fallback for _simulate_numpy"""
+    rng = random.Random(seed)
+    p_weapons = [(acc * (1 - enemy.evasion) * (1 + skill_bonus), dmg * (1.0 + skill_bonus)) for acc, dmg in player.weapons]
+    e_weapons = [(acc * (1 - player.evasion), dmg) for acc, dmg in enemy.weapons]
+
+    def apply(damage, shields, hull, armor_reduction):
+        absorbed = min(damage, max(shields, 0))
+        return shields - absorbed, max(0, hull - (damage - absorbed) * armor_reduction)
+
+    wins = losses = 0
+    total_turns = total_hull_loss = 0.0
+    for _ in range(runs):
+        p_hull, p_shields = player.hull, player.shields
+        e_hull, e_shields = enemy.hull, enemy.shields
+        turn = 0
+        for turn in range(1, MAX_TURNS + 1):
+            damage = 0.0
+            for hit_chance, weapon_damage in p_weapons:
+                if rng.random() <= hit_chance:
+                    damage += weapon_damage * (2.0 if rng.random() < CRIT_CHANCE else 1.0)
+            e_shields, e_hull = apply(damage, e_shields, e_hull, enemy.armor_reduction)
+            if e_hull <= 0:
+                wins += 1
+                break
+
+            damage = sum(d for hit_chance, d in e_weapons if rng.random() <= hit_chance)
+            p_shields, p_hull = apply(damage, p_shields, p_hull, player.armor_reduction)
+            if p_hull <= 0:
+                losses += 1
+                break
+
+            p_shields = min(player.shield_capacity, p_shields + player.shield_regen)
+            e_shields = min(enemy.shield_capacity, e_shields + ENEMY_SHIELD_REGEN)
+
+        total_turns += turn
+        total_hull_loss += player.hull - p_hull
+
+    return wins, losses, total_turns, total_hull_loss
+
+
+def _estimate(player_vessel: Combatant, enemies: List[Combatant], key: Tuple,
+              runs: int, skill_bonus: float) -> CombatEstimate:
+    """Simulate against each candidate enemy (equally likely) and combine"""
+    if key in _cache:
+        return _cache[key]
+
+    stats = player_vessel.get_stats()
+    player = _Side(player_vessel,
+                   _bucket(player_vessel.current_hull_hp, player_vessel.max_hull_hp),
+                   _bucket(player_vessel.current_shields, stats.shield_capacity),
+                   stats.shield_recharge)
+
+    simulate = _simulate_numpy if HAS_NUMPY else _simulate_python
+    per_enemy = max(1, runs // len(enemies))
+    wins = losses = 0
+    total_turns = total_hull_loss = retreat = 0.0
+    for index, enemy_vessel in enumerate(enemies):
+        enemy = _Side(enemy_vessel,
+                      _bucket(enemy_vessel.current_hull_hp, enemy_vessel.max_hull_hp),
+                      _bucket(enemy_vessel.current_shields, enemy_vessel.get_stats().shield_capacity),
+                      ENEMY_SHIELD_REGEN, ENEMY_DAMAGE_MULTIPLIER)
+        w, l, t, h = simulate(player, enemy, per_enemy, skill_bonus, _seed_for(key + (index,)))
+        wins += w
+        losses += l
+        total_turns += t
+        total_hull_loss += h
+        retreat += _retreat_chance(player, enemy)
+
+    estimate = CombatEstimate(per_enemy * len(enemies), wins, losses, total_turns,
+                              total_hull_loss, retreat / len(enemies))
+
+    if len(_cache) >= ESTIMATE_CACHE_SIZE:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = estimate
+    return estimate
+
+
+def _state_key(vessel: Combatant) -> Tuple:
+    """Bucketed hull and shields of a vessel"""
+    stats = vessel.get_stats()
+    return (_bucket(vessel.current_hull_hp, vessel.max_hull_hp),
+            _bucket(vessel.current_shields, stats.shield_capacity))
+
+
+def estimate_against_template(player_vessel: Combatant, template_key: Optional[str] = None,
+                              player_level: int = 1, skill_bonus: float = 0.0,
+                              runs: int = DEFAULT_RUNS) -> CombatEstimate:
+    """
+    Estimate a fight against the pirates of an NPC_ENEMY_TEMPLATES entry
+    (by default the one create_enemy_vessel uses at player_level).
+    Each of the template's ship types is equally likely, as when spawning.
+    """
+    if template_key is None:
+        template_key = get_enemy_template_key(player_level)
+    template = NPC_ENEMY_TEMPLATES[template_key]
+
+    modules = tuple(template["weapon_setups"]) + tuple(template["defense_setups"])
+    enemies = [spawn_npc_vessel(ship, modules, hull_scale=0.8, shield_scale=0.8) for ship in template["ship_types"]]
+
+    key = ("template", template_key, _loadout_key(player_vessel), _state_key(player_vessel), skill_bonus, runs)
+    return _estimate(player_vessel, enemies, key, runs, skill_bonus)
+
+
+def estimate_against_vessel(player_vessel: Combatant, enemy_vessel: Combatant,
+                            skill_bonus: float = 0.0, runs: int = DEFAULT_RUNS) -> CombatEstimate:
+    """Estimate the rest of a fight against a specific enemy (e.g. the current one)"""
+    key = ("vessel", _loadout_key(player_vessel), _state_key(player_vessel),
+           _loadout_key(enemy_vessel), _state_key(enemy_vessel), skill_bonus, runs)
+    return _estimate(player_vessel, [enemy_vessel], key, runs, skill_bonus)
@@ -1,29 +1,54 @@
 """
 Commodity Market System
 Dynamic pricing based on supply/demand, player actions, and market events
+(see market_events.py)
 """
 
+import math
 import random
 import time
 from typing import Dict, List, Tuple, Optional
 from data import COMMODITIES, COMMODITY_CATEGORIES, LOCATIONS
+from config import LAZY_MARKET_EVALUATION, MARKET_EVENT_INTERVAL
+from rng_service import get_stream
+from market_events import MarketEventBoard
+
+_rng = get_stream("commodity_market")
+
+
+# Supply/demand relax toward 1.0 at this rate per game minute
+DRIFT_RATE_PER_MINUTE = 0.1
+# Variance of a single random supply/demand shock (uniform 0.95-1.05 multiplier)
+SHOCK_VARIANCE = 0.05 ** 2 / 3
+# Lazy markets draw their random shocks and price volatility once per interval of game time (seconds)
+SHOCK_INTERVAL = 60.0
 
 
 class CommodityMarket:
     """Manages commodity trading with dynamic prices at each location"""
 
-    def __init__(self):
+    def __init__(self, lazy: bool = LAZY_MARKET_EVALUATION, seed: Optional[int] = None,
+                 initialize: bool = True):
         # Market state for each location: {location_id: {commodity_id: market_data}}
         self.markets = {}
 
+        # Lazy mode: update_markets only advances the clock, and each location
+        # catches up in one step when its prices are read
+        self.lazy = lazy
+        self.seed = seed if seed is not None else _rng.getrandbits(32)
+        self.game_time = 0.0
+        self.last_evaluated: Dict[str, float] = {}  # location_id: game_time of last catch-up
+        self._rolls: Dict[str, Tuple[int, Dict]] = {}  # location_id: (interval, random terms) of the last interval drawn
+
         # Player transaction history affects prices
         self.transaction_history = []  # List of (timestamp, location, commodity, quantity, buy/sell)
 
-        # Market events that affect prices
-        self.active_events = []  # List of market events
+        # Market events that affect prices (saved as "active_events")
+        self.events = MarketEventBoard(self.seed)
 
-        # Initialize markets for all locations
-        self.initialize_markets()
+        # Initialize markets for all locations (skipped when loading)
+        if initialize:
+            self.initialize_markets()
 
     def initialize_markets(self):
         """Create initial market conditions for all locations"""
@@ -44,15 +69,15 @@ class CommodityMarket:
                     category_data = COMMODITY_CATEGORIES[category]
 
                     # Initial supply/demand varies by location type
-                    supply = random.uniform(0.7, 1.3)
-                    demand = random.uniform(0.7, 1.3)
+                    supply = _rng.uniform(0.7, 1.3)
+                    demand = _rng.uniform(0.7, 1.3)
 
                     # Calculate initial price based on supply/demand
-                    price_multiplier = (demand / supply) * random.uniform(0.95, 1.05)
+                    price_multiplier = (demand / supply) * _rng.uniform(0.95, 1.05)
                     current_price = int(base_price * price_multiplier)
 
                     # Initial stock varies by commodity and location
-                    stock = random.randint(100, 500)
+                    stock = _rng.randint(100, 500)
 
                     self.markets[location_id][commodity_id] = {
                         "current_price": current_price,
@@ -64,6 +89,8 @@ class CommodityMarket:
                         "last_update": time.time(),
                     }
 
+                self.last_evaluated[location_id] = self.game_time
+
     def get_price(self, location_id: str, commodity_id: str, is_buying: bool = True) -> int:
         """Get current price for a commodity at a location
         is_buying = True means player is buying from market (higher price)
@@ -75,14 +102,30 @@ class CommodityMarket:
         if commodity_id not in self.markets[location_id]:
             return 0
 
+        self.catch_up(location_id)
+
         market_data = self.markets[location_id][commodity_id]
         base_price = market_data["current_price"]
 
+        # Running events scale the quote
+        self.events.advance(self.game_time, self.markets)
+        buy_modifier, sell_modifier = self.events.modifier(location_id, commodity_id)
+
         # Market spread: buy higher, sell lower
         if is_buying:
-            return int(base_price * 1.1)  # 10% markup when buying from market
+            return int(base_price * 1.1 * buy_modifier)  # 10% markup when buying from market
         else:
-            return int(base_price * 0.9)  # 10% discount when selling to market
+            return int(base_price * 0.9 * sell_modifier)  # 10% discount when selling to market
+
+    def get_active_events(self, location_id: str) -> List[Dict]:
+        """Events affecting a location's prices now, soonest to end first"""
+        self.events.advance(self.game_time, self.markets)
+        return [{
+            "name": event.name,
+            "description": event.describe(),
+            "category": event.category,
+            "remaining": event.ends_at - self.game_time
+        } for event in self.events.running_at(location_id)]
 
     def buy_commodity(self, location_id: str, commodity_id: str, quantity: int) -> Tuple[bool, str, int]:
         """Player buys commodity from market
@@ -94,6 +137,8 @@ class CommodityMarket:
         if commodity_id not in self.markets[location_id]:
             return False, "Commodity not available", 0
 
+        self.catch_up(location_id)
+
         market_data = self.markets[location_id][commodity_id]
 
         # Check stock
@@ -134,6 +179,8 @@ class CommodityMarket:
         if commodity_id not in self.markets[location_id]:
             return False, "Market doesn't buy this commodity", 0
 
+        self.catch_up(location_id)
+
         market_data = self.markets[location_id][commodity_id]
 
         # Check if market can accept
@@ -185,11 +232,16 @@ class CommodityMarket:
             market_data["supply_level"] += impact
             market_data["price_trend"] -= impact * 0.5
 
-        # Recalculate current price
-        self._recalculate_price(location_id, commodity_id)
+        # Recalculate current price (lazy markets keep the volatility of the current interval)
+        roll = None
+        if self.lazy:
+            roll = self._interval_rolls(location_id, int(self.game_time // SHOCK_INTERVAL))[commodity_id][2]
+        self._recalculate_price(location_id, commodity_id, roll)
 
-    def _recalculate_price(self, location_id: str, commodity_id: str):
-        """Recalculate commodity price based on supply/demand"""
+    def _recalculate_price(self, location_id: str, commodity_id: str, roll: Optional[float] = None):
+        """Recalculate commodity price based on supply/demand
+        roll: volatility draw in -1..1 (a fresh one is drawn if not given)
+        """
         market_data = self.markets[location_id][commodity_id]
         commodity_data = COMMODITIES[commodity_id]
         base_price = commodity_data["base_price"]
@@ -205,7 +257,9 @@ class CommodityMarket:
             price_multiplier = 2.0
 
         # Apply volatility (some commodities fluctuate more)
-        price_multiplier *= (1.0 + random.uniform(-volatility, volatility) * 0.1)
+        if roll is None:
+            roll = _rng.uniform(-1.0, 1.0)
+        price_multiplier *= (1.0 + roll * volatility * 0.1)
 
         # Clamp to reasonable range (0.5x to 3.0x base price)
         price_multiplier = max(0.5, min(3.0, price_multiplier))
@@ -215,7 +269,14 @@ class CommodityMarket:
     def update_markets(self, time_passed: float = 60.0):
         """Update all markets - prices drift, supply/demand rebalance
         time_passed: seconds since last update
+        In lazy mode only the clock advances; markets catch up when observed.
         """
+        self.game_time += time_passed
+        self.events.advance(self.game_time, self.markets)
+
+        if self.lazy:
+            return
+
         for location_id in self.markets:
             for commodity_id in self.markets[location_id]:
                 market_data = self.markets[location_id][commodity_id]
@@ -229,27 +290,101 @@ class CommodityMarket:
                 market_data["demand_level"] += (1.0 - market_data["demand_level"]) * drift_rate
 
                 # Stock replenishes slowly
-                if market_data["stock"] < market_data["max_stock"]:
-                    replenish = int(market_data["max_stock"] * 0.05 * (time_passed / 60.0))  # 5% per minute
-                    market_data["stock"] = min(market_data["stock"] + replenish, market_data["max_stock"])
+                self._replenish(market_data, time_passed / 60.0)
 
                 # Random market fluctuations
-                if random.random() < category_data["demand_volatility"] * 0.1:
-                    market_data["demand_level"] *= random.uniform(0.95, 1.05)
+                if _rng.random() < category_data["demand_volatility"] * 0.1:
+                    market_data["demand_level"] *= _rng.uniform(0.95, 1.05)
 
-                if random.random() < (1.0 - category_data["supply_stability"]) * 0.1:
-                    market_data["supply_level"] *= random.uniform(0.95, 1.05)
+                if _rng.random() < (1.0 - category_data["supply_stability"]) * 0.1:
+                    market_data["supply_level"] *= _rng.uniform(0.95, 1.05)
 
                 # Recalculate price
                 self._recalculate_price(location_id, commodity_id)
 
                 market_data["last_update"] = time.time()
 
+            self.last_evaluated[location_id] = self.game_time
+
+    @staticmethod
+    def _replenish(market_data: Dict, minutes: float):
+        """Restock 5% of max stock per minute up to max, carrying partial units to the next update"""
+        max_stock = market_data["max_stock"]
+        if market_data["stock"] >= max_stock:
+            market_data["restock_carry"] = 0.0
+            return
+        carry = market_data.get("restock_carry", 0.0) + max_stock * 0.05 * minutes
+        units = int(carry + 1e-9)
+        market_data["stock"] = min(market_data["stock"] + units, max_stock)
+        market_data["restock_carry"] = max(0.0, carry - units) if market_data["stock"] < max_stock else 0.0
+
+    def _interval_rolls(self, location_id: str, interval: int) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Random terms of a location's market during one interval of game time:
+        commodity_id -> (demand shock, supply shock, volatility roll). They come
+        from a stream keyed by the interval, so they do not depend on how often
+        the market is read.
+        """
+        cached = self._rolls.get(location_id)
+        if cached is not None and cached[0] == interval:
+            return cached[1]
+
+        rng = random.Random(f"{self.seed}:{location_id}:{interval}")
+        rolls = {}
+        for commodity_id in sorted(self.markets[location_id]):
+            category_data = COMMODITY_CATEGORIES[COMMODITIES[commodity_id]["category"]]
+            # Spread of the shocks once they have built up and decayed in balance
+            demand_variance = category_data["demand_volatility"] * 0.1 * SHOCK_VARIANCE / (2 * DRIFT_RATE_PER_MINUTE)
+            supply_variance = (1.0 - category_data["supply_stability"]) * 0.1 * SHOCK_VARIANCE / (2 * DRIFT_RATE_PER_MINUTE)
+            rolls[commodity_id] = (rng.gauss(0.0, math.sqrt(demand_variance)),
+                                   rng.gauss(0.0, math.sqrt(supply_variance)),
+                                   rng.uniform(-1.0, 1.0))
+        self._rolls[location_id] = (interval, rolls)
+        return rolls
+
+    def catch_up(self, location_id: str):
+        """Advance a lazy location market to the current game time in one step"""
+        if not self.lazy or location_id not in self.markets:
+            return
+
+        last_evaluated = self.last_evaluated.get(location_id, self.game_time)
+        elapsed = self.game_time - last_evaluated
+        if elapsed <= 0:
+            self.last_evaluated.setdefault(location_id, self.game_time)
+            return
+
+        minutes = elapsed / 60.0
+        previous = self._interval_rolls(location_id, int(last_evaluated // SHOCK_INTERVAL))
+        current = self._interval_rolls(location_id, int(self.game_time // SHOCK_INTERVAL))
+
+        # Supply/demand deviations from equilibrium decay exponentially, which
+        # composes exactly over any split of the elapsed time. The shock of the
+        # current interval sits on top of the decayed deviation: the previous
+        # interval's shock is taken out before decaying, so one read or many
+        # give the same levels.
+        decay = math.exp(-DRIFT_RATE_PER_MINUTE * minutes)
+
+        for commodity_id, market_data in self.markets[location_id].items():
+            old_demand_shock, old_supply_shock, _ = previous[commodity_id]
+            demand_shock, supply_shock, roll = current[commodity_id]
+
+            demand = 1.0 + (market_data["demand_level"] - old_demand_shock - 1.0) * decay + demand_shock
+            supply = 1.0 + (market_data["supply_level"] - old_supply_shock - 1.0) * decay + supply_shock
+            market_data["demand_level"] = max(0.05, demand)
+            market_data["supply_level"] = max(0.05, supply)
+
+            self._replenish(market_data, minutes)
+            self._recalculate_price(location_id, commodity_id, roll)
+
+        self.last_evaluated[location_id] = self.game_time
+
     def get_market_overview(self, location_id: str, category_filter: Optional[str] = None) -> List[Dict]:
         """Get list of all commodities with prices at a location"""
         if location_id not in self.markets:
             return []
 
+        self.catch_up(location_id)
+
         overview = []
         for commodity_id, market_data in self.markets[location_id].items():
             commodity_data = COMMODITIES[commodity_id]
@@ -317,18 +452,38 @@ class CommodityMarket:
         return {
             "markets": self.markets,
             "transaction_history": self.transaction_history[-100:],  # Keep last 100
-            "active_events": self.active_events,
+            "active_events": self.events.to_list(),
+            "event_period": self.events.next_period,
+            "lazy": self.lazy,
+            "seed": self.seed,
+            "game_time": self.game_time,
+            "last_evaluated": self.last_evaluated,
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'CommodityMarket':
         """Load market state from save"""
-        market = cls()
+        market = cls(data.get("lazy", LAZY_MARKET_EVALUATION), data.get("seed"), initialize=False)
         market.markets = data.get("markets", {})
         market.transaction_history = data.get("transaction_history", [])
-        market.active_events = data.get("active_events", [])
+        market.game_time = data.get("game_time", 0.0)
+        # Saves from before market events have an empty list and draw from the current period on
+        market.events.load(data.get("active_events", []),
+                           data.get("event_period", int(market.game_time // MARKET_EVENT_INTERVAL)), market.game_time)
+        # Old saves have no evaluation times - treat markets as current
+        market.last_evaluated = data.get("last_evaluated",
+                                         {loc_id: market.game_time for loc_id in market.markets})
         return market
 
+    def clone(self) -> 'CommodityMarket':
+        """Independent copy of all market state (cheaper than a deep copy)"""
+        data = self.to_dict()
+        data["markets"] = {loc_id: {commodity_id: dict(entry) for commodity_id, entry in market.items()}
+                           for loc_id, market in self.markets.items()}
+        data["transaction_history"] = list(self.transaction_history)
+        data["last_evaluated"] = dict(self.last_evaluated)
+        return CommodityMarket.from_dict(data)
+
 
 # Example usage
 if __name__ == "__main__":
@@ -15,6 +15,10 @@ STARTING_VESSEL = "scout_standard_mk1"  # Standard Scout MK1 - basic starting sh
 BASE_SKILL_TRAIN_TIME = 300  # seconds for level 1
 SKILL_TIME_MULTIPLIER = 1.5  # each level takes 1.5x longer
 MARKET_FLUCTUATION_RANGE = 0.15  # 15% price variance
+MARKET_UPDATE_INTERVAL = 600  # game seconds between resource market fluctuations
+LAZY_MARKET_EVALUATION = True  # markets catch up when observed instead of every tick
+MARKET_EVENT_INTERVAL = 1800  # game seconds per market event draw
+MARKET_EVENT_CHANCE = 0.5  # chance a market event is scheduled in each interval
 CONTRACT_COOLDOWN = 600  # 10 minutes between contracts
 
 # Combat
@@ -22,17 +26,32 @@ COMBAT_TURN_DURATION = 10  # seconds per combat turn
 BASE_WEAPON_DAMAGE = 100
 BASE_SHIELD_CAPACITY = 500
 BASE_ARMOR_RATING = 100
+PIRATE_WING_MIN_DANGER = 0.3  # location danger level where pirate wings can be hunted
+PIRATE_WING_COOLDOWN = 1800  # game seconds between pirate wing engagements
 
 # Economy
 TAX_RATE = 0.05  # 5% transaction tax
 MANUFACTURING_TIME_BASE = 1800  # 30 minutes base manufacturing
+MANUFACTURING_BASE_LINES = 1  # production lines before industrial skills
+MANUFACTURING_SKILL_LEVELS_PER_LINE = 2  # industrial skill levels per extra production line
 MINING_CYCLE_TIME = 300  # 5 minutes per mining cycle
+REFINING_TIME_PER_UNIT = 2  # game seconds of refinery time per unit of raw ore
+ASTEROID_RESERVE_CAPACITY = 2000  # units of each ore in a full asteroid field
+ASTEROID_REGEN_HALF_LIFE = 3600  # game seconds for a field to regrow half of what was mined
+FLEET_OPS_DOCK_TIME = 60  # game seconds a fleet job spends loading or unloading at each stop
+FLEET_OPS_MINING_YIELD = 20  # base ore per mining cycle of a berthed ship (an average manual mining yield)
 
 # Territory Control
 SECTOR_CLAIM_COST = 1000000  # 1 million credits to claim
 SECTOR_UPKEEP_COST = 50000  # per game day
 TERRITORY_CONTROL_BONUS = 0.1  # 10% bonus in controlled territory
+INFLUENCE_DIFFUSION = 0.3  # share of a location's faction influence flowing to its neighbours per update
+INFLUENCE_DECAY = 0.05  # share of all influence fading per update
+INFLUENCE_CONFLICT_SHARE = 0.35  # a rival faction's influence share that starts a border conflict
+INFLUENCE_FLIP_SHARE = 0.55  # a rival faction's influence share that takes the location over
 
 # File Paths
-SAVE_FILE = "save_game.yaml"
+SAVE_FILE = "save_game.yaml"  # Single save from before save slots
+SAVE_DIR = "saves"  # One <slot>.yaml (and <slot>.journal) per commander
+JOURNAL_COMPACT_INTERVAL = 200  # Journaled commands before a background checkpoint
 DATA_DIR = "data"
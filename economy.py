@@ -4,21 +4,36 @@ Handles resource trading, market prices, and economic simulation
 """
 
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from data import RESOURCES, LOCATIONS, MODULES, SHIP_COMPONENTS, VESSEL_CLASSES
-from config import MARKET_FLUCTUATION_RANGE, TAX_RATE
+from config import MARKET_FLUCTUATION_RANGE, MARKET_UPDATE_INTERVAL, TAX_RATE, LAZY_MARKET_EVALUATION
+from rng_service import get_stream
+from sampling import station_ship_table
+
+_rng = get_stream("economy")
+
+
+# Range of one fluctuate_prices stock change
+STOCK_CHANGE_MIN = -100
+STOCK_CHANGE_MAX = 200
 
 
 class Market:
     """Represents a market at a location"""
 
-    def __init__(self, location_id: str):
+    def __init__(self, location_id: str, seed: Optional[int] = None, initialize: bool = True):
         self.location_id = location_id
         self.prices: Dict[str, float] = {}
         self.stock: Dict[str, int] = {}
 
-        # Initialize prices and stock based on location
-        self._initialize_market()
+        # Lazy evaluation state - clock is set by EconomyManager in lazy mode
+        self.seed = seed if seed is not None else _rng.getrandbits(32)
+        self.last_evaluated = 0.0
+        self.clock: Optional[Callable[[], float]] = None
+
+        # Initialize prices and stock based on location (skipped when loading)
+        if initialize:
+            self._initialize_market()
 
     def _initialize_market(self):
         """Set up initial market conditions"""
@@ -31,24 +46,25 @@ class Market:
             # Resources available at location have better prices and more stock
             if resource_id in available_resources:
                 # Local resources are 20-30% cheaper
-                price_multiplier = random.uniform(0.7, 0.8)
-                stock_amount = random.randint(1000, 5000)
+                price_multiplier = _rng.uniform(0.7, 0.8)
+                stock_amount = _rng.randint(1000, 5000)
             else:
                 # Imported resources are more expensive with less stock
-                price_multiplier = random.uniform(1.2, 1.5)
-                stock_amount = random.randint(100, 500)
+                price_multiplier = _rng.uniform(1.2, 1.5)
+                stock_amount = _rng.randint(100, 500)
 
             self.prices[resource_id] = base_price * price_multiplier
             self.stock[resource_id] = stock_amount
 
-    def fluctuate_prices(self):
-        """Simulate market price changes"""
-        for resource_id in self.prices:
+    def fluctuate_prices(self, rng: Optional[random.Random] = None):
+        """Simulate market price changes, drawing from rng (default: the economy stream)"""
+        rng = rng or _rng
+        for resource_id in sorted(self.prices):
             base_price = RESOURCES[resource_id]["base_price"]
             current_price = self.prices[resource_id]
 
             # Random fluctuation
-            change = random.uniform(-MARKET_FLUCTUATION_RANGE, MARKET_FLUCTUATION_RANGE)
+            change = rng.uniform(-MARKET_FLUCTUATION_RANGE, MARKET_FLUCTUATION_RANGE)
             new_price = current_price * (1 + change)
 
             # Keep prices within reasonable bounds
@@ -57,13 +73,36 @@ class Market:
             self.prices[resource_id] = max(min_price, min(max_price, new_price))
 
         # Randomly adjust stock
-        for resource_id in self.stock:
-            change = random.randint(-100, 200)
+        for resource_id in sorted(self.stock):
+            change = rng.randint(STOCK_CHANGE_MIN, STOCK_CHANGE_MAX)
             self.stock[resource_id] = max(0, self.stock[resource_id] + change)
 
+    def catch_up(self):
+        """Advance a lazily evaluated market to the current game time"""
+        if self.clock is not None:
+            self.advance_to(self.clock())
+
+    def advance_to(self, game_time: float):
+        """
+        Apply every fluctuation due since the last evaluation. One falls at
+        the end of each MARKET_UPDATE_INTERVAL of game time and draws from a
+        stream keyed by that interval, so one read or many give the same
+        prices and stock. Reads between two fluctuations change nothing.
+        """
+        if game_time <= self.last_evaluated:
+            return
+
+        first = int(self.last_evaluated // MARKET_UPDATE_INTERVAL) + 1
+        last = int(game_time // MARKET_UPDATE_INTERVAL)
+        for interval in range(first, last + 1):
+            self.fluctuate_prices(random.Random(f"{self.seed}:{self.location_id}:{interval}"))
+
+        self.last_evaluated = game_time
+
     def get_buy_price(self, resource_id: str, quantity: int = 1,
                      trade_bonus: float = 0.0) -> float:
         """Calculate price to buy from market (player buying)"""
+        self.catch_up()
         if resource_id not in self.prices:
             return 0
 
@@ -83,6 +122,7 @@ class Market:
     def get_sell_price(self, resource_id: str, quantity: int = 1,
                       trade_bonus: float = 0.0, tax_reduction: float = 0.0) -> float:
         """Calculate price to sell to market (player selling)"""
+        self.catch_up()
         if resource_id not in self.prices:
             return 0
 
@@ -111,6 +151,8 @@ class Market:
         if resource_id not in RESOURCES:
             return False, "Invalid resource", 0
 
+        self.catch_up()
+
         if resource_id not in self.stock or self.stock[resource_id] < quantity:
             return False, "Insufficient stock available", 0
 
@@ -147,6 +189,7 @@ class Market:
 
     def get_market_listing(self, filter_available: bool = False) -> List[Dict]:
         """Get list of market prices and availability"""
+        self.catch_up()
         listings = []
 
         for resource_id, resource_data in RESOURCES.items():
@@ -176,24 +219,32 @@ class Market:
         return {
             "location_id": self.location_id,
             "prices": self.prices,
-            "stock": self.stock
+            "stock": self.stock,
+            "seed": self.seed,
+            "last_evaluated": self.last_evaluated
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Market':
         """Create market from dictionary"""
-        market = cls(data["location_id"])
+        market = cls(data["location_id"], data.get("seed"), initialize=False)
         market.prices = data["prices"]
         market.stock = data["stock"]
+        market.last_evaluated = data.get("last_evaluated", 0.0)
         return market
 
 
 class EconomyManager:
     """Manages all markets and economic simulation"""
 
-    def __init__(self):
+    def __init__(self, lazy: bool = LAZY_MARKET_EVALUATION, seed: Optional[int] = None,
+                 initialize: bool = True):
+        self.lazy = lazy
+        self.seed = seed if seed is not None else _rng.getrandbits(32)
+        self.game_time = 0.0
         self.markets: Dict[str, Market] = {}
-        self._initialize_markets()
+        if initialize:
+            self._initialize_markets()
 
     def _initialize_markets(self):
         """Create markets for all locations"""
@@ -202,16 +253,36 @@ class EconomyManager:
 
             # Only create market if location has market service
             if "market" in location_data.get("services", []):
-                self.markets[location_id] = Market(location_id)
+                self.markets[location_id] = Market(location_id, self.seed)
+                self._attach(self.markets[location_id])
+
+    def _attach(self, market: Market):
+        """Hook a market up to this manager's clock"""
+        market.clock = self._now if self.lazy else None
+        if not self.lazy:
+            market.last_evaluated = self.game_time
+
+    def _now(self) -> float:
+        """Current economy game time"""
+        return self.game_time
 
     def get_market(self, location_id: str) -> Optional[Market]:
         """Get market at location"""
         return self.markets.get(location_id)
 
-    def update_markets(self):
-        """Update all market prices and stock"""
+    def update_markets(self, time_passed: float = MARKET_UPDATE_INTERVAL):
+        """
+        Update all market prices and stock.
+        In lazy mode only the clock advances; markets catch up when observed.
+        """
+        self.game_time += time_passed
+
+        if self.lazy:
+            return
+
         for market in self.markets.values():
             market.fluctuate_prices()
+            market.last_evaluated = self.game_time
 
     def find_best_trade_route(self, resource_id: str) -> Optional[Dict]:
         """Find best buy/sell locations for a resource"""
@@ -222,6 +293,7 @@ class EconomyManager:
         sell_prices = []
 
         for location_id, market in self.markets.items():
+            market.catch_up()
             if resource_id in market.prices and market.stock.get(resource_id, 0) > 0:
                 buy_price = market.get_buy_price(resource_id, 1)
                 sell_price = market.get_sell_price(resource_id, 1)
@@ -251,17 +323,34 @@ class EconomyManager:
         """Convert economy to dictionary"""
         return {
             "markets": {loc_id: market.to_dict()
-                       for loc_id, market in self.markets.items()}
+                       for loc_id, market in self.markets.items()},
+            "lazy": self.lazy,
+            "seed": self.seed,
+            "game_time": self.game_time
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'EconomyManager':
         """Create economy from dictionary"""
-        economy = cls()
+        economy = cls(data.get("lazy", LAZY_MARKET_EVALUATION), data.get("seed"), initialize=False)
+        economy.game_time = data.get("game_time", 0.0)
         economy.markets = {loc_id: Market.from_dict(market_data)
                           for loc_id, market_data in data["markets"].items()}
+        for loc_id, market_data in data["markets"].items():
+            # Old saves have no evaluation time - treat markets as current
+            if "last_evaluated" not in market_data:
+                economy.markets[loc_id].last_evaluated = economy.game_time
+            economy._attach(economy.markets[loc_id])
         return economy
 
+    def clone(self) -> 'EconomyManager':
+        """Independent copy of every market (cheaper than a deep copy)"""
+        data = self.to_dict()
+        for market_data in data["markets"].values():
+            market_data["prices"] = dict(market_data["prices"])
+            market_data["stock"] = dict(market_data["stock"])
+        return EconomyManager.from_dict(data)
+
 
 class ModuleMarket:
     """Handles buying and selling of ship modules"""
@@ -571,51 +660,31 @@ class ShipMarket:
 
     def generate_station_inventory(self, location_id: str, location_data: Dict) -> None:
         """Generate RNG-based ship inventory for a station"""
-        import random
-
         if "shipyard" not in location_data.get("services", []):
             return
 
         inventory = {}
 
-        # Get all ship types and tiers
-        ships_by_tier = {}
-        for ship_id, ship_data in VESSEL_CLASSES.items():
-            tier = ship_data.get("tier_num", 1)
-            if tier not in ships_by_tier:
-                ships_by_tier[tier] = []
-            ships_by_tier[tier].append(ship_id)
-
         # Stock 8-15 different ship types (increased from 3-8 for better availability)
-        num_types = random.randint(8, 15)
-
-        # Bias towards lower tiers (adjusted to show more variety)
-        tier_weights = {1: 35, 2: 30, 3: 20, 4: 12, 5: 6, 6: 3, 7: 1}
-
-        available_ships = []
-        for tier, ships in ships_by_tier.items():
-            weight = tier_weights.get(tier, 1)
-            for ship_id in ships:
-                for _ in range(int(weight)):
-                    available_ships.append(ship_id)
-
-        # Randomly select ships
-        if available_ships:
-            selected_ships = random.sample(available_ships, min(num_types, len(available_ships)))
+        num_types = _rng.randint(8, 15)
 
-            for ship_id in selected_ships:
+        # Ships are drawn with a bias towards lower tiers (repeats stack onto one entry)
+        ship_table = station_ship_table()
+        if ship_table:
+            for _ in range(min(num_types, len(ship_table))):
+                ship_id = ship_table.draw(_rng)
                 ship_data = VESSEL_CLASSES[ship_id]
                 tier = ship_data.get("tier_num", 1)
 
                 # Lower tier ships have more stock (increased quantities for better availability)
                 if tier == 1:
-                    quantity = random.randint(3, 6)
+                    quantity = _rng.randint(3, 6)
                 elif tier == 2:
-                    quantity = random.randint(2, 4)
+                    quantity = _rng.randint(2, 4)
                 elif tier <= 4:
-                    quantity = random.randint(1, 3)
+                    quantity = _rng.randint(1, 3)
                 else:
-                    quantity = random.randint(1, 2)  # High tier ships still somewhat rare
+                    quantity = _rng.randint(1, 2)  # High tier ships still somewhat rare
 
                 inventory[ship_id] = quantity
 
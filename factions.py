@@ -1,10 +1,17 @@
 """
 Faction and Territory System
-Handles faction relations, territory control, and influence
+Handles faction relations, territory control, and influence.
+Each faction's territory and power are kept up to date as control
+changes, so power and territory queries don't scan territory_control.
+Faction influence spreads between locations (see influence.py); rivals
+with enough influence at a border location start conflicts there or take
+it over.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from data import FACTIONS, LOCATIONS
+from config import INFLUENCE_CONFLICT_SHARE, INFLUENCE_FLIP_SHARE
+from influence import InfluenceMap
 
 
 class FactionManager:
@@ -22,6 +29,59 @@ class FactionManager:
         # Track ongoing conflicts
         self.conflicts: List[Dict] = []
 
+        # Derived from territory_control - change control through set_controller
+        self.territory: Dict[str, Dict[str, None]] = {}  # faction_id: controlled locations (ordered set)
+        self.power: Dict[str, int] = {}  # faction_id: calculate_faction_power result
+        self._access_cache: Dict[str, Tuple[int, Dict]] = {}  # location_id: (standings version, access)
+        self.influence = InfluenceMap(LOCATIONS, self.faction_data)
+        self.rebuild_territory()
+
+    def _trait_power(self, faction_id: str) -> int:
+        """Power a faction has from its traits, whatever it controls"""
+        bonuses = self.faction_data[faction_id].get("bonuses", {})
+        power = 0
+        if "combat" in bonuses:
+            power += int(bonuses["combat"] * 500)
+        if "territory_control" in bonuses:
+            power += int(bonuses["territory_control"] * 500)
+        return power
+
+    def _influence_strength(self, faction_id: str) -> float:
+        """Influence a controlled location adds per update: 1 plus the faction's combat and territory traits"""
+        bonuses = self.faction_data.get(faction_id, {}).get("bonuses", {})
+        return 1.0 + bonuses.get("combat", 0) + bonuses.get("territory_control", 0)
+
+    def rebuild_territory(self):
+        """Recompute every faction's territory, power and influence sources from territory_control"""
+        self.territory = {}
+        for location_id, faction_id in self.territory_control.items():
+            self.territory.setdefault(faction_id, {})[location_id] = None
+        for location_id in self.influence.location_ids:
+            controller = self.territory_control.get(location_id)
+            self.influence.set_emitter(location_id, controller, self._influence_strength(controller))
+        self.power = {faction_id: len(self.territory.get(faction_id, ())) * 100 + self._trait_power(faction_id)
+                      for faction_id in self.faction_data}
+        self._access_cache.clear()
+
+    def set_controller(self, location_id: str, faction_id: str):
+        """Hand a location to a faction, updating territory and power"""
+        previous = self.territory_control.get(location_id)
+        if previous == faction_id:
+            return
+
+        if previous is not None:
+            del self.territory[previous][location_id]
+            if previous in self.power:
+                self.power[previous] -= 100
+        self.territory_control[location_id] = faction_id
+        self.territory.setdefault(faction_id, {})[location_id] = None
+        if faction_id in self.power:
+            self.power[faction_id] += 100
+        self.influence.set_emitter(location_id, faction_id, self._influence_strength(faction_id))
+
+        # Access depends on who controls a location
+        self._access_cache.pop(location_id, None)
+
     def get_faction_info(self, faction_id: str) -> Optional[Dict]:
         """Get information about a faction"""
         return self.faction_data.get(faction_id)
@@ -32,28 +92,19 @@ class FactionManager:
 
     def get_faction_territory(self, faction_id: str) -> List[str]:
         """Get all locations controlled by faction"""
-        return [loc_id for loc_id, controller in self.territory_control.items()
-                if controller == faction_id]
-
-    def calculate_faction_power(self, faction_id: str) -> int:
-        """Calculate faction power based on territory"""
-        territory_count = len(self.get_faction_territory(faction_id))
-        faction_info = self.get_faction_info(faction_id)
-
-        if not faction_info:
-            return 0
+        return list(self.territory.get(faction_id, ()))
 
-        # Base power from territory
-        power = territory_count * 100
+    def get_territory_count(self, faction_id: str) -> int:
+        """Number of locations controlled by faction"""
+        return len(self.territory.get(faction_id, ()))
 
-        # Bonus from faction traits
-        bonuses = faction_info.get("bonuses", {})
-        if "combat" in bonuses:
-            power += int(bonuses["combat"] * 500)
-        if "territory_control" in bonuses:
-            power += int(bonuses["territory_control"] * 500)
-
-        return power
+    def calculate_faction_power(self, faction_id: str) -> int:
+        """
+        Faction power: 100 per controlled location plus trait bonuses
+        (combat and territory_control, 500 per point). Kept current by
+        set_controller.
+        """
+        return self.power.get(faction_id, 0)
 
     def get_faction_relations(self, faction_a: str, faction_b: str) -> float:
         """Get relationship value between two factions"""
@@ -77,11 +128,25 @@ class FactionManager:
         relation = self.get_faction_relations(faction_a, faction_b)
         return relation > 0.5
 
-    def get_player_access(self, location_id: str, player_standings: Dict[str, float]) -> Dict:
+    def get_player_access(self, location_id: str, player_standings: Dict[str, float],
+                          standings_version: Optional[int] = None) -> Dict:
         """
         Check player's access to a location based on faction standing.
-        Returns access level and restrictions.
+        Returns access level and restrictions. With standings_version (the
+        player's count of standing changes) the result is cached until the
+        standings or the location's controller change - do not modify it.
         """
+        if standings_version is not None:
+            cached = self._access_cache.get(location_id)
+            if cached is not None and cached[0] == standings_version:
+                return cached[1]
+
+        access = self._player_access(location_id, player_standings)
+        if standings_version is not None:
+            self._access_cache[location_id] = (standings_version, access)
+        return access
+
+    def _player_access(self, location_id: str, player_standings: Dict[str, float]) -> Dict:
         controlling_faction = self.get_controlling_faction(location_id)
 
         if not controlling_faction:
@@ -146,7 +211,7 @@ class FactionManager:
             # Check if conflict resolved
             if conflict["attacker_progress"] >= 100:
                 # Attacker wins
-                self.territory_control[conflict["location_id"]] = conflict["attacker"]
+                self.set_controller(conflict["location_id"], conflict["attacker"])
                 resolved_conflicts.append(conflict)
             elif conflict["attacker_progress"] <= -50 or conflict["duration"] > 100:
                 # Defender wins or stalemate
@@ -156,6 +221,32 @@ class FactionManager:
         for conflict in resolved_conflicts:
             self.conflicts.remove(conflict)
 
+    def update_influence(self, updates: int = 1) -> List[str]:
+        """
+        Spread influence, then act on border pressure: a rival holding
+        INFLUENCE_FLIP_SHARE of a location's influence takes it over, one
+        holding INFLUENCE_CONFLICT_SHARE starts a conflict there (allies
+        don't fight). Returns what happened, for display.
+        """
+        self.influence.step(updates)
+
+        events = []
+        contested = {conflict["location_id"] for conflict in self.conflicts}
+        for location_id, rival, share in self.influence.challengers(self.territory_control, INFLUENCE_CONFLICT_SHARE):
+            defender = self.territory_control[location_id]
+            if self.is_allied(rival, defender):
+                continue
+            location_name = LOCATIONS.get(location_id, {}).get("name", location_id)
+            if share >= INFLUENCE_FLIP_SHARE:
+                self.set_controller(location_id, rival)
+                self.conflicts = [c for c in self.conflicts if c["location_id"] != location_id]
+                events.append(f"{FACTIONS[rival]['name']} took {location_name} from {FACTIONS[defender]['name']}")
+            elif location_id not in contested:
+                self.start_conflict(location_id, rival)
+                contested.add(location_id)
+                events.append(f"{FACTIONS[rival]['name']} is contesting {location_name}")
+        return events
+
     def get_faction_bonuses(self, faction_id: str, player_standing: float) -> Dict[str, float]:
         """
         Get bonuses player receives based on faction standing.
@@ -207,8 +298,6 @@ class FactionManager:
 
         for faction_id, faction_data in self.faction_data.items():
             player_standing = player_standings.get(faction_id, 0.0)
-            territory = self.get_faction_territory(faction_id)
-            power = self.calculate_faction_power(faction_id)
 
             # Determine relationship status
             if player_standing >= 0.75:
@@ -230,8 +319,8 @@ class FactionManager:
                 "id": faction_id,
                 "name": faction_data["name"],
                 "description": faction_data["description"],
-                "territory_count": len(territory),
-                "power": power,
+                "territory_count": self.get_territory_count(faction_id),
+                "power": self.calculate_faction_power(faction_id),
                 "player_standing": player_standing,
                 "status": status
             })
@@ -242,7 +331,8 @@ class FactionManager:
         """Convert to dictionary"""
         return {
             "territory_control": self.territory_control,
-            "conflicts": self.conflicts
+            "conflicts": self.conflicts,
+            "influence": self.influence.to_dict()
         }
 
     @classmethod
@@ -251,4 +341,6 @@ class FactionManager:
         manager = cls()
         manager.territory_control = data.get("territory_control", {})
         manager.conflicts = data.get("conflicts", [])
+        manager.rebuild_territory()
+        manager.influence.load(data.get("influence", {}))
         return manager
@@ -0,0 +1,156 @@
+"""
+Fleet Registry
+Every ship the player owns as its own Vessel instance - modules, damage
+and custom name included - under a unique id. Ships are indexed by the
+location they are berthed at and by vessel class, so berth occupancy,
+escort lookups and "find a ship of this class here" are set lookups
+instead of scans.
+"""
+
+from typing import Dict, List, Optional
+
+from vessels import Vessel
+
+
+class FleetRegistry:
+    """
+    Ships by unique id with their berth location. The piloted ship is in
+    the registry too (active_uid) and keeps the berth it was stored in.
+    Index dicts map to None so they keep insertion order (ordered sets).
+    """
+
+    def __init__(self):
+        self.ships: Dict[str, Vessel] = {}
+        self.locations: Dict[str, str] = {}  # uid: location_id
+        self.by_location: Dict[str, Dict[str, None]] = {}
+        self.by_class: Dict[str, Dict[str, None]] = {}
+        self.active_uid: Optional[str] = None
+        self.next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.ships)
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self.ships
+
+    @property
+    def active(self) -> Optional[Vessel]:
+        """The piloted ship, if it is registered"""
+        return self.ships.get(self.active_uid) if self.active_uid else None
+
+    def _index(self, uid: str, vessel: Vessel, location_id: str):
+        self.locations[uid] = location_id
+        self.by_location.setdefault(location_id, {})[uid] = None
+        self.by_class.setdefault(vessel.vessel_class_id, {})[uid] = None
+
+    def _unindex(self, uid: str, vessel: Vessel):
+        location_id = self.locations.pop(uid)
+        for index, key in ((self.by_location, location_id), (self.by_class, vessel.vessel_class_id)):
+            members = index[key]
+            del members[uid]
+            if not members:
+                del index[key]
+
+    def add(self, vessel: Vessel, location_id: str, uid: Optional[str] = None) -> str:
+        """Register a ship berthed at location_id. Returns its id."""
+        if uid is None:
+            uid = f"ship-{self.next_id}"
+            self.next_id += 1
+        self.ships[uid] = vessel
+        self._index(uid, vessel, location_id)
+        return uid
+
+    def remove(self, uid: str) -> Optional[Vessel]:
+        """Take a ship out of the fleet (sold, scrapped or destroyed)"""
+        vessel = self.ships.pop(uid, None)
+        if vessel is not None:
+            self._unindex(uid, vessel)
+            if uid == self.active_uid:
+                self.active_uid = None
+        return vessel
+
+    def move(self, uid: str, location_id: str):
+        """Re-berth a ship at another location"""
+        vessel = self.ships[uid]
+        self._unindex(uid, vessel)
+        self._index(uid, vessel, location_id)
+
+    def get(self, uid: str) -> Optional[Vessel]:
+        return self.ships.get(uid)
+
+    def location_of(self, uid: str) -> Optional[str]:
+        return self.locations.get(uid)
+
+    def uid_of(self, vessel: Vessel) -> Optional[str]:
+        """Id of a registered Vessel instance"""
+        if self.active_uid and self.ships.get(self.active_uid) is vessel:
+            return self.active_uid
+        for uid in self.by_class.get(vessel.vessel_class_id, ()):
+            if self.ships[uid] is vessel:
+                return uid
+        return None
+
+    def ships_at(self, location_id: str) -> List[str]:
+        """Ids of ships berthed at a location, in the order they arrived"""
+        return list(self.by_location.get(location_id, ()))
+
+    def ships_of_class(self, vessel_class_id: str) -> List[str]:
+        """Ids of every ship of a class"""
+        return list(self.by_class.get(vessel_class_id, ()))
+
+    def count_at(self, location_id: str) -> int:
+        """Berths taken at a location"""
+        return len(self.by_location.get(location_id, ()))
+
+    def find(self, location_id: str, vessel_class_id: str, include_active: bool = False) -> Optional[str]:
+        """A ship of a class berthed at a location (not the piloted one unless asked)"""
+        at_location = self.by_location.get(location_id)
+        if not at_location:
+            return None
+        for uid in self.by_class.get(vessel_class_id, ()):
+            if uid in at_location and (include_active or uid != self.active_uid):
+                return uid
+        return None
+
+    @staticmethod
+    def _ship_to_dict(vessel: Vessel, location_id: str) -> Dict:
+        """Saved form of one ship - full hull, full shields and no custom name are left out"""
+        data = {"location": location_id, "class": vessel.vessel_class_id}
+        if vessel.name != vessel.class_name:
+            data["name"] = vessel.name
+        if vessel.current_hull_hp < vessel.max_hull_hp:
+            data["hull"] = vessel.current_hull_hp
+        if vessel.current_shields < vessel.get_total_shield_capacity():
+            data["shields"] = vessel.current_shields
+        modules = {module_type: module_ids for module_type, module_ids in vessel.installed_modules.items() if module_ids}
+        if modules:
+            data["modules"] = modules
+        return data
+
+    @staticmethod
+    def _ship_from_dict(data: Dict) -> Vessel:
+        vessel = Vessel(data["class"], data.get("name"))
+        for module_type, module_ids in data.get("modules", {}).items():
+            vessel.installed_modules[module_type] = list(module_ids)
+        vessel.invalidate_stats()
+        vessel.current_hull_hp = data.get("hull", vessel.max_hull_hp)
+        vessel.current_shields = data.get("shields", vessel.get_total_shield_capacity())
+        return vessel
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "ships": {uid: self._ship_to_dict(vessel, self.locations[uid]) for uid, vessel in self.ships.items()},
+            "active": self.active_uid,
+            "next_id": self.next_id
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FleetRegistry':
+        """Create from dictionary"""
+        registry = cls()
+        for uid, ship in data.get("ships", {}).items():
+            registry.add(cls._ship_from_dict(ship), ship["location"], uid)
+        registry.active_uid = data.get("active") if data.get("active") in registry.ships else None
+        registry.next_id = data.get("next_id", len(registry.ships) + 1)
+        return registry
@@ -0,0 +1,342 @@
+"""
+Fleet Combat
+Many-vs-many battles (the player's flagship and escorts against pirate
+wings). Each side is held as arrays - hull, shields, armor, evasion and
+per-weapon damage/accuracy vectors - and a whole side's volley is
+resolved at once, so battles with hundreds of ships stay interactive.
+The log keeps one summary per volley instead of a line per shot.
+"""
+
+import random
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from vessels import Combatant
+from rng_service import get_stream
+
+# Optional NumPy (falls back to plain Python loops over the same arrays)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+_rng = get_stream("combat")
+
+# Same rules as CombatEncounter
+CRIT_CHANCE = 0.15
+PIRATE_DAMAGE_MULTIPLIER = 0.8
+PIRATE_SHIELD_REGEN = 50
+
+FLEET_LOG_SIZE = 200  # Volley summaries kept
+
+# How a side picks targets each turn:
+#   focus_weakest   - concentrate fire on the enemies closest to dying,
+#                     moving on once a target has enough expected damage
+#   focus_strongest - the same, starting with the enemies dealing the most damage
+#   spread          - each ship takes a different target
+#   random          - each ship picks any surviving enemy
+TARGET_POLICIES = ("focus_weakest", "focus_strongest", "spread", "random")
+
+
+class FleetSide:
+    """One side of a fleet battle, in array form"""
+
+    def __init__(self, name: str, vessels: Sequence[Combatant], policy: str = "focus_weakest",
+                 damage_multiplier: float = 1.0, crit_chance: float = 0.0, skill_bonus: float = 0.0,
+                 shield_regen: Optional[float] = None):
+        if policy not in TARGET_POLICIES:
+            raise ValueError(f"Invalid targeting policy: {policy}")
+
+        self.name = name
+        self.vessels = list(vessels)
+        self.policy = policy
+        self.crit_chance = crit_chance
+        self.skill_bonus = skill_bonus
+
+        stats = [vessel.get_stats() for vessel in self.vessels]
+        hull = [float(vessel.current_hull_hp) for vessel in self.vessels]
+        shields = [float(vessel.current_shields) for vessel in self.vessels]
+        shield_capacity = [s.shield_capacity for s in stats]
+        regen = [s.shield_recharge if shield_regen is None else shield_regen for s in stats]
+        armor_reduction = [s.armor_reduction for s in stats]
+        evasion = [s.evasion for s in stats]
+
+        # Weapons flattened across ships; weapon_owner maps each to its ship
+        weapon_owner, weapon_damage, weapon_accuracy = [], [], []
+        for index, ship_stats in enumerate(stats):
+            for weapon in ship_stats.weapons:
+                weapon_owner.append(index)
+                weapon_damage.append(weapon.get("damage", 100) * damage_multiplier * (1.0 + skill_bonus))
+                weapon_accuracy.append(weapon.get("accuracy", 0.85) * (1 + skill_bonus))
+
+        # Damage each ship deals per volley if every weapon hits (target priority)
+        threat = [0.0] * len(self.vessels)
+        for owner, damage in zip(weapon_owner, weapon_damage):
+            threat[owner] += damage
+
+        def array(values, dtype=float):
+            return np.array(values, dtype=dtype) if HAS_NUMPY else list(values)
+
+        self.hull = array(hull)
+        self.shields = array(shields)
+        self.shield_capacity = array(shield_capacity)
+        self.shield_regen = array(regen)
+        self.armor_reduction = array(armor_reduction)
+        self.evasion = array(evasion)
+        self.threat = array(threat)
+        self.weapon_owner = array(weapon_owner, int)
+        self.weapon_damage = array(weapon_damage)
+        self.weapon_accuracy = array(weapon_accuracy)
+        self.alive = array([h > 0 for h in hull], bool)
+
+    def alive_count(self) -> int:
+        """Ships still fighting"""
+        return int(sum(self.alive))
+
+    def alive_indices(self) -> List[int]:
+        """Indices of ships still fighting"""
+        if HAS_NUMPY:
+            return np.flatnonzero(self.alive).tolist()
+        return [i for i, alive in enumerate(self.alive) if alive]
+
+    def sync_to_vessels(self):
+        """Write hull and shields back to the vessel objects"""
+        for index, vessel in enumerate(self.vessels):
+            vessel.current_hull_hp = float(self.hull[index])
+            vessel.current_shields = float(self.shields[index])
+
+    def get_status(self) -> Dict:
+        """Summary of the side for display"""
+        alive = self.alive_indices()
+        return {
+            "name": self.name,
+            "ships": len(self.vessels),
+            "alive": len(alive),
+            "hull": float(sum(self.hull[i] for i in alive)),
+            "shields": float(sum(self.shields[i] for i in alive)),
+            "threat": float(sum(self.threat[i] for i in alive))
+        }
+
+
+class FleetBattle:
+    """A many-vs-many battle resolved in whole-side volleys"""
+
+    def __init__(self, attackers: FleetSide, defenders: FleetSide, seed: Optional[int] = None):
+        self.sides = (attackers, defenders)
+        self.turn_number = 0
+        self.is_active = attackers.alive_count() > 0 and defenders.alive_count() > 0
+        self.winner: Optional[str] = None
+        self.log: deque = deque(maxlen=FLEET_LOG_SIZE)
+
+        # One draw from the combat stream seeds the whole battle
+        if seed is None:
+            seed = _rng.getrandbits(64)
+        self.seed = seed
+        self._gen = np.random.default_rng(seed) if HAS_NUMPY else None
+        self._py_rng = None if HAS_NUMPY else random.Random(seed)
+
+    def resolve_turn(self) -> List[Dict]:
+        """
+        Resolve one turn: the first side fires, then the survivors of the
+        second side, then shields regenerate. Returns the volley summaries.
+        """
+        if not self.is_active:
+            return []
+
+        self.turn_number += 1
+        summaries = []
+        for attacker, defender in (self.sides, self.sides[::-1]):
+            if attacker.alive_count() == 0 or defender.alive_count() == 0:
+                break
+            summary = self._volley(attacker, defender)
+            self.log.append(summary)
+            summaries.append(summary)
+
+        for side in self.sides:
+            self._regenerate(side)
+            side.sync_to_vessels()
+
+        self._check_finished()
+        return summaries
+
+    def auto_resolve(self, max_turns: int = 100) -> Optional[str]:
+        """Fight until one side is gone or max_turns pass. Returns the winner's name."""
+        for _ in range(max_turns):
+            if not self.is_active:
+                break
+            self.resolve_turn()
+        return self.winner
+
+    def destroyed(self, side_index: int) -> List[Combatant]:
+        """Vessels of a side that have been destroyed"""
+        side = self.sides[side_index]
+        return [vessel for vessel, alive in zip(side.vessels, side.alive) if not alive]
+
+    def get_battle_status(self) -> Dict:
+        """Current battle state"""
+        return {
+            "turn": self.turn_number,
+            "active": self.is_active,
+            "winner": self.winner,
+            "sides": [side.get_status() for side in self.sides]
+        }
+
+    def get_combat_log(self, last_n: int = 5) -> List[str]:
+        """Recent volley summaries as text"""
+        recent = list(self.log)[-last_n:]
+        return [format_volley(summary) for summary in recent]
+
+    def _check_finished(self):
+        attackers, defenders = self.sides
+        if defenders.alive_count() == 0:
+            self.winner = attackers.name
+        elif attackers.alive_count() == 0:
+            self.winner = defenders.name
+        else:
+            return
+        self.is_active = False
+
+    def _select_targets(self, attacker: FleetSide, defender: FleetSide) -> Dict[int, int]:
+        """Target (defender index) of each surviving attacking ship"""
+        shooters = attacker.alive_indices()
+        targets = defender.alive_indices()
+
+        if attacker.policy == "random":
+            if HAS_NUMPY:
+                picks = self._gen.integers(len(targets), size=len(shooters)).tolist()
+            else:
+                picks = [self._py_rng.randrange(len(targets)) for _ in shooters]
+            return {s: targets[p] for s, p in zip(shooters, picks)}
+
+        if attacker.policy == "spread":
+            return {s: targets[i % len(targets)] for i, s in enumerate(shooters)}
+
+        # Focus fire: biggest guns are assigned first, each target takes
+        # shots until the expected damage on it covers its hull and shields
+        if attacker.policy == "focus_weakest":
+            targets.sort(key=lambda t: defender.hull[t] + defender.shields[t])
+        else:
+            targets.sort(key=lambda t: -defender.threat[t])
+        shooters.sort(key=lambda s: -attacker.threat[s])
+
+        assignment = {}
+        target_pos = 0
+        committed = 0.0
+        for shooter in shooters:
+            target = targets[target_pos]
+            assignment[shooter] = target
+            committed += attacker.threat[shooter] * (1 - defender.evasion[target]) * 0.85
+            if committed >= defender.hull[target] + defender.shields[target] and target_pos < len(targets) - 1:
+                target_pos += 1
+                committed = 0.0
+        return assignment
+
+    def _volley(self, attacker: FleetSide, defender: FleetSide) -> Dict:
+        """Every surviving attacker fires every weapon at its target"""
+        assignment = self._select_targets(attacker, defender)
+        if HAS_NUMPY:
+            shots, hits, crits, per_target = self._fire_numpy(attacker, defender, assignment)
+        else:
+            shots, hits, crits, per_target = self._fire_python(attacker, defender, assignment)
+
+        shield_damage, hull_damage, destroyed = self._apply_damage(defender, per_target)
+        return {
+            "turn": self.turn_number,
+            "side": attacker.name,
+            "target_side": defender.name,
+            "ships_firing": len(assignment),
+            "shots": shots,
+            "hits": hits,
+            "crits": crits,
+            "damage": float(sum(per_target)),
+            "shield_damage": shield_damage,
+            "hull_damage": hull_damage,
+            "destroyed": [defender.vessels[i].name for i in destroyed]
+        }
+
+    def _fire_numpy(self, attacker: FleetSide, defender: FleetSide, assignment: Dict[int, int]):
+        ship_target = np.full(len(attacker.vessels), -1)
+        ship_target[list(assignment)] = list(assignment.values())
+
+        weapon_target = ship_target[attacker.weapon_owner]
+        firing = weapon_target >= 0
+        weapon_target = weapon_target[firing]
+        shots = int(weapon_target.size)
+
+        hit_chance = attacker.weapon_accuracy[firing] * (1 - defender.evasion[weapon_target])
+        hit = self._gen.random(shots) <= hit_chance
+        crit = hit & (self._gen.random(shots) < attacker.crit_chance)
+        damage = attacker.weapon_damage[firing] * hit * np.where(crit, 2.0, 1.0)
+
+        per_target = np.bincount(weapon_target, weights=damage, minlength=len(defender.vessels))
+        return shots, int(hit.sum()), int(crit.sum()), per_target
+
+    def _fire_python(self, attacker: FleetSide, defender: FleetSide, assignment: Dict[int, int]):
+        rng = self._py_rng
+        per_target = [0.0] * len(defender.vessels)
+        shots = hits = crits = 0
+        for owner, damage, accuracy in zip(attacker.weapon_owner, attacker.weapon_damage, attacker.weapon_accuracy):
+            target = assignment.get(owner)
+            if target is None:
+                continue
+            shots += 1
+            if rng.random() > accuracy * (1 - defender.evasion[target]):
+                continue
+            hits += 1
+            if rng.random() < attacker.crit_chance:
+                crits += 1
+                damage *= 2.0
+            per_target[target] += damage
+        return shots, hits, crits, per_target
+
+    def _apply_damage(self, side: FleetSide, per_target) -> Tuple[float, float, List[int]]:
+        """Shields absorb first, the rest hits the hull through armor (as Combatant.take_damage)"""
+        if HAS_NUMPY:
+            absorbed = np.minimum(per_target, np.maximum(side.shields, 0))
+            hull_damage = np.minimum((per_target - absorbed) * side.armor_reduction, side.hull)
+            side.shields -= absorbed
+            side.hull -= hull_damage
+            destroyed = side.alive & (side.hull <= 0)
+            side.alive &= ~destroyed
+            return float(absorbed.sum()), float(hull_damage.sum()), np.flatnonzero(destroyed).tolist()
+
+        shield_total = hull_total = 0.0
+        destroyed = []
+        for index, damage in enumerate(per_target):
+            if damage <= 0:
+                continue
+            absorbed = min(damage, max(side.shields[index], 0))
+            hull_damage = min((damage - absorbed) * side.armor_reduction[index], side.hull[index])
+            side.shields[index] -= absorbed
+            side.hull[index] -= hull_damage
+            shield_total += absorbed
+            hull_total += hull_damage
+            if side.alive[index] and side.hull[index] <= 0:
+                side.alive[index] = False
+                destroyed.append(index)
+        return shield_total, hull_total, destroyed
+
+    def _regenerate(self, side: FleetSide):
+        """Shields of surviving ships recharge between turns"""
+        if HAS_NUMPY:
+            side.shields = np.where(side.alive, np.minimum(side.shield_capacity, side.shields + side.shield_regen), side.shields)
+            return
+        for index, alive in enumerate(side.alive):
+            if alive:
+                side.shields[index] = min(side.shield_capacity[index], side.shields[index] + side.shield_regen[index])
+
+
+def format_volley(summary: Dict) -> str:
+    """Render a volley summary as a log line"""
+    msg = (f"Turn {summary['turn']}: {summary['side']} - {summary['ships_firing']} ships, "
+           f"{summary['hits']}/{summary['shots']} hits")
+    if summary["crits"]:
+        msg += f" ({summary['crits']} crits)"
+    msg += f", {summary['shield_damage']:.0f} to shields, {summary['hull_damage']:.0f} to hull"
+    destroyed = summary["destroyed"]
+    if destroyed:
+        names = ", ".join(destroyed[:3]) + (f" +{len(destroyed) - 3} more" if len(destroyed) > 3 else "")
+        msg += f". Destroyed: {names}"
+    return msg
@@ -0,0 +1,148 @@
+"""
+Fleet Operations
+Repeating jobs for berthed ships: mining a field for the ship's home
+station, hauling a resource between two markets and ferrying stored items
+between stations. A job's round trip is a fixed cycle of game time, so
+ships are not simulated in flight - the scheduler keeps jobs in a queue by
+next completion, and on each tick only the jobs that have finished cycles
+are touched, each once for all cycles finished since it last ran.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from config import FLEET_OPS_DOCK_TIME, MINING_CYCLE_TIME
+from logistics import route_distance
+from travel_system import calculate_travel_time
+from vessels import Vessel
+
+# Job kind: number of stops it needs
+OPERATION_KINDS = {
+    "mine": 1,   # [field] - ore goes to storage at the ship's home station
+    "haul": 2,   # [buy_at, sell_at] - a resource bought at one market and sold at the other
+    "ferry": 2,  # [from_station, to_station] - stored items moved between stations
+}
+
+
+def cycle_time(kind: str, home: str, stops: List[str], vessel: Vessel) -> float:
+    """Game seconds for one round trip of a job"""
+    route = [home] + stops if kind == "mine" else list(stops)
+    speed = vessel.get_effective_speed()
+    legs = zip(route, route[1:] + route[:1])
+    travel = sum(calculate_travel_time(route_distance(a, b), speed) for a, b in legs if a != b)
+    work = MINING_CYCLE_TIME if kind == "mine" else FLEET_OPS_DOCK_TIME * len(stops)
+    return float(travel + work)
+
+
+class FleetOperation:
+    """A repeating job of one ship"""
+
+    __slots__ = ("uid", "kind", "home", "stops", "item_id", "cycle_time", "next_due", "cycles", "totals")
+
+    def __init__(self, uid: str, kind: str, home: str, stops: List[str], item_id: Optional[str],
+                 cycle_time: float, next_due: float):
+        self.uid = uid  # Fleet id of the ship
+        self.kind = kind
+        self.home = home  # Berth location of the ship
+        self.stops = stops
+        self.item_id = item_id  # Resource hauled or item ferried (None for mining)
+        self.cycle_time = cycle_time
+        self.next_due = next_due  # Game time the next cycle finishes
+        self.cycles = 0  # Cycles resolved so far
+        self.totals: Dict[str, float] = {}  # Running results: item_id or "credits" -> amount
+
+    def record(self, results: Dict[str, float]):
+        """Add one batch of results to the running totals"""
+        for key, amount in results.items():
+            self.totals[key] = self.totals.get(key, 0) + amount
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "uid": self.uid,
+            "kind": self.kind,
+            "home": self.home,
+            "stops": self.stops,
+            "item_id": self.item_id,
+            "cycle_time": self.cycle_time,
+            "next_due": self.next_due,
+            "cycles": self.cycles,
+            "totals": self.totals
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FleetOperation':
+        """Create from dictionary"""
+        operation = cls(data["uid"], data["kind"], data["home"], data["stops"], data.get("item_id"),
+                        data["cycle_time"], data["next_due"])
+        operation.cycles = data.get("cycles", 0)
+        operation.totals = data.get("totals", {})
+        return operation
+
+
+class FleetOpsScheduler:
+    """
+    Running jobs by ship, with a heap of (next_due, uid). Recalled or
+    reassigned jobs leave stale heap entries that are skipped when popped.
+    """
+
+    def __init__(self):
+        self.operations: Dict[str, FleetOperation] = {}
+        self.queue: List[Tuple[float, str]] = []
+
+    def __contains__(self, uid: str) -> bool:
+        return uid in self.operations
+
+    def get(self, uid: str) -> Optional[FleetOperation]:
+        return self.operations.get(uid)
+
+    def assign(self, operation: FleetOperation):
+        """Start (or replace) a ship's job"""
+        self.operations[operation.uid] = operation
+        heapq.heappush(self.queue, (operation.next_due, operation.uid))
+
+    def cancel(self, uid: str) -> Optional[FleetOperation]:
+        """Stop a ship's job"""
+        return self.operations.pop(uid, None)
+
+    def next_due(self) -> Optional[float]:
+        """Game time the next cycle of any job finishes"""
+        while self.queue:
+            due, uid = self.queue[0]
+            operation = self.operations.get(uid)
+            if operation is not None and operation.next_due == due:
+                return due
+            heapq.heappop(self.queue)
+        return None
+
+    def pop_due(self, game_time: float) -> List[Tuple[FleetOperation, int]]:
+        """
+        Jobs with cycles finished by game_time and how many finished, in
+        order of completion. Each job is advanced past its finished cycles
+        and queued for its next one.
+        """
+        due_jobs = []
+        while True:
+            due = self.next_due()
+            if due is None or due > game_time:
+                break
+            _, uid = heapq.heappop(self.queue)
+            operation = self.operations[uid]
+            cycles = int((game_time - due) // operation.cycle_time) + 1
+            operation.next_due = due + cycles * operation.cycle_time
+            operation.cycles += cycles
+            heapq.heappush(self.queue, (operation.next_due, uid))
+            due_jobs.append((operation, cycles))
+        return due_jobs
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {"operations": [operation.to_dict() for operation in self.operations.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FleetOpsScheduler':
+        """Create from dictionary"""
+        scheduler = cls()
+        for operation_data in data.get("operations", []):
+            scheduler.assign(FleetOperation.from_dict(operation_data))
+        return scheduler
@@ -3,53 +3,141 @@ Core Game Engine
 Main game state and logic management
 """
 
+import copy
 import time
-import random
-from typing import Dict, Optional, Tuple, List
+import threading
+import uuid
+import functools
+from typing import Callable, Dict, Optional, Tuple, List
 from player import Player
 from vessels import Vessel
 from economy import EconomyManager, ModuleMarket, ComponentMarket, ShipMarket
-from combat import CombatEncounter, create_enemy_vessel
+from combat import CombatEncounter, result_text, create_enemy_vessel, create_pirate_wing, get_enemy_template_key, spawn_npc_vessel, npc_vessel_from_dict
+from fleet_combat import FleetSide, FleetBattle, CRIT_CHANCE, PIRATE_DAMAGE_MULTIPLIER, PIRATE_SHIELD_REGEN
 from missions import ContractBoard
 from factions import FactionManager
 from shipyard import Shipyard
-from manufacturing import ManufacturingManager
+from manufacturing import ManufacturingManager, recipe_inputs
 from recycling import RecyclingSystem
 from berth_system import BerthManager
 from commodity_market import CommodityMarket
-from save_system import save_game, load_game
+from asteroid_fields import AsteroidFieldManager
+from refinery import RefineryManager
+from fleet_ops import FleetOpsScheduler, FleetOperation, OPERATION_KINDS, cycle_time
+from save_system import save_game, load_game, list_save_slots, slot_path, journal_path, new_slot_name
+from journal import CommandJournal, read_journal
 from data import LOCATIONS, RESOURCES, MODULES, RAW_RESOURCES, REFINING_YIELD_RANGES, VESSEL_CLASSES, COMMODITIES
 from travel_system import get_travel_distance, calculate_travel_time
-from config import STARTING_CREDITS, STARTING_LOCATION, STARTING_VESSEL
+from config import (STARTING_CREDITS, STARTING_LOCATION, STARTING_VESSEL, SAVE_FILE, JOURNAL_COMPACT_INTERVAL,
+                    MANUFACTURING_BASE_LINES, MANUFACTURING_SKILL_LEVELS_PER_LINE, FLEET_OPS_MINING_YIELD,
+                    PIRATE_WING_MIN_DANGER, PIRATE_WING_COOLDOWN)
+from rng_service import get_stream, get_rng_service
+from universe import get_universe_template, claim_prepared_seed
+from item_registry import get_item, get_item_name
+from volume_system import get_item_volume
+from logistics import plan_consolidation
+from sampling import commodity_table, resource_table, trader_module_table, trader_name_table, trader_ship_table
+
+_rng = get_stream("game_engine")
+
+
+def recorded_command(method):
+    """
+    Mark an engine method as a player command.
+    Completed commands are reported to the engine's command listeners
+    (replay logs, journals). Commands issued from inside another command
+    are not reported separately.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._command_depth == 0 and self.rng.recording:
+            self.rng.take_draws()  # Only this command's draws go to the journal
+        self._command_depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self._command_depth -= 1
+
+        if self._command_depth == 0:
+            for listener in self.command_listeners:
+                listener(method.__name__, args, kwargs, result)
+
+        return result
+
+    wrapper.is_command = True
+    return wrapper
 
 
 class GameEngine:
     """Main game engine managing all systems"""
 
     def __init__(self):
+        self.rng = get_rng_service()
+        self.command_listeners: List[Callable] = []  # Called as listener(command, args, kwargs, result)
+        self._command_depth = 0
+        self.game_id = uuid.uuid4().hex  # Ties journal records to the game they belong to
+        self.save_file = SAVE_FILE  # Save slot this game is written to
+        self.journal: Optional[CommandJournal] = None
+        self.checkpoint_seq: Optional[int] = None  # Journal sequence covered by the save file
+        self._save_lock = threading.Lock()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        self._replaying = False
+
         self.player: Optional[Player] = None
         self.vessel: Optional[Vessel] = None
-        self.economy: EconomyManager = EconomyManager()
-        self.contract_board: ContractBoard = ContractBoard()
-        self.faction_manager: FactionManager = FactionManager()
+
+        # Per-game universe state - built by new_game or load_saved_game
+        self.economy: Optional[EconomyManager] = None
+        self.contract_board: Optional[ContractBoard] = None
+        self.faction_manager: Optional[FactionManager] = None
+        self.berth_manager: Optional[BerthManager] = None
+        self.ship_market: Optional[ShipMarket] = None
+        self.commodity_market: Optional[CommodityMarket] = None
+
         self.shipyard: Shipyard = Shipyard()
-        self.berth_manager: BerthManager = BerthManager()
         self.module_market: ModuleMarket = ModuleMarket()
         self.component_market: ComponentMarket = ComponentMarket()
-        self.ship_market: ShipMarket = ShipMarket()
         self.manufacturing: ManufacturingManager = ManufacturingManager()
         self.recycling: RecyclingSystem = RecyclingSystem()
-        self.commodity_market: CommodityMarket = CommodityMarket()
+        self.asteroid_fields: AsteroidFieldManager = AsteroidFieldManager()
+        self.refinery: RefineryManager = RefineryManager()
+        self.fleet_ops: FleetOpsScheduler = FleetOpsScheduler()
 
         self.current_combat: Optional[CombatEncounter] = None
+        self.last_fleet_battle: Optional[FleetBattle] = None
+        self.last_pirate_wing: Optional[float] = None  # Game time of the last pirate wing engagement
         self.current_trader: Optional[Dict] = None  # Current trader encounter
         self.pending_travel_destination: Optional[str] = None  # Destination when trader encountered during travel
         self.game_time = 0  # In-game time elapsed
         self.last_update = time.time()
         self.mining_attempts = 0  # Track mining attempts for encounters
 
-    def new_game(self, player_name: str):
-        """Start a new game"""
+    def new_game(self, player_name: str, seed: Optional[int] = None):
+        """Start a new game (seed makes the run reproducible)"""
+        if seed is None:
+            seed = claim_prepared_seed()
+        if seed is None:
+            self.rng.reseed()
+            seed = self.rng.seed
+
+        # Clone the prebuilt universe for this seed (built once and cached);
+        # this also leaves the random streams where a fresh build would
+        universe = get_universe_template(seed).instantiate()
+        self.economy = universe["economy"]
+        self.contract_board = universe["contract_board"]
+        self.faction_manager = universe["faction_manager"]
+        self.berth_manager = universe["berth_manager"]
+        self.commodity_market = universe["commodity_market"]
+        self.ship_market = universe["ship_market"]
+        self.asteroid_fields = AsteroidFieldManager()
+        self.refinery = RefineryManager()
+        self.fleet_ops = FleetOpsScheduler()
+        self.last_pirate_wing = None
+
+        self.game_id = uuid.uuid4().hex
+        self.checkpoint_seq = None
+        self.save_file = slot_path(new_slot_name(player_name))
+
         self.player = Player(player_name, STARTING_CREDITS)
         self.player.location = STARTING_LOCATION
 
@@ -66,31 +154,9 @@ class GameEngine:
         # Set shields to full capacity after installing modules
         self.vessel.current_shields = self.vessel.get_total_shield_capacity()
 
-        # Initialize systems
-        self.economy = EconomyManager()
-        self.contract_board = ContractBoard()
-        self.faction_manager = FactionManager()
-        self.berth_manager = BerthManager()
-        self.commodity_market = CommodityMarket()
-
-        # Initialize ship market inventories
-        self.ship_market.initialize_all_stations(LOCATIONS)
-
-        # Initialize shipyards at all locations with shipyard service
-        for location_id, location_data in LOCATIONS.items():
-            if "shipyard" in location_data.get("services", []):
-                # Determine location type for berth pricing
-                location_type = "major_station" if location_id == STARTING_LOCATION else "standard_station"
-                # Start with 1 berth at starting location, 0 elsewhere
-                starting_berths = 1 if location_id == STARTING_LOCATION else 0
-                self.berth_manager.initialize_shipyard(location_id, location_type, starting_berths)
-
         # Store starting ship in berth
         self.player.current_ship_id = STARTING_VESSEL
-        self.berth_manager.store_ship(STARTING_LOCATION, STARTING_VESSEL)
-
-        # Generate initial contracts for all locations with at least 1 per location
-        self.contract_board.generate_contracts_all_locations(min_per_location=1, max_per_location=3, contracts_completed=self.player.stats['contracts_completed'])
+        _, _, self.berth_manager.fleet.active_uid = self.berth_manager.store_vessel(STARTING_LOCATION, self.vessel)
 
         print(f"\n=== Welcome to Void Dominion, Commander {player_name}! ===")
         print(f"You begin your journey in {LOCATIONS[self.player.location]['name']}")
@@ -118,13 +184,30 @@ class GameEngine:
         for msg in manufacturing_messages:
             print(f"\n>>> {msg}")
 
-        # Update markets periodically
-        if int(self.game_time) % 600 == 0:  # Every 10 minutes game time
+        # Deliver finished refinery jobs
+        for msg in self.check_refinery():
+            print(f"\n>>> {msg}")
+
+        # Results of berthed ships' jobs
+        for msg in self.check_fleet_operations():
+            print(f"\n>>> {msg}")
+
+        # Update markets - lazy markets only advance their clock here and
+        # catch up when a location's prices are read, so this is cheap every tick
+        if self.economy.lazy:
+            self.economy.update_markets(delta * 10)
+        elif int(self.game_time) % 600 == 0:  # Every 10 minutes game time
             self.economy.update_markets()
+
+        if self.commodity_market.lazy:
+            self.commodity_market.update_markets(delta * 10)
+        elif int(self.game_time) % 600 == 0:
             self.commodity_market.update_markets(delta * 10)  # Update commodity prices
 
         # Update faction conflicts
         if int(self.game_time) % 300 == 0:  # Every 5 minutes
+            for msg in self.faction_manager.update_influence():
+                print(f"\n>>> {msg}")
             self.faction_manager.update_conflicts()
 
         # Check contract expiry
@@ -165,6 +248,41 @@ class GameEngine:
 
         return messages
 
+    @recorded_command
+    def accept_contract(self, contract_id: str) -> Tuple[bool, str]:
+        """Accept an available contract"""
+        contract = self.contract_board.accept_contract(contract_id, self.player)
+        if not contract:
+            return False, "Contract is no longer available"
+
+        return True, f"Accepted: {contract.name}"
+
+    @recorded_command
+    def complete_delivery_contract(self, contract_id: str) -> Tuple[bool, str]:
+        """Complete a delivery contract at its destination and collect the reward"""
+        success, message = self.contract_board.complete_delivery_contract(contract_id, self.player)
+        if not success:
+            return False, message
+
+        reward = self.contract_board.complete_contract(contract_id)
+        if reward:
+            self.player.add_credits(reward)
+            contract_xp = int(reward / 10)
+            self.player.add_experience(contract_xp)
+            self.player.stats['contracts_completed'] += 1
+            message += f"\n\nReward: {reward:,} CR + {contract_xp} XP"
+
+        return True, message
+
+    @recorded_command
+    def abandon_contract(self, contract_id: str) -> Tuple[bool, str]:
+        """Abandon an active contract"""
+        if not self.contract_board.abandon_contract(contract_id):
+            return False, "Contract is not active"
+
+        return True, "Contract abandoned"
+
+    @recorded_command
     def travel_to_location(self, destination_id: str) -> tuple:
         """Initiate travel to a new location - returns (success, message, travel_info)"""
         if destination_id not in LOCATIONS:
@@ -181,7 +299,7 @@ class GameEngine:
 
         # Check faction access
         access_info = self.faction_manager.get_player_access(
-            destination_id, self.player.faction_standings
+            destination_id, self.player.faction_standings, self.player.standings_version
         )
 
         if access_info["access"] == "forbidden":
@@ -204,6 +322,7 @@ class GameEngine:
         
         return True, "Travel initiated", travel_info
     
+    @recorded_command
     def complete_travel(self, destination_id: str) -> tuple[bool, str]:
         """Complete travel to destination (called after animation)"""
         if destination_id not in LOCATIONS:
@@ -216,7 +335,7 @@ class GameEngine:
         danger_level = LOCATIONS[destination_id].get("danger_level", 0)
         encounter_chance = danger_level * 0.345  # Up to 34.5% in dangerous areas
 
-        if random.random() < encounter_chance:
+        if _rng.random() < encounter_chance:
             # Start combat encounter (enemies scale with player level)
             difficulty = "easy" if danger_level < 0.4 else "normal" if danger_level < 0.7 else "hard"
             enemy_vessel, enemy_name = create_enemy_vessel(difficulty, self.player.level)
@@ -232,7 +351,7 @@ class GameEngine:
         if current_type == "station" and destination_type == "station":
             # 20% chance of trader encounter
             trader_chance = 0.20
-            if random.random() < trader_chance:
+            if _rng.random() < trader_chance:
                 self.current_trader = self._generate_trader_encounter()
                 # Store destination to complete travel after trader encounter
                 self.pending_travel_destination = destination_id
@@ -296,7 +415,12 @@ class GameEngine:
 
         # Clear ship cargo (lost in destruction)
         cargo_lost = list(self.player.inventory.keys())
-        self.player.inventory.clear()
+        self.player.ledger.clear()
+
+        # The destroyed ship leaves the fleet
+        fleet = self.berth_manager.fleet
+        if fleet.active_uid is not None:
+            fleet.remove(fleet.active_uid)
 
         # Check if player has ships in station storage at closest station
         station_inventory = self.player.get_station_inventory(closest_station)
@@ -307,16 +431,23 @@ class GameEngine:
             if item_id in VESSEL_CLASSES and quantity > 0:
                 available_ships.append(item_id)
 
+        berthed = [uid for uid in fleet.ships_at(closest_station) if uid not in self.fleet_ops
+                   and self.player.level >= VESSEL_CLASSES[fleet.ships[uid].vessel_class_id].get("level_requirement", 1)]
+
+        # A ship berthed at the station is taken as it was left
+        if berthed:
+            fleet.active_uid = berthed[0]
+            self.vessel = fleet.ships[berthed[0]]
+            message = f"Ship destroyed! Respawned at {LOCATIONS[closest_station]['name']} aboard {self.vessel.name} from your berth."
         # If player has ships at station, use one of them
-        if available_ships:
+        elif available_ships:
             # Use the first available ship
             ship_id = available_ships[0]
-            station_inventory[ship_id] -= 1
-            if station_inventory[ship_id] == 0:
-                del station_inventory[ship_id]
+            self.player.remove_station_item(closest_station, ship_id, 1)
 
             # Create new vessel
             self.vessel = Vessel(ship_id)
+            fleet.active_uid = fleet.add(self.vessel, closest_station)
             message = f"Ship destroyed! Respawned at {LOCATIONS[closest_station]['name']} with {VESSEL_CLASSES[ship_id]['name']} from storage."
         else:
             # No ships available - give starter ship
@@ -327,9 +458,12 @@ class GameEngine:
             self.vessel.install_module("aegis_shield_t1")
             self.vessel.install_module("quantum_scanner_t1")
             self.vessel.install_module("harvester_drill_t1")
+            fleet.active_uid = fleet.add(self.vessel, closest_station)
 
             message = f"Ship destroyed! Respawned at {LOCATIONS[closest_station]['name']} with emergency rescue pod (Basic Scout)."
 
+        self.player.current_ship_id = self.vessel.vessel_class_id
+
         # Move player to closest station
         self.player.location = closest_station
         self.player.visited_locations.add(closest_station)
@@ -345,8 +479,23 @@ class GameEngine:
 
         return True, message
 
+    @recorded_command
     def mine_resources(self) -> tuple[bool, str]:
         """Mine resources at current location"""
+        return self.mine_batch(1)
+
+    @recorded_command
+    def mine_batch(self, cycles: int) -> tuple[bool, str]:
+        """
+        Run several mining cycles at the current location in one go.
+        Stops early when the cargo hold fills or an encounter starts.
+        Each cycle draws exactly as a single mine_resources call would, so a
+        batch of N ends where N separate calls would have; inventory,
+        stats and contracts are updated once for the whole batch.
+        """
+        if cycles < 1:
+            return False, "Cycle count must be at least 1"
+
         location_data = LOCATIONS[self.player.location]
         available_resources = location_data.get("resources", [])
 
@@ -376,131 +525,172 @@ class GameEngine:
         if not mineable_resources:
             return False, f"Your mining laser (Tier {mining_tier}) cannot mine any ores here. Higher tier ores require better mining equipment."
 
-        # Pick random resource from mineable ones
-        resource_id = random.choice(mineable_resources)
-        resource_data = RESOURCES[resource_id]
+        # Ores whose reserves in this field are used up can't be mined until they regrow
+        field = self.asteroid_fields.get_field(self.player.location, self.game_time)
+        reserves = {resource_id: field.available(resource_id) for resource_id in mineable_resources}
+        mineable_resources = [resource_id for resource_id in mineable_resources if reserves[resource_id] > 0]
 
-        # Calculate yield
-        base_yield = random.randint(10, 30)
-        skill_bonus = self.player.get_skill_bonus("mining_operations", "mining_yield")
-        total_yield = int(base_yield * mining_efficiency * (1 + skill_bonus))
+        if not mineable_resources:
+            return False, "This field's reserves are exhausted. Ore deposits regrow over time."
 
-        # Check how much can fit in cargo
-        from volume_system import get_max_quantity_can_add
+        from volume_system import get_item_volume
+        skill_bonus = self.player.get_skill_bonus("mining_operations", "mining_yield")
         cargo_capacity = self.vessel.cargo_capacity
-        max_can_add = get_max_quantity_can_add(self.player.inventory, cargo_capacity, resource_id)
-
-        if max_can_add <= 0:
-            current_volume = self.player.get_cargo_volume()
-            return False, f"Cargo hold full! ({current_volume:.1f}/{cargo_capacity} used)"
-
-        # Limit yield to what fits in cargo
-        actual_yield = min(total_yield, max_can_add)
-
-        # Add to inventory
-        success, message = self.player.add_item(resource_id, actual_yield, cargo_capacity)
-        if not success:
-            return False, message
+        used_volume = self.player.get_cargo_volume()
+        volumes = {resource_id: get_item_volume(resource_id) for resource_id in mineable_resources}
+
+        mined: Dict[str, int] = {}
+        cycles_run = 0
+        limited = False
+        cargo_full = False
+        depleted = False
+        encounter_msg = ""
 
-        self.player.stats["resources_mined"] += actual_yield
+        for _ in range(cycles):
+            # Pick random resource from mineable ones
+            resource_id = _rng.choice(mineable_resources)
+
+            # Calculate yield
+            base_yield = _rng.randint(10, 30)
+            total_yield = int(base_yield * mining_efficiency * (1 + skill_bonus))
+
+            # Check how much can fit in cargo
+            available_space = cargo_capacity - used_volume
+            volume = volumes[resource_id]
+            if available_space <= 0:
+                max_can_add = 0
+            elif volume <= 0:
+                max_can_add = 999  # No volume constraint
+            else:
+                max_can_add = int(available_space / volume)
+
+            if max_can_add <= 0:
+                cargo_full = True
+                break
+
+            # Limit yield to what fits in cargo and what is left in the field
+            actual_yield = min(total_yield, max_can_add, reserves[resource_id])
+            limited = actual_yield < min(total_yield, reserves[resource_id])
+            mined[resource_id] = mined.get(resource_id, 0) + actual_yield
+            used_volume += actual_yield * volume
+            cycles_run += 1
+
+            reserves[resource_id] -= actual_yield
+            if reserves[resource_id] <= 0:
+                mineable_resources = [r for r in mineable_resources if r != resource_id]
+                if not mineable_resources:
+                    depleted = True
+
+            # Track mining attempts and check for encounters
+            self.mining_attempts += 1
+
+            if self.mining_attempts >= 5:
+                # Every 5 mining attempts, chance for encounter
+                self.mining_attempts = 0  # Reset counter
+                encounter_roll = _rng.random()
+
+                if encounter_roll < 0.46:  # 46% chance of pirate encounter (increased by 15%)
+                    difficulty = "normal"
+                    enemy_vessel, enemy_name = create_enemy_vessel(difficulty, self.player.level)
+                    self.current_combat = CombatEncounter(self.vessel, enemy_vessel, enemy_name, self.player.level)
+                    encounter_msg = f"\n\n⚠️ PIRATE AMBUSH! {enemy_name} detected! Combat initiated."
+                    break
+                elif encounter_roll < 0.7475:  # 28.75% chance of trader encounter (increased by 15%)
+                    self.current_trader = self._generate_trader_encounter()
+                    encounter_msg = f"\n\n📡 TRADER DETECTED! A wandering trader has appeared."
+                    break
+
+            if depleted:
+                break
+
+        if not mined:
+            return False, f"Cargo hold full! ({used_volume:.1f}/{cargo_capacity} used)"
+
+        # Add to inventory (space was checked cycle by cycle)
+        for resource_id, quantity in mined.items():
+            field.extract(resource_id, quantity)
+            self.player.add_item(resource_id, quantity)
+            self.player.stats["resources_mined"] += quantity
 
         # Update contract progress and check for completion
         contract_completed_msg = ""
         for contract in self.contract_board.active_contracts:
             if contract.objectives.get("type") == "collect_resource":
-                completed = contract.update_progress({"resource_id": resource_id, "quantity": actual_yield})
-                if completed:
+                quantity = mined.get(contract.objectives.get("resource_id"), 0)
+                if quantity and contract.update_progress({"resource_id": contract.objectives["resource_id"], "quantity": quantity}):
                     # Auto-pay immediately
                     self.player.add_credits(contract.reward)
                     xp_reward = int(contract.reward / 10)
                     self.player.add_experience(xp_reward)
                     self.player.stats['contracts_completed'] += 1
-                    contract_completed_msg = f"\n\n✅ CONTRACT COMPLETE: {contract.name}\nReward: {contract.reward:,} CR + {xp_reward} XP"
+                    contract_completed_msg += f"\n\n✅ CONTRACT COMPLETE: {contract.name}\nReward: {contract.reward:,} CR + {xp_reward} XP"
 
-        # Inform if cargo limited the yield
-        cargo_msg = f" (limited by cargo space)" if actual_yield < total_yield else ""
+        depleted_msg = "\n\nThis field's reserves are exhausted." if depleted else ""
 
-        # Track mining attempts and check for encounters
-        self.mining_attempts += 1
-        encounter_msg = ""
+        if cycles == 1:
+            resource_id, quantity = next(iter(mined.items()))
+            # Inform if cargo limited the yield
+            cargo_msg = f" (limited by cargo space)" if limited else ""
+            return True, f"Mined {quantity}x {RESOURCES[resource_id]['name']}{cargo_msg}{contract_completed_msg}{encounter_msg}{depleted_msg}"
 
-        if self.mining_attempts >= 5:
-            # Every 5 mining attempts, chance for encounter
-            self.mining_attempts = 0  # Reset counter
-            encounter_roll = random.random()
-
-            if encounter_roll < 0.46:  # 46% chance of pirate encounter (increased by 15%)
-                from combat import create_enemy_vessel
-                difficulty = "normal"
-                enemy_vessel, enemy_name = create_enemy_vessel(difficulty, self.player.level)
-                self.current_combat = CombatEncounter(self.vessel, enemy_vessel, enemy_name, self.player.level)
-                encounter_msg = f"\n\n⚠️ PIRATE AMBUSH! {enemy_name} detected! Combat initiated."
-            elif encounter_roll < 0.7475:  # 28.75% chance of trader encounter (increased by 15%)
-                self.current_trader = self._generate_trader_encounter()
-                encounter_msg = f"\n\n📡 TRADER DETECTED! A wandering trader has appeared."
-
-        return True, f"Mined {actual_yield}x {resource_data['name']}{cargo_msg}{contract_completed_msg}{encounter_msg}"
+        yields = ", ".join(f"{quantity}x {RESOURCES[resource_id]['name']}" for resource_id, quantity in mined.items())
+        stop_msg = ""
+        if cargo_full or limited:
+            stop_msg = f" - cargo hold full ({used_volume:.1f}/{cargo_capacity} used)"
+        elif cycles_run < cycles and not depleted:
+            stop_msg = " - interrupted"
+        return True, f"Mined {yields} in {cycles_run}/{cycles} cycles{stop_msg}{contract_completed_msg}{encounter_msg}{depleted_msg}"
 
     def _generate_trader_encounter(self) -> Dict:
         """Generate a random trader with inventory and credits"""
-        from combat import create_enemy_vessel
-
         # Traders use lighter ships (scouts/haulers)
-        trader_ships = ["scout_standard_mk1", "scout_standard_mk2", "hauler_standard_mk1"]
-        trader_ship = random.choice(trader_ships)
-
-        trader_names = [
-            "Wandering Merchant", "Star Trader", "Nomadic Vendor", "Void Merchant",
-            "Freelance Trader", "Independent Dealer", "Cosmic Peddler", "Space Caravan"
-        ]
+        trader_ship = trader_ship_table().draw(_rng)
 
-        trader_vessel = Vessel(trader_ship)
-        # Traders have minimal weapons for self-defense
-        if trader_vessel.module_slots["weapon"] > 0:
-            trader_vessel.install_module("pulse_cannon_t1")
-        if trader_vessel.module_slots["defense"] > 0:
-            trader_vessel.install_module("aegis_shield_t1")
+        # Traders have minimal weapons for self-defense (skipped without a free slot)
+        trader_vessel = spawn_npc_vessel(trader_ship, ("pulse_cannon_t1", "aegis_shield_t1"))
 
         # Generate trader inventory
         inventory = {}
-        credits = random.randint(10000 + (self.player.level * 2000), 30000 + (self.player.level * 5000))
+        credits = _rng.randint(10000 + (self.player.level * 2000), 30000 + (self.player.level * 5000))
 
         # Commodities (always have some)
-        num_commodities = random.randint(2, 4)
+        num_commodities = _rng.randint(2, 4)
+        commodities = commodity_table()
         for _ in range(num_commodities):
-            commodity_id = random.choice(list(COMMODITIES.keys()))
-            quantity = random.randint(10, 50)
+            commodity_id = commodities.draw(_rng)
+            quantity = _rng.randint(10, 50)
             inventory[commodity_id] = inventory.get(commodity_id, 0) + quantity
 
         # Resources (60% chance)
-        if random.random() < 0.6:
-            num_resources = random.randint(1, 3)
+        if _rng.random() < 0.6:
+            num_resources = _rng.randint(1, 3)
+            resources = resource_table()
             for _ in range(num_resources):
-                resource_id = random.choice(list(RESOURCES.keys()))
-                quantity = random.randint(5, 30)
+                resource_id = resources.draw(_rng)
+                quantity = _rng.randint(5, 30)
                 inventory[resource_id] = inventory.get(resource_id, 0) + quantity
 
         # Modules (30% chance)
-        if random.random() < 0.3:
-            tier = "t1" if self.player.level < 10 else "t2"
-            available_modules = [m_id for m_id in MODULES.keys() if tier in m_id]
+        if _rng.random() < 0.3:
+            available_modules = trader_module_table(self.player.level)
             if available_modules:
-                module_id = random.choice(available_modules)
+                module_id = available_modules.draw(_rng)
                 inventory[module_id] = 1
 
         return {
-            "name": random.choice(trader_names),
+            "name": trader_name_table().draw(_rng),
             "vessel": trader_vessel,
             "inventory": inventory,
             "credits": credits
         }
 
+    @recorded_command
     def trade_with_trader(self, item_id: str, quantity: int, is_buying: bool) -> Tuple[bool, str]:
         """Trade with the current trader"""
         if not self.current_trader:
             return False, "No trader present"
 
-        from volume_system import can_add_item
+        from volume_system import check_capacity
 
         trader = self.current_trader
         item_name = self._get_item_name(item_id)
@@ -518,7 +708,7 @@ class GameEngine:
                 return False, f"Insufficient credits. Need {total_cost:,} CR"
 
             # Check cargo capacity before purchase
-            can_add, capacity_msg = can_add_item(self.player.ship_cargo, self.vessel.cargo_capacity, item_id, quantity)
+            can_add, capacity_msg = check_capacity(self.player.get_cargo_volume(), self.vessel.cargo_capacity, item_id, quantity)
             if not can_add:
                 return False, f"Cannot buy: {capacity_msg}"
 
@@ -526,7 +716,7 @@ class GameEngine:
             self.player.spend_credits(total_cost)
 
             # Add to ship cargo
-            self.player.ship_cargo[item_id] = self.player.ship_cargo.get(item_id, 0) + quantity
+            self.player.add_item(item_id, quantity)
 
             trader["inventory"][item_id] -= quantity
             if trader["inventory"][item_id] == 0:
@@ -547,9 +737,7 @@ class GameEngine:
                 return False, "Trader doesn't have enough credits"
 
             # Execute trade - remove from ship cargo
-            self.player.ship_cargo[item_id] -= quantity
-            if self.player.ship_cargo[item_id] == 0:
-                del self.player.ship_cargo[item_id]
+            self.player.remove_item(item_id, quantity)
 
             self.player.add_credits(total_payment)
             trader["inventory"][item_id] = trader["inventory"].get(item_id, 0) + quantity
@@ -557,6 +745,7 @@ class GameEngine:
 
             return True, f"Sold {quantity}x {item_name} for {total_payment:,} CR"
 
+    @recorded_command
     def attack_trader(self) -> Tuple[bool, str]:
         """Attack the current trader and initiate combat"""
         if not self.current_trader:
@@ -583,50 +772,233 @@ class GameEngine:
 
         return True, f"Attacking {trader_name}! Combat initiated."
 
+    @recorded_command
     def dismiss_trader(self) -> tuple[bool, str]:
         """Dismiss the current trader and complete any pending travel"""
         self.current_trader = None
 
         # Complete pending travel if trader was encountered during travel
-        if self.pending_travel_destination:
-            destination_id = self.pending_travel_destination
+        destination_id = self._complete_pending_travel()
+        if destination_id:
+            dest_name = LOCATIONS[destination_id]["name"]
+            return True, f"Traveled to {dest_name}"
+
+        return True, "Trader dismissed"
+
+    def _complete_pending_travel(self) -> Optional[str]:
+        """Finish travel interrupted by an encounter. Returns the destination (None if nothing was pending)."""
+        destination_id = self.pending_travel_destination
+        if not destination_id:
+            return None
+        self.pending_travel_destination = None
+
+        # Complete the travel
+        self.player.location = destination_id
+        self.player.stats["distance_traveled"] += 100
+
+        # Track visited location for fog of war
+        self.player.visited_locations.add(destination_id)
+
+        # Generate new contracts at destination
+        self.contract_board.generate_contracts(destination_id)
+        return destination_id
+
+    @recorded_command
+    def engage_pirate_wing(self, wing_size: int = 3) -> Tuple[bool, str]:
+        """
+        Fight a wing of pirates with the current vessel and every ship
+        stored in berths at the current location, resolved to the end
+        """
+        if self.current_combat and self.current_combat.is_active:
+            return False, "Already in combat"
+        if wing_size < 1:
+            return False, "Wing size must be at least 1"
+
+        # Pirate wings only roam dangerous space, and need time to regroup
+        if LOCATIONS[self.player.location].get("danger_level", 0) < PIRATE_WING_MIN_DANGER:
+            return False, "No pirate wings operate in this area"
+        if self.last_pirate_wing is not None and self.game_time - self.last_pirate_wing < PIRATE_WING_COOLDOWN:
+            minutes = (PIRATE_WING_COOLDOWN - (self.game_time - self.last_pirate_wing)) / 60
+            return False, f"No pirate wings in range - try again in {minutes:.0f} minutes"
+        self.last_pirate_wing = self.game_time
+
+        from data import NPC_ENEMY_TEMPLATES
+
+        # The piloted ship keeps its berth too - every other berthed ship
+        # escorts as it is, and keeps its damage after the battle
+        fleet = self.berth_manager.fleet
+        escort_uids = [uid for uid in fleet.ships_at(self.player.location)
+                       if uid != fleet.active_uid and uid not in self.fleet_ops]
+        escorts = [fleet.ships[uid] for uid in escort_uids]
+        pirates, wing_name = create_pirate_wing(self.player.level, wing_size)
+
+        skill_bonus = self.player.get_skill_bonus("weapons_mastery", "damage")
+        player_side = FleetSide(self.player.name, [self.vessel] + escorts, "focus_weakest",
+                                crit_chance=CRIT_CHANCE, skill_bonus=skill_bonus)
+        pirate_side = FleetSide(wing_name, pirates, "random",
+                                damage_multiplier=PIRATE_DAMAGE_MULTIPLIER, shield_regen=PIRATE_SHIELD_REGEN)
+
+        battle = FleetBattle(player_side, pirate_side)
+        battle.auto_resolve()
+        self.last_fleet_battle = battle
+
+        lines = [f"Fleet battle against {wing_name} ({wing_size} ships, {len(escorts)} escorts) - {battle.turn_number} turns"]
+        lines.extend(battle.get_combat_log(3))
+
+        # Destroyed escorts are lost from their berths
+        for escort in battle.destroyed(0):
+            if escort is not self.vessel:
+                fleet.remove(fleet.uid_of(escort))
+
+        # Rewards for each pirate destroyed
+        template = NPC_ENEMY_TEMPLATES[get_enemy_template_key(self.player.level)]
+        destroyed = len(battle.destroyed(1))
+        credits = sum(_rng.randint(*template["credits_reward"]) for _ in range(destroyed))
+        xp = sum(_rng.randint(*template["xp_reward"]) for _ in range(destroyed))
+        if destroyed:
+            self.player.add_credits(credits)
+            self.player.add_experience(xp)
+            self.player.stats["enemies_destroyed"] += destroyed
+            lines.append(f"Destroyed {destroyed} pirates: +{credits:,} CR, +{xp} XP")
+
+        if self.vessel.is_destroyed():
+            _, message = self.handle_ship_destruction()
+            lines.append(message)
+        elif battle.winner == player_side.name:
+            lines.append("VICTORY!")
+        else:
+            lines.append("The battle ended without a victor")
+
+        return True, "\n".join(lines)
+
+    @recorded_command
+    def combat_attack(self) -> Tuple[bool, str, Dict]:
+        """
+        Fire every weapon at the current enemy; it fires back if it survives.
+        Returns (success, message, outcome) where outcome["result"] is
+        "continue", "victory" or "destroyed" (see _win_combat and _lose_combat).
+        """
+        combat = self.current_combat
+        if not combat or not combat.is_active:
+            return False, "Not in combat", {}
+
+        skill_bonus = self.player.get_skill_bonus("weapons_mastery", "damage")
+        attack = combat.player_attack(0, skill_bonus)
+        lines = [result_text(attack)]
+        if attack.get("enemy_destroyed"):
+            return self._win_combat(lines)
+
+        counter = combat.enemy_attack()
+        lines.append(result_text(counter))
+        if counter.get("player_destroyed"):
+            return self._lose_combat(lines)
+
+        combat.next_turn()
+        return True, "\n".join(lines), {"result": "continue"}
+
+    @recorded_command
+    def combat_retreat(self) -> Tuple[bool, str, Dict]:
+        """
+        Try to break off the current fight; a failed attempt gives the enemy
+        a free attack. Returns (success, message, outcome) where
+        outcome["result"] is "retreated", "continue" or "destroyed".
+        """
+        combat = self.current_combat
+        if not combat or not combat.is_active:
+            return False, "Not in combat", {}
+
+        result = combat.attempt_retreat()
+        lines = [result_text(result)]
+        if result.get("retreated"):
+            self.current_combat = None
+            # Retreating abandons any travel the fight interrupted
             self.pending_travel_destination = None
+            return True, "\n".join(lines), {"result": "retreated"}
 
-            # Complete the travel
-            self.player.location = destination_id
-            self.player.stats["distance_traveled"] += 100
+        counter = result.get("enemy_attack", {})
+        if counter:
+            lines.append(result_text(counter))
+        if counter.get("player_destroyed"):
+            return self._lose_combat(lines)
 
-            # Track visited location for fog of war
-            self.player.visited_locations.add(destination_id)
+        return True, "\n".join(lines), {"result": "continue"}
 
-            # Generate new contracts at destination
-            self.contract_board.generate_contracts(destination_id)
+    def _win_combat(self, lines: List[str]) -> Tuple[bool, str, Dict]:
+        """
+        Pay out a won encounter: credits, XP, loot and destroy-contract
+        progress, then finish any travel the fight interrupted. The outcome
+        holds credits, xp, loot [(item_id, quantity, kept)], contracts
+        [(name, reward, xp)], levels_gained and traveled_to.
+        """
+        rewards = self.current_combat.rewards
+        old_level = self.player.level
 
-            dest_name = LOCATIONS[destination_id]["name"]
-            return True, f"Traveled to {dest_name}"
+        self.player.add_credits(rewards["credits"])
+        self.player.add_experience(rewards["xp"])
+        self.player.stats["enemies_destroyed"] += 1
 
-        return True, "Trader dismissed"
+        # Loot goes to cargo while it fits
+        loot = []
+        cargo_capacity = self.vessel.cargo_capacity if self.vessel else None
+        for item_id, quantity in rewards.get("loot", {}).items():
+            kept, _ = self.player.add_item(item_id, quantity, cargo_capacity)
+            loot.append((item_id, quantity, kept))
+            item_name = self._get_item_name(item_id)
+            lines.append(f"LOOT: +{quantity}x {item_name}" if kept else f"Cargo full! Lost {quantity}x {item_name}")
+
+        # Update contract progress for combat objectives
+        contracts = []
+        completed_contracts = []
+        for contract in self.contract_board.active_contracts:
+            if contract.objectives.get("type") == "destroy_enemies":
+                completed = contract.update_progress({"enemies_destroyed": 1})
+                if completed:
+                    # Auto-pay immediately
+                    self.player.add_credits(contract.reward)
+                    xp_reward = int(contract.reward / 10)
+                    self.player.add_experience(xp_reward)
+                    self.player.stats['contracts_completed'] += 1
+                    contracts.append((contract.name, contract.reward, xp_reward))
+                    lines.append(f"CONTRACT COMPLETE! {contract.name} | +{contract.reward:,} CR +{xp_reward} XP")
+                    completed_contracts.append(contract)
+
+        # Remove completed contracts from active list
+        for contract in completed_contracts:
+            self.contract_board.active_contracts.remove(contract)
+
+        lines.append(f"VICTORY! Earned {rewards['credits']:,} CR + {rewards['xp']} XP")
+        self.current_combat = None
+
+        return True, "\n".join(lines), {
+            "result": "victory",
+            "credits": rewards["credits"],
+            "xp": rewards["xp"],
+            "loot": loot,
+            "contracts": contracts,
+            "levels_gained": self.player.level - old_level,
+            "traveled_to": self._complete_pending_travel()
+        }
+
+    def _lose_combat(self, lines: List[str]) -> Tuple[bool, str, Dict]:
+        """The player's ship was destroyed - respawn. The outcome holds the respawn message."""
+        # Respawning elsewhere abandons any travel the fight interrupted
+        self.pending_travel_destination = None
+        _, respawn_message = self.handle_ship_destruction()
+        lines.append(respawn_message)
+        return True, "\n".join(lines), {"result": "destroyed", "respawn_message": respawn_message}
 
     def _get_item_name(self, item_id: str) -> str:
         """Get display name for any item"""
-        if item_id in RESOURCES:
-            return RESOURCES[item_id]["name"]
-        elif item_id in COMMODITIES:
-            return COMMODITIES[item_id]["name"]
-        elif item_id in MODULES:
-            return MODULES[item_id]["name"]
-        return item_id
+        return get_item_name(item_id)
 
     def _get_item_base_price(self, item_id: str) -> int:
-        """Get base price for any item"""
-        if item_id in RESOURCES:
-            return RESOURCES[item_id]["base_price"]
-        elif item_id in COMMODITIES:
-            return COMMODITIES[item_id]["base_price"]
-        elif item_id in MODULES:
-            return MODULES[item_id].get("cost", 1000)
+        """Get base price for any item traders deal in (100 for anything else)"""
+        item = get_item(item_id)
+        if item is not None and item.kind in ("resource", "commodity", "module"):
+            return item.base_price
         return 100
 
+    @recorded_command
     def refine_ore(self, raw_ore_id: str, quantity: int) -> tuple[bool, str]:
         """
         Refine raw ore into refined resources
@@ -672,7 +1044,7 @@ class GameEngine:
         min_yield, max_yield = REFINING_YIELD_RANGES.get(rarity, (0.7, 0.9))
 
         # Calculate random yield percentage for the ENTIRE batch
-        yield_percent = random.uniform(min_yield, max_yield)
+        yield_percent = _rng.uniform(min_yield, max_yield)
         # Use round() instead of int() for fairer yields on small batches
         total_refined = max(1, round(quantity * yield_percent))
 
@@ -715,15 +1087,11 @@ class GameEngine:
 
         # Remove raw ore from station
         if station_raw_qty > 0:
-            station_inv = self.player.get_station_inventory(self.player.location)
-            if raw_ore_id not in station_inv or station_inv[raw_ore_id] < station_raw_qty:
+            if not self.player.remove_station_item(self.player.location, raw_ore_id, station_raw_qty):
                 # Refund ship if we already removed from there
                 if ship_raw_qty > 0:
                     self.player.add_item(raw_ore_id, ship_raw_qty)
                 return False, "Failed to remove raw ore from station"
-            station_inv[raw_ore_id] -= station_raw_qty
-            if station_inv[raw_ore_id] == 0:
-                del station_inv[raw_ore_id]
 
         # Add refined ore to ship
         if ship_refined > 0:
@@ -734,14 +1102,12 @@ class GameEngine:
                 if ship_raw_qty > 0:
                     self.player.add_item(raw_ore_id, ship_raw_qty)
                 if station_raw_qty > 0:
-                    station_inv = self.player.get_station_inventory(self.player.location)
-                    station_inv[raw_ore_id] = station_inv.get(raw_ore_id, 0) + station_raw_qty
+                    self.player.add_station_item(self.player.location, raw_ore_id, station_raw_qty)
                 return False, f"Failed to add refined resource to ship: {message}"
 
         # Add refined ore to station
         if station_refined > 0:
-            station_inv = self.player.get_station_inventory(self.player.location)
-            station_inv[refined_id] = station_inv.get(refined_id, 0) + station_refined
+            self.player.add_station_item(self.player.location, refined_id, station_refined)
 
         # Update stats
         self.player.stats["resources_refined"] += total_refined
@@ -766,6 +1132,129 @@ class GameEngine:
 
         return True, "\n".join(result_parts)
 
+    def _has_refining_facility(self) -> bool:
+        """At a refinery, or flying a mothership"""
+        has_refinery_service = "refinery" in LOCATIONS[self.player.location].get("services", [])
+        has_ship_refinery = bool(self.vessel) and self.vessel.class_type == "mothership"
+        return has_refinery_service or has_ship_refinery
+
+    @recorded_command
+    def queue_refining(self, basket: Dict[str, int]) -> tuple[bool, str]:
+        """
+        Queue a basket of raw ores ({ore_id: quantity}) as one refinery job.
+        The whole basket is checked first - ore available from ship and
+        station, and the ship's cargo after the refined output replaces
+        the ship's raw ore - and then the ore is taken in one step. Refined
+        output is delivered when the job finishes (see check_refinery).
+        """
+        if not self._has_refining_facility():
+            return False, "Refining requires a refinery facility or a mothership"
+
+        basket = {ore_id: quantity for ore_id, quantity in basket.items() if quantity > 0}
+        if not basket:
+            return False, "Nothing to refine"
+
+        # Validate every ore before touching anything
+        for ore_id, quantity in basket.items():
+            if ore_id not in RAW_RESOURCES:
+                return False, f"{self._get_item_name(ore_id)} is not a raw ore resource"
+            if not RAW_RESOURCES[ore_id].get("refines_to"):
+                return False, f"{RAW_RESOURCES[ore_id]['name']} cannot be refined"
+            accessible = self.player.get_total_accessible_quantity(ore_id)
+            if accessible["total"] < quantity:
+                return False, (f"Insufficient raw ore. You have {accessible['total']}x {RAW_RESOURCES[ore_id]['name']} "
+                               f"(Ship: {accessible['ship']}, Station: {accessible['station']})")
+
+        # Yields for the whole basket in one pass - ship ore refines into
+        # the ship's hold, station ore into station storage
+        ship_take: Dict[str, int] = {}
+        station_take: Dict[str, int] = {}
+        ship_output: Dict[str, int] = {}
+        station_output: Dict[str, int] = {}
+        volume_delta = 0.0
+        for ore_id, quantity in basket.items():
+            ore_data = RAW_RESOURCES[ore_id]
+            refined_id = ore_data["refines_to"]
+            min_yield, max_yield = REFINING_YIELD_RANGES.get(ore_data.get("rarity", "common"), (0.7, 0.9))
+            total_refined = max(1, round(quantity * _rng.uniform(min_yield, max_yield)))
+
+            ship_raw_qty = min(quantity, self.player.ship_cargo.get(ore_id, 0))
+            station_raw_qty = quantity - ship_raw_qty
+            if ship_raw_qty and station_raw_qty:
+                ship_refined = max(1, round(total_refined * (ship_raw_qty / quantity)))
+            else:
+                ship_refined = total_refined if ship_raw_qty else 0
+            station_refined = total_refined - ship_refined
+
+            if ship_raw_qty:
+                ship_take[ore_id] = ship_raw_qty
+                ship_output[refined_id] = ship_output.get(refined_id, 0) + ship_refined
+                volume_delta += ship_refined * RESOURCES[refined_id]["volume"] - ship_raw_qty * ore_data["volume"]
+            if station_raw_qty:
+                station_take[ore_id] = station_raw_qty
+            if station_refined:
+                station_output[refined_id] = station_output.get(refined_id, 0) + station_refined
+
+        # One cargo check for the whole basket
+        cargo_capacity = self.vessel.cargo_capacity
+        current_volume = self.player.get_cargo_volume()
+        if current_volume + volume_delta > cargo_capacity:
+            return False, (f"Insufficient ship cargo space! The refined output would exceed capacity by "
+                           f"{current_volume + volume_delta - cargo_capacity:.1f}. Current: {current_volume:.1f}/{cargo_capacity}")
+
+        # Commit - every quantity was checked above
+        for ore_id, quantity in ship_take.items():
+            self.player.remove_item(ore_id, quantity)
+        for ore_id, quantity in station_take.items():
+            self.player.remove_station_item(self.player.location, ore_id, quantity)
+
+        job = self.refinery.queue_job(self.player.location, basket, ship_output, station_output, self.game_time)
+
+        ores = ", ".join(f"{quantity}x {RAW_RESOURCES[ore_id]['name']}" for ore_id, quantity in basket.items())
+        minutes = job.get_remaining_time(self.game_time) / 60
+        return True, f"Refinery job queued: {ores} (ready in {minutes:.0f} game minutes)"
+
+    def check_refinery(self) -> List[str]:
+        """Deliver finished refinery jobs"""
+        messages = []
+        waiting = []
+
+        for job in self.refinery.pop_completed(self.game_time):
+            ship_output = job.ship_output
+            station_output = dict(job.station_output)
+
+            # Ship output that no longer fits goes to station storage at the
+            # refinery, or waits for cargo space when there is no station
+            if ship_output:
+                ship_volume = sum(quantity * RESOURCES[resource_id]["volume"] for resource_id, quantity in ship_output.items())
+                if self.player.get_cargo_volume() + ship_volume > self.vessel.cargo_capacity:
+                    if LOCATIONS.get(job.location_id, {}).get("type") != "station":
+                        waiting.append(job)
+                        continue
+                    for resource_id, quantity in ship_output.items():
+                        station_output[resource_id] = station_output.get(resource_id, 0) + quantity
+                    ship_output = {}
+
+            for resource_id, quantity in ship_output.items():
+                self.player.add_item(resource_id, quantity)
+            for resource_id, quantity in station_output.items():
+                self.player.add_station_item(job.location_id, resource_id, quantity)
+
+            total_refined = sum(job.total_output().values())
+            self.player.stats["resources_refined"] += total_refined
+            xp_reward = total_refined // 10 + 1
+            self.player.add_experience(xp_reward)
+
+            output = ", ".join(f"{quantity}x {RESOURCES[resource_id]['name']}" for resource_id, quantity in job.total_output().items())
+            where = "" if not station_output else f" ({sum(station_output.values())} to station storage at {LOCATIONS[job.location_id]['name']})"
+            messages.append(f"Refining complete: {output}{where} +{xp_reward} XP")
+
+        if waiting:
+            self.refinery.requeue_front(waiting)
+
+        return messages
+
+    @recorded_command
     def repair_vessel(self, repair_hull: bool = True, repair_shields: bool = True) -> tuple[bool, str]:
         """
         Repair vessel hull and/or recharge shields at a station
@@ -842,6 +1331,7 @@ class GameEngine:
             "can_afford": self.player.credits >= total_cost
         }
 
+    @recorded_command
     def scan_area(self) -> tuple[bool, str]:
         """Scan current area"""
         scan_range = self.vessel.get_scan_range()
@@ -899,6 +1389,7 @@ class GameEngine:
 
         return True, info
 
+    @recorded_command
     def scan_anomaly(self) -> tuple[bool, str]:
         """Scan anomalies at current location for research data"""
         location_data = LOCATIONS[self.player.location]
@@ -914,7 +1405,7 @@ class GameEngine:
 
         # Generate data collection amount based on scan range and skills
         skill_bonus = self.player.get_skill_bonus("scanning", "scan_range")
-        data_collected = random.randint(1, 3)  # Base 1-3 data samples
+        data_collected = _rng.randint(1, 3)  # Base 1-3 data samples
 
         # Bonus from better scanners
         if scan_range > 50:
@@ -943,6 +1434,7 @@ class GameEngine:
 
         return True, info
 
+    @recorded_command
     def deliver_cargo(self) -> tuple[bool, str]:
         """Attempt to deliver cargo for active transport contracts"""
         location_data = LOCATIONS[self.player.location]
@@ -962,9 +1454,7 @@ class GameEngine:
 
                     if current_qty >= required_qty:
                         # Remove cargo from inventory
-                        self.player.inventory[item_id] -= required_qty
-                        if self.player.inventory[item_id] == 0:
-                            del self.player.inventory[item_id]
+                        self.player.remove_item(item_id, required_qty)
 
                         # Mark contract as delivered
                         completed = contract.update_progress({"delivered": True})
@@ -1040,12 +1530,10 @@ class GameEngine:
             "connections": [LOCATIONS[c]["name"] for c in location_data.get("connections", [])]
         }
 
-    def save_current_game(self) -> bool:
-        """Save current game state"""
-        if not self.player or not self.vessel:
-            return False
-
-        game_state = {
+    def _build_game_state(self) -> Dict:
+        """Snapshot of everything a save file holds"""
+        return {
+            "game_id": self.game_id,
             "player": self.player.to_dict(),
             "vessel": self.vessel.to_dict(),
             "economy": self.economy.to_dict(),
@@ -1055,19 +1543,222 @@ class GameEngine:
             "berth_manager": self.berth_manager.to_dict(),
             "commodity_market": self.commodity_market.to_dict(),
             "ship_market": self.ship_market.to_dict(),
+            "asteroid_fields": self.asteroid_fields.to_dict(),
+            "refinery": self.refinery.to_dict(),
+            "fleet_ops": self.fleet_ops.to_dict(),
+            "rng": self.rng.to_dict(),
+            "current_trader": dict(self.current_trader, vessel=self.current_trader["vessel"].to_dict())
+                              if self.current_trader else None,
+            "pending_travel_destination": self.pending_travel_destination,
+            "last_pirate_wing": self.last_pirate_wing,
+            "journal": {"seq": self.journal.last_seq if self.journal else (self.checkpoint_seq or 0)},
             "game_time": self.game_time
         }
 
-        return save_game(game_state)
+    def _write_checkpoint(self, game_state: Dict) -> bool:
+        """Write a save file and drop the journal records it covers"""
+        seq = game_state["journal"]["seq"]
+        with self._save_lock:
+            # A newer checkpoint may already have been written
+            if self.checkpoint_seq is not None and seq < self.checkpoint_seq:
+                return True
+
+            if not save_game(game_state, self.save_file):
+                return False
 
-    def load_saved_game(self) -> bool:
-        """Load game from save file"""
-        game_state = load_game()
+            self.checkpoint_seq = seq
+            if self.journal:
+                self.journal.truncate_through(seq)
+            return True
+
+    def save_current_game(self) -> bool:
+        """Save current game state"""
+        if not self.player or not self.vessel:
+            return False
+
+        return self._write_checkpoint(self._build_game_state())
+
+    def checkpoint_in_background(self):
+        """
+        Compact the journal into a fresh save file without blocking play.
+        The state is snapshotted on the calling thread; serialization and
+        file writes happen on a worker thread.
+        """
+        if self._checkpoint_thread and self._checkpoint_thread.is_alive():
+            return  # Still writing the previous one
+
+        game_state = copy.deepcopy(self._build_game_state())
+        self._checkpoint_thread = threading.Thread(
+            target=self._write_checkpoint, args=(game_state,), daemon=True
+        )
+        self._checkpoint_thread.start()
+
+    # ==================== COMMAND JOURNAL ====================
+
+    def enable_journal(self):
+        """
+        Start journaling commands (with their random draws) for crash recovery.
+        Call after new_game or load_saved_game.
+        """
+        # Sequence numbers continue from the loaded save, so new records sort after it
+        self.journal = CommandJournal(self.game_id, journal_path(self.save_file), self.checkpoint_seq or 0)
+
+        if self.checkpoint_seq is None and self.journal.last_seq == 0:
+            # Unsaved new game - the journal starts with how to recreate it
+            self.journal.reset()
+            self.journal.append("new_game", (self.player.name,), {"seed": self.rng.seed})
+
+        self.rng.start_recording()
+        if self._journal_command not in self.command_listeners:
+            self.command_listeners.append(self._journal_command)
+
+    def close_journal(self):
+        """
+        Stop journaling on a clean shutdown. Commands since the last save
+        are discarded, just as quitting without saving always has.
+        """
+        if self._checkpoint_thread:
+            self._checkpoint_thread.join()
+
+        if self._journal_command in self.command_listeners:
+            self.command_listeners.remove(self._journal_command)
+        self.rng.stop_recording()
+
+        if self.journal:
+            self.journal.discard()
+            self.journal = None
+
+    def _journal_clock(self) -> Dict:
+        """Game clocks a command depends on"""
+        return {
+            "game_time": self.game_time,
+            "economy": self.economy.game_time,
+            "commodity_market": self.commodity_market.game_time
+        }
+
+    def _journal_command(self, command: str, args: tuple, kwargs: Dict, result):
+        """Command listener - append the command and its draws to the journal"""
+        if not self.journal or self._replaying:
+            return
+
+        seq = self.journal.append(command, args, kwargs, self._journal_clock(), self.rng.take_draws())
+
+        if seq - (self.checkpoint_seq or 0) >= JOURNAL_COMPACT_INTERVAL:
+            self.checkpoint_in_background()
+
+    def _replay_records(self, records: List[Dict]) -> int:
+        """Re-execute journal records with their recorded clocks and draws"""
+        replayed = 0
+        self._replaying = True
+        try:
+            for record in records:
+                method = getattr(self, record["command"], None)
+                if not getattr(method, "is_command", False):
+                    continue
+
+                clock = record.get("clock", {})
+                self.game_time = clock.get("game_time", self.game_time)
+                self.economy.game_time = clock.get("economy", self.economy.game_time)
+                self.commodity_market.game_time = clock.get("commodity_market", self.commodity_market.game_time)
+
+                # Deliveries happen on ticks, which are not journaled
+                self.check_refinery()
+                self.check_fleet_operations()
+
+                self.rng.start_playback(record.get("rng", {}))
+                try:
+                    method(*record.get("args", []), **record.get("kwargs", {}))
+                finally:
+                    self.rng.stop_playback()
+                replayed += 1
+        finally:
+            self._replaying = False
+
+        return replayed
+
+    def recover_from_journal(self) -> int:
+        """
+        Replay journaled commands newer than the loaded checkpoint.
+        Returns the number of commands recovered.
+        """
+        records = [r for r in read_journal(journal_path(self.save_file))
+                   if r.get("game") == self.game_id and r.get("seq", 0) > (self.checkpoint_seq or 0)]
+
+        replayed = self._replay_records(records)
+        if replayed:
+            print(f"  [Recovery] Replayed {replayed} command(s) made after the last save")
+        return replayed
+
+    def recover_unsaved_game(self, filename: str) -> bool:
+        """
+        Rebuild a game that crashed before it was ever saved, from the
+        save file's journal when it starts with a new_game record.
+        """
+        records = read_journal(journal_path(filename))
+        if not records or records[0].get("command") != "new_game":
+            return False
+
+        start = records[0]
+        self.new_game(*start.get("args", []), **start.get("kwargs", {}))
+        self.game_id = start["game"]
+        self.checkpoint_seq = None
+        self.save_file = filename
+
+        replayed = self._replay_records([r for r in records[1:] if r.get("game") == self.game_id])
+        print(f"  [Recovery] Restored unsaved game with {replayed} command(s)")
+        return True
+
+    def _register_piloted_vessel(self):
+        """
+        Make the piloted vessel the fleet's active ship after loading. Saves
+        from before the fleet registry only had class ids in berths: the
+        piloted ship takes the place of a berthed ship of its class (player's
+        location first), or gets a berth of its own.
+        """
+        fleet = self.berth_manager.fleet
+        if fleet.active is not None:
+            self.vessel = fleet.active
+            return
+
+        class_id = self.vessel.vessel_class_id
+        uid = fleet.find(self.player.location, class_id) or next(iter(fleet.ships_of_class(class_id)), None)
+        if uid is not None:
+            location_id = fleet.location_of(uid)
+            fleet.remove(uid)
+        else:
+            location_id = self.player.location if self.player.location in self.berth_manager.shipyards else STARTING_LOCATION
+        fleet.active_uid = fleet.add(self.vessel, location_id, uid)
+
+    def load_saved_game(self, filename: Optional[str] = None) -> bool:
+        """
+        Load game from a save file (the most recently saved slot by default),
+        then recover any journaled commands
+        """
+        if filename is None:
+            slots = list_save_slots()
+            filename = slots[0]["path"] if slots else SAVE_FILE
+
+        # The last session may have been an unsaved new game that did not shut down cleanly
+        if self.recover_unsaved_game(filename):
+            return True
+
+        game_state = load_game(filename)
 
         if not game_state:
             return False
 
         try:
+            # Restore the recorded seed and stream positions (old saves get a fresh seed)
+            self.rng.load(game_state.get("rng", {}))
+            self.save_file = filename
+            self.game_id = game_state.get("game_id", uuid.uuid4().hex)
+            self.checkpoint_seq = game_state.get("journal", {}).get("seq", 0)
+            self.current_trader = game_state.get("current_trader")
+            if self.current_trader:
+                self.current_trader["vessel"] = npc_vessel_from_dict(self.current_trader["vessel"])
+            self.pending_travel_destination = game_state.get("pending_travel_destination")
+            self.last_pirate_wing = game_state.get("last_pirate_wing")
+
             self.player = Player.from_dict(game_state["player"])
             self.vessel = Vessel.from_dict(game_state["vessel"])
             self.economy = EconomyManager.from_dict(game_state["economy"])
@@ -1075,6 +1766,11 @@ class GameEngine:
             self.faction_manager = FactionManager.from_dict(game_state["faction_manager"])
             self.game_time = game_state.get("game_time", 0)
 
+            # Saves from before asteroid reserves start with every field full
+            self.asteroid_fields = AsteroidFieldManager.from_dict(game_state.get("asteroid_fields", {}))
+            self.refinery = RefineryManager.from_dict(game_state.get("refinery", {}))
+            self.fleet_ops = FleetOpsScheduler.from_dict(game_state.get("fleet_ops", {}))
+
             # Load manufacturing if present (backwards compatibility)
             if "manufacturing" in game_state:
                 self.manufacturing = ManufacturingManager.from_dict(game_state["manufacturing"])
@@ -1084,6 +1780,7 @@ class GameEngine:
             # Load berth manager if present (backwards compatibility)
             if "berth_manager" in game_state:
                 self.berth_manager = BerthManager.from_dict(game_state["berth_manager"])
+                self._register_piloted_vessel()
             else:
                 self.berth_manager = BerthManager()
                 # Initialize shipyards for old saves
@@ -1100,7 +1797,7 @@ class GameEngine:
                 storage_location = self.player.location if self.player.location in self.berth_manager.shipyards else STARTING_LOCATION
 
                 if storage_location in self.berth_manager.shipyards:
-                    self.berth_manager.store_ship(storage_location, current_ship_id)
+                    _, _, self.berth_manager.fleet.active_uid = self.berth_manager.store_vessel(storage_location, self.vessel)
                     print(f"  [Compatibility] Registered {self.vessel.name} in berth at {LOCATIONS[storage_location]['name']}")
 
             # Load commodity market if present (backwards compatibility)
@@ -1120,6 +1817,11 @@ class GameEngine:
             print(f"Credits: {self.player.credits:,}")
             print(f"Vessel: {self.vessel.name}\n")
 
+            # Jobs that finished cycles before the save was written
+            self.check_fleet_operations()
+
+            self.recover_from_journal()
+
             return True
         except Exception as e:
             print(f"Error loading game: {e}")
@@ -1127,6 +1829,7 @@ class GameEngine:
 
     # ==================== SHIPYARD METHODS ====================
 
+    @recorded_command
     def purchase_ship(self, ship_id: str, trade_in: bool = False) -> Tuple[bool, str]:
         """Purchase a new ship at current location's shipyard"""
         location_data = LOCATIONS[self.player.location]
@@ -1156,22 +1859,24 @@ class GameEngine:
         self.player.spend_credits(cost)
 
         if trade_in:
-            # Remove old ship from berth and replace with new one
-            self.berth_manager.remove_ship(self.player.location, current_ship_id)
-            self.berth_manager.store_ship(self.player.location, ship_id)
+            # The traded ship leaves the fleet; the new one takes its berth
+            fleet = self.berth_manager.fleet
+            berth_location = fleet.location_of(fleet.active_uid) or self.player.location
+            fleet.remove(fleet.active_uid)
 
             # Transfer modules from old ship
             old_modules = dict(self.vessel.installed_modules)
 
             # Create new ship
             self.vessel = Vessel(ship_id)
+            fleet.active_uid = fleet.add(self.vessel, berth_location)
             self.player.current_ship_id = ship_id
 
             # Try to reinstall compatible modules
             reinstalled = []
             for mod_type, modules in old_modules.items():
                 for module_id in modules:
-                    if self.vessel.install_module(module_id):
+                    if self.vessel.install_module(module_id)[0]:
                         reinstalled.append(module_id)
                     else:
                         # Add to player inventory if can't install
@@ -1192,6 +1897,7 @@ class GameEngine:
 
             return True, message + f" | Ship stored in berth at this location"
 
+    @recorded_command
     def purchase_berth(self) -> Tuple[bool, str, int]:
         """Purchase a new berth at current location
         Returns: (success, message, cost)
@@ -1211,6 +1917,7 @@ class GameEngine:
 
     # ==================== MODULE MARKETPLACE METHODS ====================
 
+    @recorded_command
     def buy_module(self, module_id: str) -> Tuple[bool, str]:
         """Buy a module from the market"""
         location_data = LOCATIONS[self.player.location]
@@ -1238,6 +1945,7 @@ class GameEngine:
 
         return True, message
 
+    @recorded_command
     def sell_module(self, module_id: str) -> Tuple[bool, str]:
         """Sell a module to the market"""
         location_data = LOCATIONS[self.player.location]
@@ -1266,6 +1974,7 @@ class GameEngine:
 
     # ==================== COMPONENT MARKETPLACE METHODS ====================
 
+    @recorded_command
     def buy_component(self, comp_id: str) -> Tuple[bool, str]:
         """Buy a ship component from the market"""
         location_data = LOCATIONS[self.player.location]
@@ -1299,6 +2008,7 @@ class GameEngine:
 
         return True, message
 
+    @recorded_command
     def sell_component(self, comp_id: str) -> Tuple[bool, str]:
         """Sell a ship component to the market"""
         location_data = LOCATIONS[self.player.location]
@@ -1325,6 +2035,7 @@ class GameEngine:
 
         return True, message
 
+    @recorded_command
     def buy_ship(self, ship_id: str) -> Tuple[bool, str]:
         """Buy a complete ship from the shipyard"""
         location_data = LOCATIONS[self.player.location]
@@ -1365,6 +2076,7 @@ class GameEngine:
 
         return True, f"{message} - Stored in shipyard berth (+{xp_reward} XP)"
 
+    @recorded_command
     def sell_ship(self, ship_id: str) -> Tuple[bool, str]:
         """Sell a ship to the shipyard"""
         location_data = LOCATIONS[self.player.location]
@@ -1389,15 +2101,14 @@ class GameEngine:
             return False, message
 
         # Remove from station inventory
-        station_inv[ship_id] -= 1
-        if station_inv[ship_id] == 0:
-            del station_inv[ship_id]
+        self.player.remove_station_item(self.player.location, ship_id, 1)
 
         # Add credits
         self.player.add_credits(value)
 
         return True, message
 
+    @recorded_command
     def switch_ship(self, new_ship_id: str) -> Tuple[bool, str]:
         """
         Switch from current ship to another ship in berths at current location
@@ -1408,59 +2119,38 @@ class GameEngine:
         if "shipyard" not in location_data.get("services", []):
             return False, "No shipyard at this location"
 
-        # Check if new ship is in berths at this location
-        ships_in_berths = self.berth_manager.get_ships_at_location(self.player.location)
-        if new_ship_id not in ships_in_berths:
+        # new_ship_id is a fleet id, or a class id for any ship of that class berthed here
+        fleet = self.berth_manager.fleet
+        if fleet.location_of(new_ship_id) == self.player.location:
+            uid = new_ship_id
+        else:
+            uid = fleet.find(self.player.location, new_ship_id, include_active=True)
+        if uid is None:
             return False, "Ship not found in berths at this location"
 
         # Can't switch to current ship
-        current_ship_id = self.vessel.vessel_class_id
-        if new_ship_id == current_ship_id:
+        if uid == fleet.active_uid:
             return False, "You are already piloting this ship"
+        if uid in self.fleet_ops:
+            return False, "This ship is out on a fleet job - recall it first"
 
         # Check if player meets level requirement for new ship
-        if new_ship_id not in VESSEL_CLASSES:
-            return False, "Invalid ship"
-
-        new_ship_data = VESSEL_CLASSES[new_ship_id]
-        level_req = new_ship_data.get("level_requirement", 1)
+        new_vessel = fleet.ships[uid]
+        level_req = VESSEL_CLASSES[new_vessel.vessel_class_id].get("level_requirement", 1)
         if self.player.level < level_req:
             return False, f"Requires level {level_req} to pilot this ship"
 
-        # Save current ship modules
-        old_modules = dict(self.vessel.installed_modules)
-
-        # Simply switch to the new ship (both remain in berths at this location)
-        # No need to remove/add - just change which vessel we're piloting
-        self.vessel = Vessel(new_ship_id)
-        self.player.current_ship_id = new_ship_id
-
-        # Try to reinstall compatible modules from old ship
-        reinstalled = []
-        moved_to_inventory = []
-
-        for mod_type, modules in old_modules.items():
-            for module_id in modules:
-                success, msg, _ = self.vessel.install_module(module_id)
-                if success:
-                    reinstalled.append(module_id)
-                else:
-                    # Add to player ship cargo if can't install
-                    self.player.add_item(module_id, 1)
-                    moved_to_inventory.append(module_id)
-
-        # Set hull and shields to full after installing modules
-        self.vessel.current_hull_hp = self.vessel.max_hull_hp
-        self.vessel.current_shields = self.vessel.get_total_shield_capacity()
+        # Both ships stay in their berths, each with its own modules and
+        # damage - only the piloted ship changes
+        fleet.active_uid = uid
+        self.vessel = new_vessel
+        self.player.current_ship_id = new_vessel.vessel_class_id
 
         # Build result message
-        result_msg = f"Switched to {new_ship_data['name']}"
-
-        if reinstalled:
-            result_msg += f"\n\nReinstalled {len(reinstalled)} compatible modules"
+        result_msg = f"Switched to {new_vessel.name}"
 
-        if moved_to_inventory:
-            result_msg += f"\n\n{len(moved_to_inventory)} incompatible modules moved to cargo"
+        modules = sum(len(module_ids) for module_ids in new_vessel.installed_modules.values())
+        result_msg += f"\n\n{modules} modules installed | Hull {new_vessel.get_hull_percentage():.0f}%"
 
         # Check cargo capacity
         cargo_used = self.player.get_cargo_volume()
@@ -1470,8 +2160,195 @@ class GameEngine:
 
         return True, result_msg
 
+    # ==================== FLEET OPERATIONS ====================
+
+    def _fleet_mineable(self, vessel: Vessel, location_id: str) -> List[str]:
+        """Ores at a location the vessel's mining laser can cut"""
+        mining_tier = vessel.get_mining_tier()
+        return [resource_id for resource_id in LOCATIONS[location_id].get("resources", [])
+                if RESOURCES.get(resource_id, {}).get("mining_tier", 1) <= mining_tier]
+
+    def _describe_fleet_operation(self, operation: FleetOperation) -> str:
+        names = [LOCATIONS[location_id]["name"] for location_id in operation.stops]
+        if operation.kind == "mine":
+            return f"mining {names[0]} for {LOCATIONS[operation.home]['name']}"
+        verb = "hauling" if operation.kind == "haul" else "ferrying"
+        return f"{verb} {self._get_item_name(operation.item_id)} from {names[0]} to {names[1]}"
+
+    @recorded_command
+    def assign_fleet_operation(self, ship_uid: str, kind: str, stops: List[str],
+                               item_id: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Put a berthed ship on a repeating job: "mine" [field], "haul" item_id
+        [buy_at, sell_at] or "ferry" item_id [from_station, to_station]
+        """
+        fleet = self.berth_manager.fleet
+        vessel = fleet.get(ship_uid)
+        if vessel is None:
+            return False, "Ship not found in your fleet"
+        if ship_uid == fleet.active_uid:
+            return False, "You are piloting this ship"
+        if kind not in OPERATION_KINDS:
+            return False, f"Unknown job: {kind} (mine, haul or ferry)"
+        if len(stops) != OPERATION_KINDS[kind]:
+            return False, f"A {kind} job needs {OPERATION_KINDS[kind]} location(s)"
+        for location_id in stops:
+            if location_id not in LOCATIONS:
+                return False, f"Unknown location: {location_id}"
+
+        if kind == "mine":
+            if vessel.get_mining_efficiency() <= 1.0 or vessel.get_mining_tier() == 0:
+                return False, f"{vessel.name} has no mining equipment"
+            if not self._fleet_mineable(vessel, stops[0]):
+                return False, f"{vessel.name} cannot mine any ores at {LOCATIONS[stops[0]]['name']}"
+        else:
+            if stops[0] == stops[1]:
+                return False, "Pick two different locations"
+            if kind == "haul":
+                if item_id not in RESOURCES:
+                    return False, "Only resources can be hauled between markets"
+                for location_id in stops:
+                    if self.economy.get_market(location_id) is None:
+                        return False, f"No market at {LOCATIONS[location_id]['name']}"
+            elif get_item(item_id) is None:
+                return False, f"Unknown item: {item_id}"
+            if int(vessel.cargo_capacity // get_item_volume(item_id)) < 1:
+                return False, f"{self._get_item_name(item_id)} does not fit in {vessel.name}'s hold"
+
+        home = fleet.location_of(ship_uid)
+        duration = cycle_time(kind, home, list(stops), vessel)
+        operation = FleetOperation(ship_uid, kind, home, list(stops), item_id, duration, self.game_time + duration)
+        self.fleet_ops.assign(operation)
+
+        return True, f"{vessel.name} is {self._describe_fleet_operation(operation)} (one round trip every {duration:.0f}s)"
+
+    @recorded_command
+    def recall_fleet_ship(self, ship_uid: str) -> Tuple[bool, str]:
+        """Stop a ship's fleet job; it stays in its berth"""
+        operation = self.fleet_ops.cancel(ship_uid)
+        if operation is None:
+            return False, "That ship has no fleet job"
+
+        vessel = self.berth_manager.fleet.get(ship_uid)
+        name = vessel.name if vessel is not None else ship_uid
+        return True, f"{name} recalled after {operation.cycles} cycle(s): {self._format_fleet_totals(operation.totals)}"
+
+    def _format_fleet_totals(self, totals: Dict[str, float]) -> str:
+        if not totals:
+            return "nothing to show"
+        parts = [f"{int(amount)}x {self._get_item_name(key)}" for key, amount in totals.items() if key != "credits"]
+        if "credits" in totals:
+            parts.append(f"{int(totals['credits']):+,} CR")
+        return ", ".join(parts)
+
+    def _resolve_fleet_operation(self, operation: FleetOperation, vessel: Vessel, cycles: int) -> Dict[str, float]:
+        """Apply the results of a job's finished cycles in one step"""
+        results: Dict[str, float] = {}
+
+        if operation.kind == "mine":
+            field = self.asteroid_fields.get_field(operation.stops[0], self.game_time)
+            ores = [resource_id for resource_id in self._fleet_mineable(vessel, operation.stops[0])
+                    if field.available(resource_id) > 0]
+            if not ores:
+                return results
+
+            # The average manual yield per cycle, at most a hold full of ore,
+            # split evenly over the ores the field still has
+            skill_bonus = self.player.get_skill_bonus("mining_operations", "mining_yield")
+            per_cycle = int(FLEET_OPS_MINING_YIELD * vessel.get_mining_efficiency() * (1 + skill_bonus))
+            average_volume = sum(get_item_volume(resource_id) for resource_id in ores) / len(ores)
+            per_cycle = min(per_cycle, int(vessel.cargo_capacity // average_volume))
+            share, extra = divmod(per_cycle * cycles, len(ores))
+            for index, resource_id in enumerate(ores):
+                taken = field.extract(resource_id, share + (1 if index < extra else 0))
+                if taken:
+                    self.player.add_station_item(operation.home, resource_id, taken)
+                    results[resource_id] = taken
+            self.player.stats["resources_mined"] += int(sum(results.values()))
+            return results
+
+        item_id = operation.item_id
+        source, destination = operation.stops
+        per_cycle = int(vessel.cargo_capacity // get_item_volume(item_id))
+
+        if operation.kind == "haul":
+            buy_market = self.economy.get_market(source)
+            sell_market = self.economy.get_market(destination)
+            # Bring both markets up to date before reading their stock
+            buy_market.catch_up()
+            sell_market.catch_up()
+            quantity = min(per_cycle * cycles, buy_market.stock.get(item_id, 0))
+            if quantity <= 0:
+                return results
+
+            # Every cycle trades one hold at the current prices; a trade that
+            # would lose money is skipped and the ship waits out the cycle
+            load = min(per_cycle, quantity)
+            unit_cost = buy_market.get_buy_price(
+                item_id, load, self.player.get_skill_bonus("trade_proficiency", "buy_discount")) / load
+            unit_payment = sell_market.get_sell_price(
+                item_id, load, self.player.get_skill_bonus("trade_proficiency", "sell_bonus"),
+                self.player.get_skill_bonus("trade_proficiency", "tax_reduction")) / load
+            if unit_payment <= unit_cost:
+                return results
+            quantity = min(quantity, int(self.player.credits // unit_cost), buy_market.stock.get(item_id, 0))
+            if quantity <= 0:
+                return results
+
+            buy_market.stock[item_id] -= quantity
+            sell_market.stock[item_id] = sell_market.stock.get(item_id, 0) + quantity
+            profit = int(unit_payment * quantity) - int(unit_cost * quantity)
+            self.player.add_credits(profit)
+            results[item_id] = quantity
+            results["credits"] = profit
+            return results
+
+        quantity = min(per_cycle * cycles, self.player.ledger.quantity(item_id, source))
+        if quantity > 0 and self.player.remove_station_item(source, item_id, quantity):
+            self.player.add_station_item(destination, item_id, quantity)
+            results[item_id] = quantity
+        return results
+
+    def check_fleet_operations(self) -> List[str]:
+        """Resolve every fleet job cycle finished by now (only jobs with finished cycles are touched)"""
+        messages = []
+        fleet = self.berth_manager.fleet
+
+        for operation, cycles in self.fleet_ops.pop_due(self.game_time):
+            vessel = fleet.get(operation.uid)
+            if vessel is None or operation.uid == fleet.active_uid:
+                # Lost, or taken out by the player - the job ends
+                self.fleet_ops.cancel(operation.uid)
+                continue
+
+            results = self._resolve_fleet_operation(operation, vessel, cycles)
+            operation.record(results)
+            if results:
+                messages.append(f"{vessel.name} ({operation.kind}, {cycles} cycle(s)): {self._format_fleet_totals(results)}")
+
+        return messages
+
+    def get_fleet_operations_status(self) -> List[Dict]:
+        """Every fleet ship with its job, for display"""
+        fleet = self.berth_manager.fleet
+        status = []
+        for uid, vessel in fleet.ships.items():
+            operation = self.fleet_ops.get(uid)
+            status.append({
+                "uid": uid,
+                "name": vessel.name,
+                "location_id": fleet.location_of(uid),
+                "active": uid == fleet.active_uid,
+                "job": self._describe_fleet_operation(operation) if operation else None,
+                "cycles": operation.cycles if operation else 0,
+                "next_in": max(0.0, operation.next_due - self.game_time) if operation else None,
+                "totals": self._format_fleet_totals(operation.totals) if operation else ""
+            })
+        return status
+
     # ==================== COMMODITY TRADING METHODS ====================
 
+    @recorded_command
     def buy_commodity(self, commodity_id: str, quantity: int) -> Tuple[bool, str]:
         """Buy commodity from market"""
         location_data = LOCATIONS[self.player.location]
@@ -1513,6 +2390,7 @@ class GameEngine:
 
         return True, message
 
+    @recorded_command
     def sell_commodity(self, commodity_id: str, quantity: int) -> Tuple[bool, str]:
         """Sell commodity to market"""
         location_data = LOCATIONS[self.player.location]
@@ -1544,6 +2422,7 @@ class GameEngine:
 
     # ==================== RECYCLING METHODS ====================
 
+    @recorded_command
     def recycle_component(self, comp_id: str) -> Tuple[bool, str]:
         """Recycle a component into materials"""
         location_data = LOCATIONS[self.player.location]
@@ -1585,6 +2464,7 @@ class GameEngine:
 
         return True, result_msg
 
+    @recorded_command
     def recycle_ship(self, ship_id: str) -> Tuple[bool, str]:
         """Recycle a ship into materials"""
         location_data = LOCATIONS[self.player.location]
@@ -1630,8 +2510,66 @@ class GameEngine:
 
         return True, result_msg
 
+    def get_recyclable_cargo(self) -> Dict[str, int]:
+        """Every component and ship in cargo that can be recycled (not the piloted ship's class)"""
+        items = {}
+        for item_id, quantity in self.player.ship_cargo.items():
+            if self.vessel and self.vessel.vessel_class_id == item_id:
+                continue
+            if quantity > 0 and self.recycling.check_recyclable(item_id)[0]:
+                items[item_id] = quantity
+        return items
+
+    @recorded_command
+    def recycle_batch(self, items: Dict[str, int]) -> Tuple[bool, str]:
+        """Recycle many components and ships at once"""
+        location_data = LOCATIONS[self.player.location]
+
+        if "manufacturing" not in location_data.get("services", []):
+            return False, "Recycling requires a manufacturing facility"
+
+        if not items:
+            return False, "Nothing to recycle"
+
+        for item_id, quantity in items.items():
+            if quantity <= 0 or not self.player.has_item(item_id, quantity):
+                return False, f"You don't have {quantity}x {self._get_item_name(item_id)}"
+            if self.vessel and self.vessel.vessel_class_id == item_id:
+                return False, "Cannot recycle your current vessel. Switch to another ship first."
+            recyclable, reason = self.recycling.check_recyclable(item_id)
+            if not recyclable:
+                return False, f"{self._get_item_name(item_id)}: {reason}"
+
+        materials, recycled = self.recycling.recycle_batch(items)
+
+        for item_id, quantity in recycled.items():
+            self.player.remove_item(item_id, quantity)
+
+        # Add recovered materials to cargo
+        cargo_capacity = self.vessel.cargo_capacity
+        cargo_warnings = []
+        for material, quantity in materials.items():
+            success_add, add_msg = self.player.add_item(material, quantity, cargo_capacity)
+            if not success_add:
+                cargo_warnings.append(f"Could not add {material}×{quantity}: {add_msg}")
+
+        # Award XP as for recycling each item on its own
+        ships = sum(quantity for item_id, quantity in recycled.items() if item_id in VESSEL_CLASSES)
+        components = sum(recycled.values()) - ships
+        xp_reward = components * 20 + ships * 150
+        self.player.add_experience(xp_reward)
+
+        material_list = ", ".join(f"{qty}x {self._get_item_name(mat)}" for mat, qty in materials.items())
+        result_msg = (f"Recycled {sum(recycled.values())} item(s). Recovered: {material_list or 'nothing'} "
+                      f"(+{xp_reward} XP)")
+        if cargo_warnings:
+            result_msg += f" WARNING: {', '.join(cargo_warnings)}"
+
+        return True, result_msg
+
     # ==================== MANUFACTURING METHODS ====================
 
+    @recorded_command
     def start_manufacturing(self, item_id: str, quantity: int) -> Tuple[bool, str]:
         """Start manufacturing modules, components, or ships"""
         location_data = LOCATIONS[self.player.location]
@@ -1641,13 +2579,7 @@ class GameEngine:
 
         # Determine item type and use appropriate skill
         item_type = self.manufacturing.detect_item_type(item_id)
-        if item_type == "ship":
-            skill_name = "ship_construction"
-        else:
-            skill_name = "module_manufacturing"
-
-        skill_level = self.player.get_skill_level(skill_name)
-        skill_bonus = self.player.get_skill_bonus(skill_name, "manufacturing_speed")
+        skill_level, skill_bonus = self._manufacturing_skill(item_type)
 
         success, message = self.manufacturing.start_manufacturing(
             item_id,
@@ -1656,16 +2588,79 @@ class GameEngine:
             self.player.level,
             skill_level,
             skill_bonus,
-            self.player.remove_item
+            self.player.remove_item,
+            self.get_manufacturing_lines()
         )
 
         return success, message
 
+    @recorded_command
+    def plan_production(self, item_id: str, quantity: int = 1) -> Tuple[bool, str]:
+        """Build an item and every missing sub-component from cargo, across all production lines"""
+        location_data = LOCATIONS[self.player.location]
+
+        if "manufacturing" not in location_data.get("services", []):
+            return False, "No manufacturing facility at this location"
+
+        return self.manufacturing.plan_production(
+            item_id,
+            quantity,
+            self.player.ship_cargo,
+            self.player.level,
+            self._manufacturing_skill,
+            self.player.remove_item,
+            self.get_manufacturing_lines()
+        )
+
+    @recorded_command
+    def cancel_manufacturing(self, index: int = 0) -> Tuple[bool, str]:
+        """Cancel the job on one production line, returning its plan's unused inputs to cargo"""
+        return self.manufacturing.cancel_job(index, self.player.add_item)
+
+    def plan_consolidation(self, item_id: str, quantity: int = 1) -> Tuple[bool, str]:
+        """Propose the fewest-trip route to gather an item's recipe inputs at one manufacturing station"""
+        recipe = self.manufacturing.get_recipe(item_id)
+        if not recipe:
+            return False, "No manufacturing recipe available"
+
+        requirements = {input_id: per_unit * quantity for input_id, per_unit in recipe_inputs(recipe).items()}
+        free_capacity = self.vessel.cargo_capacity - self.player.get_cargo_volume()
+        success, plan = plan_consolidation(self.player.ledger, requirements, self.player.location, free_capacity)
+        if not success:
+            return False, plan
+
+        target_name = LOCATIONS[plan["target"]]["name"]
+        if not plan["stops"]:
+            return True, f"Everything for {quantity}x {self._get_item_name(item_id)} is already at {target_name} or aboard"
+
+        lines = [f"Gather {quantity}x {self._get_item_name(item_id)} inputs at {target_name}: "
+                 f"{len(plan['stops'])} stop(s), {plan['trips']} trip(s), {plan['distance']:.0f} ls, "
+                 f"{plan['volume']:.1f} cargo volume"]
+        for number, stop in enumerate(plan["stops"], 1):
+            items = ", ".join(f"{qty}x {self._get_item_name(i)}" for i, qty in stop["items"].items())
+            lines.append(f"  {number}. {LOCATIONS[stop['location_id']]['name']}: {items}")
+        lines.append(f"  {len(plan['stops']) + 1}. Deliver to {target_name}")
+        return True, "\n".join(lines)
+
+    def _manufacturing_skill(self, item_type: Optional[str]) -> Tuple[int, float]:
+        """(skill_level, speed bonus) used to build an item type"""
+        skill_name = "ship_construction" if item_type == "ship" else "module_manufacturing"
+        return (self.player.get_skill_level(skill_name),
+                self.player.get_skill_bonus(skill_name, "manufacturing_speed"))
+
+    def get_manufacturing_lines(self) -> int:
+        """Production lines available, from the better of the two industrial skills"""
+        skill_level = max(self.player.get_skill_level("module_manufacturing"),
+                          self.player.get_skill_level("ship_construction"))
+        return MANUFACTURING_BASE_LINES + skill_level // MANUFACTURING_SKILL_LEVELS_PER_LINE
+
     def check_manufacturing(self) -> List[str]:
         """Check for completed manufacturing jobs"""
         messages = []
 
         completed = self.manufacturing.check_completed_jobs()
+        if self.manufacturing.plans:
+            self.manufacturing.dispatch(self.get_manufacturing_lines(), self._manufacturing_skill)
         cargo_capacity = self.vessel.cargo_capacity
 
         for item_id, quantity, item_type in completed:
@@ -1695,16 +2690,19 @@ class GameEngine:
 
     # ==================== INVENTORY MANAGEMENT METHODS ====================
 
+    @recorded_command
     def transfer_to_station(self, item_id: str, quantity: int) -> Tuple[bool, str]:
         """Transfer items from ship to station storage"""
         return self.player.transfer_to_station(item_id, quantity)
 
+    @recorded_command
     def transfer_to_ship(self, item_id: str, quantity: int, location_id: str = None) -> Tuple[bool, str]:
         """Transfer items from station to ship"""
         return self.player.transfer_to_ship(item_id, quantity, location_id)
 
     # ==================== MODULE INSTALLATION METHODS ====================
 
+    @recorded_command
     def install_module_on_ship(self, module_id: str) -> Tuple[bool, str]:
         """Install a module from inventory onto ship"""
         if not self.player.has_item(module_id, 1):
@@ -1716,19 +2714,20 @@ class GameEngine:
 
             # If a module was replaced, add it to station inventory
             if replaced_mod:
-                station_inv = self.player.get_station_inventory(self.player.location)
-                if replaced_mod in station_inv:
-                    station_inv[replaced_mod] += 1
-                else:
-                    station_inv[replaced_mod] = 1
+                self.player.add_station_item(self.player.location, replaced_mod, 1)
 
             return True, message
         else:
             return False, message
 
+    @recorded_command
     def uninstall_module_from_ship(self, module_id: str) -> Tuple[bool, str]:
         """Uninstall a module from ship to inventory"""
-        if self.vessel.uninstall_module(module_id):
+        if module_id not in MODULES:
+            return False, "Invalid module"
+
+        success, _ = self.vessel.uninstall_module(module_id, MODULES[module_id]["type"])
+        if success:
             self.player.add_item(module_id, 1)
             module_name = MODULES[module_id]["name"]
             return True, f"Uninstalled {module_name}"
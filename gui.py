@@ -12,8 +12,11 @@ import cv2
 from PIL import Image, ImageTk
 from game_engine import GameEngine
 from data import LOCATIONS, RESOURCES, MODULES, SKILLS, FACTIONS, VESSEL_CLASSES, SHIP_COMPONENTS, RAW_RESOURCES, REFINING_YIELD_RANGES
-from save_system import save_exists
-from volume_system import can_add_item
+from save_system import list_save_slots
+from universe import prepare_universe
+from combat_estimator import estimate_against_vessel
+from volume_system import check_capacity, get_item_volume
+from item_registry import get_item_name
 from icon_manager import get_icon_manager
 from symbols import get_symbol
 from ui_widgets import RoundedFrame, BeveledButton, RoundedPanel, ProgressBar
@@ -239,12 +242,20 @@ class VoidDominionGUI:
         btn_frame = tk.Frame(container, bg=COLORS['bg_dark'])
         btn_frame.pack(pady=50)
 
-        # Check for save file
-        if save_exists():
+        # Check for save slots (reads only the save headers)
+        slots = list_save_slots()
+        if slots:
             self.create_button(
                 btn_frame,
                 "Continue Game",
-                lambda: self.load_game(),
+                lambda: self.load_game(slots[0]["path"]),
+                width=20
+            ).pack(pady=10)
+
+            self.create_button(
+                btn_frame,
+                "Load Game",
+                lambda: self.show_load_game_screen(slots),
                 width=20
             ).pack(pady=10)
 
@@ -267,6 +278,9 @@ class VoidDominionGUI:
         for widget in self.root.winfo_children():
             widget.destroy()
 
+        # Build the starting universe now so Start Game only has to clone it
+        prepare_universe()
+
         container = tk.Frame(self.root, bg=COLORS['bg_dark'])
         container.pack(expand=True)
 
@@ -304,6 +318,7 @@ class VoidDominionGUI:
             if not name:
                 name = "Commander"
             self.engine.new_game(name)
+            self.engine.enable_journal()
             self.show_main_game()
 
         self.create_button(
@@ -323,9 +338,62 @@ class VoidDominionGUI:
         # Bind enter key
         name_entry.bind('<Return>', lambda e: start_game())
 
-    def load_game(self):
+    def show_load_game_screen(self, slots):
+        """Show save slots to choose from"""
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        container = tk.Frame(self.root, bg=COLORS['bg_dark'])
+        container.pack(expand=True)
+
+        tk.Label(
+            container,
+            text="Load Game",
+            font=('Arial', 24, 'bold'),
+            fg=COLORS['accent'],
+            bg=COLORS['bg_dark']
+        ).pack(pady=30)
+
+        for slot in slots:
+            row = tk.Frame(container, bg=COLORS['bg_dark'])
+            row.pack(fill=tk.X, pady=5)
+
+            if slot.get("recovery"):
+                details = "Unsaved game (recoverable)"
+            else:
+                hours, remainder = divmod(int(slot.get("play_time", 0)), 3600)
+                details = (f"{slot['location_name']}  |  {slot['credits']:,} CR  |  "
+                           f"{hours}h {remainder // 60:02d}m played")
+
+            tk.Label(
+                row,
+                text=f"{slot['commander']}\n{details}",
+                font=('Arial', 11),
+                fg=COLORS['text'],
+                bg=COLORS['bg_dark'],
+                justify=tk.LEFT,
+                width=50,
+                anchor='w'
+            ).pack(side=tk.LEFT, padx=10)
+
+            self.create_button(
+                row,
+                "Load",
+                lambda path=slot["path"]: self.load_game(path),
+                width=10
+            ).pack(side=tk.RIGHT, padx=10)
+
+        self.create_button(
+            container,
+            "Back",
+            self.show_start_screen,
+            width=20
+        ).pack(pady=30)
+
+    def load_game(self, path=None):
         """Load saved game"""
-        if self.engine.load_saved_game():
+        if self.engine.load_saved_game(path):
+            self.engine.enable_journal()
             self.show_main_game()
         else:
             messagebox.showerror("Error", "Failed to load saved game")
@@ -1258,6 +1326,7 @@ class VoidDominionGUI:
         vessel_panel.pack(fill=tk.X, pady=5)
 
         vessel = self.engine.vessel
+        derived = vessel.get_stats()
         cargo_used = self.engine.player.get_cargo_volume()
         cargo_capacity = vessel.cargo_capacity
         cargo_percent = (cargo_used / cargo_capacity * 100) if cargo_capacity > 0 else 0
@@ -1266,9 +1335,9 @@ class VoidDominionGUI:
             ("Name", vessel.name),
             ("Class", vessel.class_name),
             ("Hull", f"{vessel.current_hull_hp:.0f}/{vessel.max_hull_hp:.0f} ({vessel.get_hull_percentage():.1f}%)"),
-            ("Shields", f"{vessel.current_shields:.0f}/{vessel.get_total_shield_capacity():.0f} ({vessel.get_shield_percentage():.1f}%)"),
-            ("Armor", f"{vessel.get_total_armor():.0f}"),
-            ("Speed", f"{vessel.get_effective_speed():.0f}"),
+            ("Shields", f"{vessel.current_shields:.0f}/{derived.shield_capacity:.0f} ({vessel.get_shield_percentage():.1f}%)"),
+            ("Armor", f"{derived.armor:.0f}"),
+            ("Speed", f"{derived.speed:.0f}"),
             ("Cargo", f"{cargo_used:.1f}/{cargo_capacity:.0f} ({cargo_percent:.1f}%)")
         ]
 
@@ -1674,6 +1743,12 @@ class VoidDominionGUI:
         info_text += f"Mining Efficiency: {mining_efficiency:.2f}x\n"
         info_text += f"Current Location: {LOCATIONS[self.engine.player.location]['name']}"
 
+        # Ore left in this field (reserves regrow over time)
+        if LOCATIONS[self.engine.player.location].get("resources"):
+            field = self.engine.asteroid_fields.get_field(self.engine.player.location, self.engine.game_time)
+            for resource_id, reserve in field.get_status().items():
+                info_text += f"\n{RESOURCES[resource_id]['name']}: {reserve['reserve']:,}/{reserve['capacity']:,} ({reserve['percent']:.0f}%)"
+
         tk.Label(
             info_content,
             text=info_text,
@@ -1691,6 +1766,21 @@ class VoidDominionGUI:
         button_frame = tk.Frame(action_content, bg=COLORS['bg_medium'])
         button_frame.pack(expand=True)
 
+        cycles_frame = tk.Frame(button_frame, bg=COLORS['bg_medium'])
+        cycles_frame.pack(pady=(40, 10))
+
+        tk.Label(
+            cycles_frame,
+            text="Cycles:",
+            font=('Arial', 10),
+            fg=COLORS['text'],
+            bg=COLORS['bg_medium']
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.mining_cycles_entry = tk.Entry(cycles_frame, width=10, font=('Arial', 10))
+        self.mining_cycles_entry.pack(side=tk.LEFT, padx=5)
+        self.mining_cycles_entry.insert(0, "1")
+
         mine_btn = self.create_button(
             button_frame,
             "⛏️ MINE RESOURCES",
@@ -1698,12 +1788,12 @@ class VoidDominionGUI:
             width=30,
             style='warning'
         )
-        mine_btn.pack(pady=50)
+        mine_btn.pack(pady=(10, 50))
 
         # Help text
         tk.Label(
             action_content,
-            text="Click the button above to mine resources at your current location.\nMining equipment efficiency and bonuses affect your yield.",
+            text="Click the button above to mine resources at your current location.\nSeveral cycles run back to back until the hold fills or something shows up.\nMining equipment efficiency and bonuses affect your yield.",
             font=('Arial', 10, 'italic'),
             fg=COLORS['text_dim'],
             bg=COLORS['bg_medium'],
@@ -1969,6 +2059,16 @@ class VoidDominionGUI:
         market_panel, market_content = self.create_panel(left_col, f"Market - {location_data['name']}")
         market_panel.pack(fill=tk.BOTH, expand=True)
 
+        # Market events moving commodity prices here
+        for event in self.engine.commodity_market.get_active_events(self.engine.player.location):
+            tk.Label(
+                market_content,
+                text=f"⚠ {event['description']} - {int(event['remaining'] // 60)}m left",
+                font=('Arial', 9, 'bold'),
+                fg=COLORS['warning'],
+                bg=COLORS['bg_medium']
+            ).pack(anchor='w', padx=10, pady=(2, 0))
+
         # Search bar
         search_frame = tk.Frame(market_content, bg=COLORS['bg_medium'])
         search_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -2862,19 +2962,20 @@ class VoidDominionGUI:
         status_panel, status_content = self.create_panel(left_col, f"Vessel: {vessel.name}")
         status_panel.pack(fill=tk.X, pady=5)
 
+        derived = vessel.get_stats()
         stats = [
             ("Class", vessel.class_name),
             ("Type", vessel.class_type.upper()),
             ("", ""),
             ("Hull HP", f"{vessel.current_hull_hp:.0f} / {vessel.max_hull_hp:.0f}"),
             ("Hull %", f"{vessel.get_hull_percentage():.1f}%"),
-            ("Shields", f"{vessel.current_shields:.0f} / {vessel.get_total_shield_capacity():.0f}"),
+            ("Shields", f"{vessel.current_shields:.0f} / {derived.shield_capacity:.0f}"),
             ("Shield %", f"{vessel.get_shield_percentage():.1f}%"),
-            ("Armor Rating", f"{vessel.get_total_armor():.0f}"),
+            ("Armor Rating", f"{derived.armor:.0f}"),
             ("", ""),
-            ("Speed", f"{vessel.get_effective_speed():.0f}"),
+            ("Speed", f"{derived.speed:.0f}"),
             ("Cargo Capacity", f"{vessel.cargo_capacity:.0f}"),
-            ("Weapon Damage", f"{vessel.get_total_weapon_damage():.0f}"),
+            ("Weapon Damage", f"{derived.weapon_damage:.0f}"),
         ]
 
         for label, value in stats:
@@ -3201,17 +3302,15 @@ class VoidDominionGUI:
                     bg=COLORS['bg_light']
                 ).pack(pady=8)
 
-                # Get current ship ID
-                current_ship_id = self.engine.vessel.vessel_class_id
-
                 # Show all berths (including empty ones)
-                all_berths = berth_overview['berths']  # List of ship_ids or None
+                all_berths = berth_overview['ships']  # List of fleet ship entries or None
 
                 if all_berths:
                     # Display each berth
-                    for berth_idx, ship_id in enumerate(all_berths):
+                    for berth_idx, ship in enumerate(all_berths):
                         berth_num = berth_idx + 1
-                        is_current_ship = (ship_id == current_ship_id)
+                        ship_id = ship['vessel_class_id'] if ship else None
+                        is_current_ship = bool(ship and ship['active'])
 
                         # Create berth card
                         berth_frame = tk.Frame(berth_content, bg=COLORS['bg_medium'])
@@ -3250,7 +3349,7 @@ class VoidDominionGUI:
                             # Ship name
                             tk.Label(
                                 left_frame,
-                                text=ship_data['name'],
+                                text=ship['name'],
                                 font=('Arial', 11, 'bold'),
                                 fg=COLORS['accent'],
                                 bg=COLORS['bg_light']
@@ -3266,7 +3365,7 @@ class VoidDominionGUI:
                             ).pack(anchor='w', pady=(2, 5))
 
                             # Stats in compact format
-                            stats_text = f"Hull: {ship_data['hull_hp']:,} | Shield: {ship_data['shield_capacity']:,} | Speed: {ship_data['base_speed']} | Cargo: {ship_data['cargo_capacity']:,}"
+                            stats_text = f"Hull: {ship_data['hull_hp']:,} ({ship['hull_percent']:.0f}%) | Shield: {ship_data['shield_capacity']:,} | Speed: {ship_data['base_speed']} | Cargo: {ship_data['cargo_capacity']:,}"
                             tk.Label(
                                 left_frame,
                                 text=stats_text,
@@ -3277,7 +3376,7 @@ class VoidDominionGUI:
 
                             # Module slots
                             slots = ship_data['module_slots']
-                            slots_text = f"Slots: W:{slots['weapon']} D:{slots['defense']} U:{slots['utility']} E:{slots['engine']}"
+                            slots_text = f"Slots: W:{slots['weapon']} D:{slots['defense']} U:{slots['utility']} E:{slots['engine']} | {ship['modules']} modules installed"
                             tk.Label(
                                 left_frame,
                                 text=slots_text,
@@ -3286,15 +3385,35 @@ class VoidDominionGUI:
                                 bg=COLORS['bg_light']
                             ).pack(anchor='w', pady=(2, 0))
 
+                            # Fleet job, if the ship is out working
+                            job = self.engine.fleet_ops.get(ship['uid'])
+                            if job:
+                                tk.Label(
+                                    left_frame,
+                                    text=f"On job: {self.engine._describe_fleet_operation(job)} | {job.cycles} cycles | "
+                                         f"{self.engine._format_fleet_totals(job.totals)}",
+                                    font=('Arial', 9, 'italic'),
+                                    fg=COLORS['success'],
+                                    bg=COLORS['bg_light']
+                                ).pack(anchor='w', pady=(2, 0))
+
                             # Right side - actions
                             right_frame = tk.Frame(ship_card, bg=COLORS['bg_light'])
                             right_frame.pack(side=tk.RIGHT, padx=10, pady=10)
 
-                            if not is_current_ship:
+                            if job:
+                                self.create_button(
+                                    right_frame,
+                                    "Recall",
+                                    lambda s=ship['uid']: self.recall_fleet_ship_action(s),
+                                    width=12,
+                                    style='warning'
+                                ).pack()
+                            elif not is_current_ship:
                                 self.create_button(
                                     right_frame,
                                     "Pilot Ship",
-                                    lambda s=ship_id: self.switch_ship_action(s),
+                                    lambda s=ship['uid']: self.switch_ship_action(s),
                                     width=12,
                                     style='info'
                                 ).pack()
@@ -4296,6 +4415,17 @@ class VoidDominionGUI:
         else:
             messagebox.showerror("Switch Failed", message)
 
+    def recall_fleet_ship_action(self, ship_uid):
+        """Stop a berthed ship's fleet job"""
+        success, message = self.engine.recall_fleet_ship(ship_uid)
+
+        if success:
+            messagebox.showinfo("Ship Recalled", message)
+            self.update_top_bar()
+            self.show_shipyard_view()
+        else:
+            messagebox.showerror("Recall Failed", message)
+
     def buy_ship_action(self, ship_id):
         """Buy a complete ship"""
         success, message = self.engine.buy_ship(ship_id)
@@ -4558,11 +4688,7 @@ class VoidDominionGUI:
 
             # If a module was replaced, add it to station inventory
             if replaced_mod:
-                station_inv = self.engine.player.get_station_inventory(self.engine.player.location)
-                if replaced_mod in station_inv:
-                    station_inv[replaced_mod] += 1
-                else:
-                    station_inv[replaced_mod] = 1
+                self.engine.player.add_station_item(self.engine.player.location, replaced_mod, 1)
 
                 replaced_name = MODULES[replaced_mod]["name"]
                 messagebox.showinfo("Module Installed",
@@ -4608,7 +4734,7 @@ class VoidDominionGUI:
         
         # Check cargo capacity
         cargo_capacity = self.engine.vessel.cargo_capacity
-        can_add, message = can_add_item(self.engine.player.ship_cargo, cargo_capacity, module_id, 1)
+        can_add, message = check_capacity(self.engine.player.get_cargo_volume(), cargo_capacity, module_id, 1)
         
         if not can_add:
             messagebox.showerror("Transfer Failed", f"Insufficient cargo space: {message}")
@@ -4616,9 +4742,7 @@ class VoidDominionGUI:
         
         # Transfer the module
         # Remove from station
-        station_inventory[module_id] -= 1
-        if station_inventory[module_id] == 0:
-            del station_inventory[module_id]
+        self.engine.player.remove_station_item(current_location, module_id, 1)
         
         # Add to ship cargo
         self.engine.player.add_item(module_id, 1)
@@ -4980,11 +5104,7 @@ class VoidDominionGUI:
 
             # If a module was replaced, add it to station inventory
             if replaced_mod:
-                station_inv = self.engine.player.get_station_inventory(self.engine.player.location)
-                if replaced_mod in station_inv:
-                    station_inv[replaced_mod] += 1
-                else:
-                    station_inv[replaced_mod] = 1
+                self.engine.player.add_station_item(self.engine.player.location, replaced_mod, 1)
 
                 replaced_name = MODULES[replaced_mod]["name"]
                 messagebox.showinfo("Module Installed",
@@ -5037,9 +5157,28 @@ class VoidDominionGUI:
         panel, content = self.create_panel(self.content_frame, f"Manufacturing - {category.title()}")
         panel.pack(fill=tk.BOTH, expand=True)
 
-        # Show active job if any
-        active_job = self.engine.manufacturing.get_job_progress()
-        if active_job:
+        # Show the job on every busy production line
+        lines = self.engine.get_manufacturing_lines()
+        active_jobs = self.engine.manufacturing.get_jobs_progress()
+        tk.Label(
+            content,
+            text=f"Production lines: {len(active_jobs)}/{lines} busy",
+            font=('Arial', 10),
+            fg=COLORS['text_dim'],
+            bg=COLORS['bg_medium']
+        ).pack(anchor='w', padx=10)
+
+        for plan in self.engine.manufacturing.get_plans_status():
+            tk.Label(
+                content,
+                text=f"Plan: {plan['item_name']} x{plan['quantity']} - "
+                     f"{plan['steps_done']}/{plan['steps_total']} jobs done",
+                font=('Arial', 10),
+                fg=COLORS['accent'],
+                bg=COLORS['bg_medium']
+            ).pack(anchor='w', padx=10)
+
+        for active_job in active_jobs:
             job_frame = tk.Frame(content, bg=COLORS['bg_light'], relief=tk.RIDGE, bd=2)
             job_frame.pack(fill=tk.X, pady=10, padx=10)
 
@@ -5069,7 +5208,12 @@ class VoidDominionGUI:
                 bg=COLORS['bg_light']
             ).pack(pady=10)
 
-            return  # Don't show recipes while manufacturing
+        if len(active_jobs) >= lines:
+            return  # Don't show recipes while every line is busy
+
+        # Craftable counts for every recipe, refreshed for what changed in cargo
+        recipe_index = self.engine.manufacturing.recipe_index
+        recipe_index.sync(self.engine.player.ship_cargo)
 
         # Show available recipes based on category
         from data import MANUFACTURING_RECIPES, MODULE_COMPONENT_RECIPES, COMPONENT_RECIPES, SHIP_RECIPES, MODULE_COMPONENTS
@@ -5240,7 +5384,9 @@ class VoidDominionGUI:
             time_min = recipe['time'] // 60
             time_sec = recipe['time'] % 60
 
-            req_parts = [f"Time: {time_min}m {time_sec}s"]
+            req_parts = [f"Time: {time_min}m {time_sec}s",
+                         f"Craftable: {recipe_index.craftable_now(item_id)}",
+                         f"From raw: {recipe_index.buildable_from_raw(item_id)}"]
 
             # Level requirement with status
             if level_locked:
@@ -5277,6 +5423,12 @@ class VoidDominionGUI:
                     bg=frame_color
                 ).pack(side=tk.RIGHT, padx=15, pady=10)
             else:
+                self.create_button(
+                    recipe_frame,
+                    "Build All",
+                    lambda i=item_id: self.plan_production(i),
+                    width=10
+                ).pack(side=tk.RIGHT, padx=(0, 15), pady=10)
                 self.create_button(
                     recipe_frame,
                     "Craft",
@@ -5298,6 +5450,16 @@ class VoidDominionGUI:
         else:
             messagebox.showerror("Manufacturing Failed", message)
 
+    def plan_production(self, item_id):
+        """Build an item along with every sub-component it needs"""
+        success, message = self.engine.plan_production(item_id, 1)
+
+        if success:
+            messagebox.showinfo("Production Planned", message)
+            self.show_manufacturing_view()
+        else:
+            messagebox.showerror("Production Failed", message)
+
     def save_and_exit(self):
         """Save the game and exit"""
         # Confirm with user
@@ -5319,6 +5481,8 @@ class VoidDominionGUI:
         except Exception as e:
             messagebox.showerror("Save Error", f"Error saving game: {str(e)}")
 
+        self.engine.close_journal()
+
         # Exit the application
         self.root.quit()
         self.root.destroy()
@@ -5478,7 +5642,16 @@ class VoidDominionGUI:
             font=('Arial', 10),
             fg=COLORS['accent'],
             bg=COLORS['bg_medium']
-        ).pack(pady=10, padx=10)
+        ).pack(side=tk.LEFT, pady=10, padx=10)
+
+        if self.engine.get_recyclable_cargo():
+            self.create_button(
+                info_frame,
+                "Recycle All",
+                self.recycle_all_action,
+                width=12,
+                style='danger'
+            ).pack(side=tk.RIGHT, pady=10, padx=10)
 
         # Two columns
         columns = tk.Frame(self.content_frame, bg=COLORS['bg_dark'])
@@ -5640,6 +5813,21 @@ class VoidDominionGUI:
             bg=COLORS['bg_medium']
         ).pack(pady=10, padx=10)
 
+        # Refinery queue
+        queue = self.engine.refinery.get_queue_status(self.engine.game_time)
+        if queue:
+            queue_frame = tk.Frame(self.content_frame, bg=COLORS['bg_medium'], relief=tk.RIDGE, bd=1)
+            queue_frame.pack(fill=tk.X, pady=(0, 10), padx=10)
+            for job in queue:
+                ores = ", ".join(f"{quantity}x {RESOURCES[ore_id]['name']}" for ore_id, quantity in job["basket"].items())
+                tk.Label(
+                    queue_frame,
+                    text=f"⚗️ {ores} - {job['progress']:.0f}% ({job['remaining'] / 60:.0f} game min left)",
+                    font=('Arial', 9),
+                    fg=COLORS['text'],
+                    bg=COLORS['bg_medium']
+                ).pack(anchor='w', padx=10, pady=2)
+
         # Main panel
         panel, content = self.create_panel(self.content_frame, "Refine Raw Ores")
         panel.pack(fill=tk.BOTH, expand=True)
@@ -5661,6 +5849,17 @@ class VoidDominionGUI:
                     raw_ores_available[item_id] = {"ship": 0, "station": quantity}
 
         if raw_ores_available:
+            # Queue every raw ore on hand as one refinery job
+            basket = {ore_id: q["ship"] + q["station"] for ore_id, q in raw_ores_available.items()
+                      if RAW_RESOURCES[ore_id].get("refines_to")}
+            self.create_button(
+                content,
+                "Refine All",
+                lambda: self.queue_refining(basket),
+                width=20,
+                style='success'
+            ).pack(pady=(5, 10))
+
             canvas = tk.Canvas(content, bg=COLORS['bg_medium'], highlightthickness=0)
             scrollbar = tk.Scrollbar(content, orient="vertical", command=canvas.yview)
             scrollable_frame = tk.Frame(canvas, bg=COLORS['bg_medium'])
@@ -5737,6 +5936,16 @@ class VoidDominionGUI:
                 justify=tk.CENTER
             ).pack(pady=50)
 
+    def queue_refining(self, basket):
+        """Queue a basket of raw ores at the refinery"""
+        success, message = self.engine.queue_refining(basket)
+        if success:
+            messagebox.showinfo("Refinery", message)
+            self.update_top_bar()
+            self.show_refine_view()
+        else:
+            messagebox.showerror("Refining Failed", message)
+
     def refine_ore_dialog(self, ore_id):
         """Show dialog to refine ore"""
         dialog = tk.Toplevel(self.root)
@@ -5865,6 +6074,31 @@ class VoidDominionGUI:
         else:
             messagebox.showerror("Recycling Failed", message)
 
+    def recycle_all_action(self):
+        """Recycle every recyclable component and ship in cargo"""
+        items = self.engine.get_recyclable_cargo()
+        if not items:
+            return
+
+        expected = self.engine.recycling.expected_recovery(items)
+        expected_text = "\n".join(
+            f"  ~{qty:.0f}x {RESOURCES.get(mat, {}).get('name', mat)}" for mat, qty in expected.items()
+        )
+        if not messagebox.askyesno(
+            "Confirm Recycle",
+            f"Recycle {sum(items.values())} item(s) for materials?\n\nExpected recovery:\n{expected_text}"
+        ):
+            return
+
+        success, message = self.engine.recycle_batch(items)
+
+        if success:
+            messagebox.showinfo("Recycling Complete", message)
+            self.update_top_bar()
+            self.show_recycle_view()
+        else:
+            messagebox.showerror("Recycling Failed", message)
+
     def transfer_to_station_dialog(self, item_id):
         """Transfer items to station"""
         dialog = tk.Toplevel(self.root)
@@ -6118,8 +6352,16 @@ class VoidDominionGUI:
         messagebox.showinfo("Scan Results", message)
 
     def mine_resources(self):
-        """Mine resources"""
-        success, message = self.engine.mine_resources()
+        """Mine resources (as many cycles as entered in the mining view)"""
+        try:
+            cycles = int(self.mining_cycles_entry.get())
+        except (AttributeError, tk.TclError, ValueError):
+            cycles = 1
+        if cycles <= 0:
+            messagebox.showerror("Invalid Cycles", "Cycle count must be greater than 0")
+            return
+
+        success, message = self.engine.mine_batch(cycles)
 
         if success:
             # Always update top bar to reflect inventory changes
@@ -6254,8 +6496,7 @@ class VoidDominionGUI:
                     self.engine.player.add_item(resource_id, quantity_var.get())
                 else:
                     # Add to station storage
-                    station_inv = self.engine.player.get_station_inventory(self.engine.player.location)
-                    station_inv[resource_id] = station_inv.get(resource_id, 0) + quantity_var.get()
+                    self.engine.player.add_station_item(self.engine.player.location, resource_id, quantity_var.get())
                 
                 dialog.destroy()
                 self.update_top_bar()
@@ -6383,10 +6624,7 @@ class VoidDominionGUI:
                 if source == "ship":
                     self.engine.player.remove_item(resource_id, quantity)
                 else:
-                    if station_inv[resource_id] >= quantity:
-                        station_inv[resource_id] -= quantity
-                        if station_inv[resource_id] == 0:
-                            del station_inv[resource_id]
+                    self.engine.player.remove_station_item(self.engine.player.location, resource_id, quantity)
 
                 self.engine.player.add_credits(payment)
                 dialog.destroy()
@@ -6564,10 +6802,7 @@ class VoidDominionGUI:
                 )
                 if success:
                     # Remove from station inventory
-                    if station_inv[commodity_id] >= quantity:
-                        station_inv[commodity_id] -= quantity
-                        if station_inv[commodity_id] == 0:
-                            del station_inv[commodity_id]
+                    self.engine.player.remove_station_item(self.engine.player.location, commodity_id, quantity)
                     # Add credits
                     self.engine.player.add_credits(revenue)
 
@@ -6582,8 +6817,6 @@ class VoidDominionGUI:
 
     def load_from_station(self, item_id):
         """Load items from station storage to ship cargo"""
-        from data import COMMODITIES, RESOURCES, MODULES
-
         station_inv = self.engine.player.get_station_inventory(self.engine.player.location)
         station_qty = station_inv.get(item_id, 0)
 
@@ -6591,22 +6824,8 @@ class VoidDominionGUI:
             messagebox.showerror("Error", "No items in station storage")
             return
 
-        # Determine item name and type
-        item_name = None
-        item_volume = 1  # Default volume
-
-        if item_id in COMMODITIES:
-            item_name = COMMODITIES[item_id]['name']
-            item_volume = COMMODITIES[item_id].get('volume', 1)
-        elif item_id in RESOURCES:
-            item_name = RESOURCES[item_id]['name']
-            item_volume = RESOURCES[item_id].get('volume', 1)
-        elif item_id in MODULES:
-            item_name = MODULES[item_id]['name']
-            item_volume = MODULES[item_id].get('volume', 10)
-        else:
-            item_name = item_id
-            item_volume = 1
+        item_name = get_item_name(item_id)
+        item_volume = get_item_volume(item_id)
 
         # Create dialog
         dialog = tk.Toplevel(self.root)
@@ -6661,8 +6880,8 @@ class VoidDominionGUI:
                 return
 
             # Check cargo space
-            current_cargo = self.engine.player.get_cargo_used()
-            max_cargo = self.engine.player.get_cargo_capacity()
+            current_cargo = self.engine.player.get_cargo_volume()
+            max_cargo = self.engine.vessel.cargo_capacity
             needed_space = quantity * item_volume
 
             if current_cargo + needed_space > max_cargo:
@@ -6671,12 +6890,10 @@ class VoidDominionGUI:
                 return
 
             # Transfer from station to ship
-            station_inv[item_id] -= quantity
-            if station_inv[item_id] == 0:
-                del station_inv[item_id]
+            self.engine.player.remove_station_item(self.engine.player.location, item_id, quantity)
 
             # Add to ship cargo
-            self.engine.player.inventory[item_id] = self.engine.player.inventory.get(item_id, 0) + quantity
+            self.engine.player.add_item(item_id, quantity)
 
             dialog.destroy()
             self.update_top_bar()
@@ -6699,7 +6916,11 @@ class VoidDominionGUI:
 
     def accept_contract(self, contract):
         """Accept a contract"""
-        self.engine.contract_board.accept_contract(contract.contract_id, self.engine.player)
+        success, message = self.engine.accept_contract(contract.contract_id)
+        if not success:
+            messagebox.showerror("Contract Unavailable", message)
+            self.show_contracts_view()
+            return
         
         # Show different messages based on contract type
         if contract.objectives.get("type") == "transport_cargo":
@@ -6725,22 +6946,10 @@ class VoidDominionGUI:
 
     def complete_delivery_contract(self, contract):
         """Complete a delivery contract by depositing cargo at destination"""
-        success, message = self.engine.contract_board.complete_delivery_contract(contract.contract_id, self.engine.player)
+        success, message = self.engine.complete_delivery_contract(contract.contract_id)
         
         if success:
-            # Get reward
-            reward = self.engine.contract_board.complete_contract(contract.contract_id)
-            if reward:
-                self.engine.player.add_credits(reward)
-                contract_xp = int(reward / 10)
-                self.engine.player.add_experience(contract_xp)
-                self.engine.player.stats['contracts_completed'] += 1
-                messagebox.showinfo(
-                    "Delivery Complete!",
-                    f"{message}\n\nReward: {reward:,} CR + {contract_xp} XP"
-                )
-            else:
-                messagebox.showinfo("Delivery Complete!", message)
+            messagebox.showinfo("Delivery Complete!", message)
             
             # Refresh status view to update contracts
             self.show_status_view()
@@ -6750,7 +6959,7 @@ class VoidDominionGUI:
     def abandon_contract(self, contract):
         """Abandon an active contract"""
         if messagebox.askyesno("Confirm", f"Abandon contract: {contract.name}?"):
-            self.engine.contract_board.abandon_contract(contract.contract_id)
+            self.engine.abandon_contract(contract.contract_id)
             self.show_status_view()
 
     def show_trader_encounter(self):
@@ -7223,6 +7432,17 @@ class VoidDominionGUI:
             bg=COLORS['bg_light']
         ).pack(pady=5)
 
+        # Outcome estimate for the rest of the fight
+        skill_bonus = self.engine.player.get_skill_bonus("weapons_mastery", "damage")
+        estimate = estimate_against_vessel(self.engine.vessel, combat.enemy_vessel, skill_bonus)
+        tk.Label(
+            content,
+            text=f"Estimate: {estimate.get_summary()}",
+            font=('Arial', 10),
+            fg=COLORS['text_dim'],
+            bg=COLORS['bg_medium']
+        ).pack(pady=(0, 5))
+
         # Combat log
         log_frame = tk.Frame(content, bg=COLORS['bg_dark'], relief=tk.SUNKEN, bd=2)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=20, padx=20)
@@ -7279,78 +7499,21 @@ class VoidDominionGUI:
 
     def combat_attack(self):
         """Execute attack in combat"""
-        combat = self.engine.current_combat
-        skill_bonus = self.engine.player.get_skill_bonus("weapons_mastery", "damage")
-
-        result = combat.player_attack(0, skill_bonus)
-        self.add_combat_log(result['message'])
-
-        if combat.is_active:
-            enemy_result = combat.enemy_attack()
-            self.add_combat_log(enemy_result['message'])
-
-            if enemy_result.get("player_destroyed"):
-                # Handle ship destruction and respawn
-                # Clear pending travel since player is respawning at a different location
-                self.engine.pending_travel_destination = None
-                success, respawn_msg = self.engine.handle_ship_destruction()
-                messagebox.showwarning("SHIP DESTROYED", respawn_msg)
-                self.update_top_bar()
-                self.show_status_view()
-                return
-
-        if result.get("enemy_destroyed"):
-            credits_reward = combat.rewards["credits"]
-            xp_reward = combat.rewards["xp"]
-            loot = combat.rewards.get("loot", {})
-
-            # Track level before adding XP
-            old_level = self.engine.player.level
-
-            self.engine.player.add_credits(credits_reward)
-            self.engine.player.add_experience(xp_reward)
-            self.engine.player.stats["enemies_destroyed"] += 1
-
-            # Give loot to player
-            loot_messages = []
-            cargo_capacity = self.engine.vessel.cargo_capacity if self.engine.vessel else None
-            for item_id, quantity in loot.items():
-                success, message = self.engine.player.add_item(item_id, quantity, cargo_capacity)
-                if success:
-                    # Get item name for display
-                    from data import MODULES, RESOURCES, COMMODITIES
-                    if item_id in MODULES:
-                        item_name = MODULES[item_id]["name"]
-                    elif item_id in RESOURCES:
-                        item_name = RESOURCES[item_id]["name"]
-                    elif item_id in COMMODITIES:
-                        item_name = COMMODITIES[item_id]["name"]
-                    else:
-                        item_name = item_id
+        success, message, outcome = self.engine.combat_attack()
+        if not success:
+            messagebox.showerror("Error", message)
+            return
 
-                    loot_messages.append(f"{quantity}x {item_name}")
-                    self.add_combat_log(f"LOOT: +{quantity}x {item_name}")
-                else:
-                    self.add_combat_log(f"Cargo full! Lost {quantity}x {item_id}")
-
-            # Update contract progress for combat objectives
-            for contract in self.engine.contract_board.active_contracts:
-                if contract.objectives.get("type") == "destroy_enemies":
-                    completed = contract.update_progress({"enemies_destroyed": 1})
-                    if completed:
-                        # Auto-pay immediately
-                        self.engine.player.add_credits(contract.reward)
-                        contract_xp = int(contract.reward / 10)
-                        self.engine.player.add_experience(contract_xp)
-                        self.engine.player.stats['contracts_completed'] += 1
-                        self.add_combat_log(f"CONTRACT COMPLETE! {contract.name} | +{contract.reward:,} CR +{contract_xp} XP")
-
-            self.add_combat_log(f"VICTORY! Earned {credits_reward:,} CR + {xp_reward} XP")
-            self.engine.current_combat = None
+        if outcome["result"] == "destroyed":
+            messagebox.showwarning("SHIP DESTROYED", outcome["respawn_message"])
+            self.update_top_bar()
+            self.show_status_view()
+            return
 
+        if outcome["result"] == "victory":
             # Check for level up
-            if self.engine.player.level > old_level:
-                levels_gained = self.engine.player.level - old_level
+            levels_gained = outcome["levels_gained"]
+            if levels_gained > 0:
                 messagebox.showinfo(
                     "LEVEL UP!",
                     f"Congratulations! You reached Level {self.engine.player.level}!\n"
@@ -7358,63 +7521,45 @@ class VoidDominionGUI:
                 )
 
             # Build victory message with loot
-            victory_msg = f"Enemy destroyed!\n\nRewards:\n{credits_reward:,} CR\n{xp_reward} XP"
+            loot_messages = [f"{quantity}x {self.engine._get_item_name(item_id)}"
+                             for item_id, quantity, kept in outcome["loot"] if kept]
+            victory_msg = f"Enemy destroyed!\n\nRewards:\n{outcome['credits']:,} CR\n{outcome['xp']} XP"
             if loot_messages:
                 victory_msg += "\n\nLoot:\n" + "\n".join(loot_messages)
             else:
                 victory_msg += "\n\nNo loot dropped"
+            for name, reward, contract_xp in outcome["contracts"]:
+                victory_msg += f"\n\nCONTRACT COMPLETE! {name}\n+{reward:,} CR +{contract_xp} XP"
 
             messagebox.showinfo("Victory!", victory_msg)
             self.update_top_bar()
 
-            # Check for pending travel after combat
-            if self.engine.pending_travel_destination:
-                destination_id = self.engine.pending_travel_destination
-                self.engine.pending_travel_destination = None
-
-                # Complete the travel
-                self.engine.player.location = destination_id
-                self.engine.player.stats["distance_traveled"] += 100
-                self.engine.player.visited_locations.add(destination_id)
-                self.engine.contract_board.generate_contracts(destination_id)
-
-                from data import LOCATIONS
-                dest_name = LOCATIONS[destination_id]["name"]
+            # Travel interrupted by the fight has been completed
+            if outcome["traveled_to"]:
+                dest_name = LOCATIONS[outcome["traveled_to"]]["name"]
                 messagebox.showinfo("Travel", f"Traveled to {dest_name}")
                 self.refresh_navigation()
                 self.show_travel_view()
             else:
                 self.show_status_view()
         else:
-            combat.next_turn()
             self.show_combat_view()
 
     def combat_retreat(self):
         """Attempt to retreat from combat"""
-        combat = self.engine.current_combat
-        result = combat.attempt_retreat()
-        self.add_combat_log(result['message'])
+        success, message, outcome = self.engine.combat_retreat()
+        if not success:
+            messagebox.showerror("Error", message)
+            return
 
-        if result.get('retreated'):
-            self.engine.current_combat = None
-            # Clear pending travel if retreating from combat (don't complete the travel)
-            self.engine.pending_travel_destination = None
+        if outcome["result"] == "retreated":
             messagebox.showinfo("Retreat", "Successfully retreated from combat")
             self.show_status_view()
-        elif 'enemy_attack' in result:
-            enemy_result = result['enemy_attack']
-            self.add_combat_log(enemy_result['message'])
-
-            # Check if player was destroyed during failed retreat
-            if enemy_result.get("player_destroyed"):
-                # Clear pending travel since player is respawning at a different location
-                self.engine.pending_travel_destination = None
-                success, respawn_msg = self.engine.handle_ship_destruction()
-                messagebox.showwarning("SHIP DESTROYED", respawn_msg)
-                self.update_top_bar()
-                self.show_status_view()
-                return
-
+        elif outcome["result"] == "destroyed":
+            messagebox.showwarning("SHIP DESTROYED", outcome["respawn_message"])
+            self.update_top_bar()
+            self.show_status_view()
+        else:
             self.show_combat_view()
 
     def save_game(self):
@@ -7565,6 +7710,7 @@ class VoidDominionGUI:
         if self.engine.player:
             if messagebox.askyesno("Quit", "Save game before exiting?"):
                 self.engine.save_current_game()
+            self.engine.close_journal()
 
         self.root.destroy()
 
@@ -0,0 +1,169 @@
+"""
+Faction Influence
+Each faction's presence spreads along the location graph. Every update a
+share of the influence at each location flows to its neighbours - closer
+neighbours (shorter travel distance) get more - a little fades away, and
+every controlled location adds fresh influence for its controller. The
+update is a sparse matrix product over the connection list, so it costs
+time in proportion to locations plus connections.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import INFLUENCE_DIFFUSION, INFLUENCE_DECAY
+from travel_system import get_travel_distance
+
+# Optional NumPy (falls back to plain Python lists at the same per-update cost, only slower)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+class InfluenceMap:
+    """
+    Influence of every faction at every location: a (locations x factions)
+    matrix. The connection graph is kept as parallel arrays (source,
+    target, weight), weights from each source summing to 1.
+    """
+
+    def __init__(self, locations: Dict[str, Dict], factions: Iterable[str]):
+        self.location_ids: List[str] = list(locations)
+        self.index = {location_id: i for i, location_id in enumerate(self.location_ids)}
+        self.factions: List[str] = list(factions)
+        self.faction_index = {faction_id: f for f, faction_id in enumerate(self.factions)}
+
+        sources, targets, weights = [], [], []
+        for location_id, location in locations.items():
+            links = [(self.index[other], 1.0 / max(get_travel_distance(location_id, other), 1))
+                     for other in location.get("connections", [])
+                     if other in self.index and other != location_id]
+            total = sum(weight for _, weight in links)
+            for target, weight in links:
+                sources.append(self.index[location_id])
+                targets.append(target)
+                weights.append(weight / total)
+
+        size, width = len(self.location_ids), len(self.factions)
+        if HAS_NUMPY:
+            self.edge_source = np.array(sources, dtype=np.int64)
+            self.edge_target = np.array(targets, dtype=np.int64)
+            self.edge_weight = np.array(weights, dtype=np.float64)
+            self.values = np.zeros((size, width))
+            self.emission = np.zeros((size, width))  # Influence added per update
+        else:
+            self.edge_source, self.edge_target, self.edge_weight = sources, targets, weights
+            self.values = [[0.0] * width for _ in range(size)]
+            self.emission = [[0.0] * width for _ in range(size)]
+
+    def set_emitter(self, location_id: str, faction_id: Optional[str], strength: float = 1.0):
+        """Make a location add influence for one faction (None for nobody)"""
+        i = self.index.get(location_id)
+        if i is None:
+            return
+        for f in range(len(self.factions)):
+            self.emission[i][f] = 0.0
+        if faction_id in self.faction_index:
+            self.emission[i][self.faction_index[faction_id]] = strength
+
+    def step(self, updates: int = 1):
+        """Run diffusion updates"""
+        for _ in range(updates):
+            if HAS_NUMPY:
+                self._step_numpy()
+            else:
+                self._step_python()
+
+    def _step_numpy(self):
+        values = self.values
+        size = len(self.location_ids)
+        flowing = values[self.edge_source] * self.edge_weight[:, None]
+        received = np.empty_like(values)
+        for f in range(values.shape[1]):
+            received[:, f] = np.bincount(self.edge_target, weights=flowing[:, f], minlength=size)
+        # Locations without connections keep what would have flowed away
+        isolated = np.bincount(self.edge_source, minlength=size) == 0
+        received[isolated] = values[isolated]
+        self.values = ((1 - INFLUENCE_DIFFUSION) * values + INFLUENCE_DIFFUSION * received) \
+            * (1 - INFLUENCE_DECAY) + self.emission
+
+    def _step_python(self):
+        values = self.values
+        width = len(self.factions)
+        received = [[0.0] * width for _ in values]
+        has_links = [False] * len(values)
+        for source, target, weight in zip(self.edge_source, self.edge_target, self.edge_weight):
+            has_links[source] = True
+            row, out = values[source], received[target]
+            for f in range(width):
+                out[f] += row[f] * weight
+        keep = 1 - INFLUENCE_DECAY
+        self.values = [
+            [((1 - INFLUENCE_DIFFUSION) * row[f] + INFLUENCE_DIFFUSION * (into[f] if linked else row[f])) * keep + emitted[f]
+             for f in range(width)]
+            for row, into, linked, emitted in zip(values, received, has_links, self.emission)
+        ]
+
+    def share(self, location_id: str, faction_id: str) -> float:
+        """Faction's share (0-1) of all influence at a location"""
+        row = self.values[self.index[location_id]]
+        total = float(sum(row))
+        return float(row[self.faction_index[faction_id]]) / total if total > 0 else 0.0
+
+    def challengers(self, controllers: Dict[str, str], min_share: float) -> List[Tuple[str, str, float]]:
+        """
+        Controlled locations where another faction holds at least min_share
+        of the influence: (location_id, strongest other faction, its share)
+        """
+        owned = [(self.index[location_id], self.faction_index[faction_id])
+                 for location_id, faction_id in controllers.items()
+                 if location_id in self.index and faction_id in self.faction_index]
+        if not owned:
+            return []
+
+        found = []
+        if HAS_NUMPY:
+            rows = np.array([i for i, _ in owned], dtype=np.int64)
+            owners = np.array([f for _, f in owned], dtype=np.int64)
+            block = self.values[rows]
+            totals = block.sum(axis=1)
+            others = block.copy()
+            others[np.arange(len(rows)), owners] = -1.0
+            best = others.argmax(axis=1)
+            shares = np.divide(others[np.arange(len(rows)), best], totals,
+                               out=np.zeros(len(rows)), where=totals > 0)
+            for k in np.nonzero(shares >= min_share)[0]:
+                found.append((self.location_ids[rows[k]], self.factions[best[k]], float(shares[k])))
+        else:
+            for i, owner in owned:
+                row = self.values[i]
+                total = sum(row)
+                if total <= 0:
+                    continue
+                best = max((f for f in range(len(row)) if f != owner), key=lambda f: row[f], default=None)
+                if best is not None and row[best] / total >= min_share:
+                    found.append((self.location_ids[i], self.factions[best], row[best] / total))
+        return found
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving (influence under 0.001 is left out)"""
+        data: Dict[str, Dict[str, float]] = {}
+        for i, location_id in enumerate(self.location_ids):
+            row = self.values[i]
+            kept = {faction_id: round(float(row[f]), 3) for f, faction_id in enumerate(self.factions) if row[f] >= 0.001}
+            if kept:
+                data[location_id] = kept
+        return data
+
+    def load(self, data: Dict[str, Dict[str, float]]):
+        """Restore saved influence (locations and factions no longer present are skipped)"""
+        for location_id, row in data.items():
+            i = self.index.get(location_id)
+            if i is None:
+                continue
+            for faction_id, value in row.items():
+                f = self.faction_index.get(faction_id)
+                if f is not None:
+                    self.values[i][f] = value
@@ -0,0 +1,139 @@
+"""
+Inventory Ledger
+The player's ship cargo and station storage, with running totals kept as
+items move: cargo volume of every hold, the quantity of each item across
+all of them and where each item is stored. Capacity checks, item counts
+and storage searches read the totals instead of re-summing the holds.
+"""
+
+from typing import Dict, Optional
+
+from item_registry import ITEMS, DEFAULT_VOLUME
+
+
+def _unit_volume(item_id: str) -> float:
+    item = ITEMS.get(item_id)
+    return item.volume if item is not None else DEFAULT_VOLUME
+
+
+class InventoryLedger:
+    """
+    Ship cargo and station inventories. location_id None means the ship.
+    The holds are plain dicts so they save and display as before, but every
+    change must go through add/remove (or be followed by recount) to keep
+    the totals right.
+    """
+
+    def __init__(self, ship_cargo: Optional[Dict[str, int]] = None,
+                 station_inventories: Optional[Dict[str, Dict[str, int]]] = None):
+        self.ship_cargo: Dict[str, int] = ship_cargo if ship_cargo is not None else {}
+        self.station_inventories: Dict[str, Dict[str, int]] = (
+            station_inventories if station_inventories is not None else {})
+        self.cargo_volume = 0.0
+        self.station_volumes: Dict[str, float] = {}
+        self.item_totals: Dict[str, int] = {}  # Across the ship and every station
+        self.item_locations: Dict[str, Dict[str, int]] = {}  # item_id: {location_id: quantity} over stations
+        self.recount()
+
+    def recount(self):
+        """Rebuild every total from the holds"""
+        self.cargo_volume = self._volume_of(self.ship_cargo)
+        self.station_volumes = {location_id: self._volume_of(inventory)
+                                for location_id, inventory in self.station_inventories.items()}
+        totals = dict(self.ship_cargo)
+        locations: Dict[str, Dict[str, int]] = {}
+        for location_id, inventory in self.station_inventories.items():
+            for item_id, quantity in inventory.items():
+                totals[item_id] = totals.get(item_id, 0) + quantity
+                locations.setdefault(item_id, {})[location_id] = quantity
+        self.item_totals = totals
+        self.item_locations = locations
+
+    @staticmethod
+    def _volume_of(inventory: Dict[str, int]) -> float:
+        return round(sum(_unit_volume(item_id) * quantity for item_id, quantity in inventory.items()), 6)
+
+    def station(self, location_id: str) -> Dict[str, int]:
+        """A station's inventory (created empty on first use)"""
+        inventory = self.station_inventories.get(location_id)
+        if inventory is None:
+            inventory = self.station_inventories[location_id] = {}
+            self.station_volumes[location_id] = 0.0
+        return inventory
+
+    def hold(self, location_id: Optional[str] = None) -> Dict[str, int]:
+        """Ship cargo for None, otherwise a station's inventory"""
+        return self.ship_cargo if location_id is None else self.station(location_id)
+
+    def quantity(self, item_id: str, location_id: Optional[str] = None) -> int:
+        """Quantity of an item in one hold"""
+        if location_id is None:
+            return self.ship_cargo.get(item_id, 0)
+        inventory = self.station_inventories.get(location_id)
+        return inventory.get(item_id, 0) if inventory else 0
+
+    def total(self, item_id: str) -> int:
+        """Quantity of an item across the ship and every station"""
+        return self.item_totals.get(item_id, 0)
+
+    def locations(self, item_id: str) -> Dict[str, int]:
+        """Stations storing an item, with the quantity at each (do not modify)"""
+        return self.item_locations.get(item_id, {})
+
+    def volume(self, location_id: Optional[str] = None) -> float:
+        """Volume used in one hold"""
+        if location_id is None:
+            return self.cargo_volume
+        return self.station_volumes.get(location_id, 0.0)
+
+    def _apply(self, item_id: str, delta: int, location_id: Optional[str]):
+        volume_delta = _unit_volume(item_id) * delta
+        if location_id is None:
+            self.cargo_volume = round(self.cargo_volume + volume_delta, 6) if self.ship_cargo else 0.0
+        else:
+            inventory = self.station_inventories[location_id]
+            volume = self.station_volumes.get(location_id, 0.0) + volume_delta
+            self.station_volumes[location_id] = round(volume, 6) if inventory else 0.0
+
+            quantity = inventory.get(item_id, 0)
+            if quantity:
+                self.item_locations.setdefault(item_id, {})[location_id] = quantity
+            else:
+                held_at = self.item_locations.get(item_id)
+                if held_at is not None:
+                    held_at.pop(location_id, None)
+                    if not held_at:
+                        del self.item_locations[item_id]
+
+        total = self.item_totals.get(item_id, 0) + delta
+        if total > 0:
+            self.item_totals[item_id] = total
+        else:
+            self.item_totals.pop(item_id, None)
+
+    def add(self, item_id: str, quantity: int, location_id: Optional[str] = None):
+        """Put items in a hold (no capacity check)"""
+        if quantity <= 0:
+            return
+        inventory = self.hold(location_id)
+        inventory[item_id] = inventory.get(item_id, 0) + quantity
+        self._apply(item_id, quantity, location_id)
+
+    def remove(self, item_id: str, quantity: int, location_id: Optional[str] = None) -> bool:
+        """Take items from a hold. Returns False (and takes nothing) if it has too few."""
+        inventory = self.hold(location_id)
+        have = inventory.get(item_id, 0)
+        if quantity <= 0 or have < quantity:
+            return quantity <= 0
+        if have == quantity:
+            del inventory[item_id]
+        else:
+            inventory[item_id] = have - quantity
+        self._apply(item_id, -quantity, location_id)
+        return True
+
+    def clear(self, location_id: Optional[str] = None):
+        """Empty a hold"""
+        inventory = self.hold(location_id)
+        for item_id, quantity in list(inventory.items()):
+            self.remove(item_id, quantity, location_id)
@@ -0,0 +1,135 @@
+"""
+Item Registry
+One compact record per item id across every catalog (resources,
+commodities, modules, module and ship components, ships), built once
+when the catalogs load. Lookups that used to walk the catalogs one after
+another - names, prices, cargo volumes, item kinds - are a single dict
+access.
+"""
+
+from typing import Dict, Optional
+
+from data import (
+    RESOURCES, RAW_RESOURCES, COMMODITIES, MODULES, MODULE_COMPONENTS,
+    SHIP_COMPONENTS, COMPONENT_RECIPES, VESSEL_CLASSES
+)
+
+# Cargo volume of a ship by class, multiplied by its tier
+SHIP_CLASS_VOLUMES = {
+    'scout': 500,
+    'fighter': 600,
+    'hauler': 800,
+    'cruiser': 1000,
+    'destroyer': 1500,
+    'battleship': 2500,
+    'carrier': 2000,
+    'refinery': 1800
+}
+
+# Cargo volume of a module by type, multiplied by its tier
+MODULE_TYPE_VOLUMES = {
+    'weapon': 15,
+    'defense': 20,
+    'utility': 10,
+    'engine': 25
+}
+
+DEFAULT_VOLUME = 1.0  # Items without a cargo volume rule
+DEFAULT_COMPONENT_VOLUME = 10.0  # Ship components without a volume or recipe
+
+
+class ItemRecord:
+    """Metadata of one item id"""
+
+    __slots__ = ("item_id", "kind", "name", "base_price", "volume", "rarity", "tier", "category")
+
+    def __init__(self, item_id: str, kind: str, name: str, base_price: int, volume: float,
+                 rarity: Optional[str] = None, tier: Optional[int] = None, category: Optional[str] = None):
+        self.item_id = item_id
+        self.kind = kind  # "resource", "commodity", "module", "module_component", "ship_component" or "ship"
+        self.name = name
+        self.base_price = base_price  # Catalog price (base_price, or cost for equipment)
+        self.volume = volume  # Cargo volume per unit
+        self.rarity = rarity
+        self.tier = tier
+        self.category = category
+
+    def __repr__(self) -> str:
+        return f"ItemRecord({self.item_id!r}, {self.kind!r})"
+
+
+def _ship_component_volume(component_id: str, component: Dict) -> float:
+    """Set volume, else 125% of the volume of the materials it is made from"""
+    if 'volume' in component:
+        return component['volume']
+    if component_id in COMPONENT_RECIPES:
+        materials = COMPONENT_RECIPES[component_id].get('materials', {})
+        return sum(RESOURCES[mat_id]['volume'] * qty for mat_id, qty in materials.items() if mat_id in RESOURCES) * 1.25
+    return DEFAULT_COMPONENT_VOLUME
+
+
+def build_registry() -> Dict[str, ItemRecord]:
+    """
+    Records for every catalog item. Cargo volumes follow the rules cargo has
+    always used: resources, ship components, ships and modules have their
+    own volumes; commodities and module components count DEFAULT_VOLUME.
+    """
+    items: Dict[str, ItemRecord] = {}
+
+    for resource_id, resource in RESOURCES.items():
+        items[resource_id] = ItemRecord(
+            resource_id, "resource", resource["name"], resource["base_price"], resource.get('volume', 1.0),
+            resource.get("rarity"), resource.get("mining_tier"),
+            "raw" if resource_id in RAW_RESOURCES else "refined")
+
+    for commodity_id, commodity in COMMODITIES.items():
+        items[commodity_id] = ItemRecord(
+            commodity_id, "commodity", commodity["name"], commodity["base_price"], DEFAULT_VOLUME,
+            category=commodity.get("category"))
+
+    for module_id, module in MODULES.items():
+        tier = module.get('tier', 1)
+        items[module_id] = ItemRecord(
+            module_id, "module", module["name"], module.get("cost", 1000),
+            MODULE_TYPE_VOLUMES.get(module.get('type', 'utility'), 10) * tier,
+            tier=tier, category=module.get("type"))
+
+    for component_id, component in MODULE_COMPONENTS.items():
+        items[component_id] = ItemRecord(
+            component_id, "module_component", component.get("name", component_id), component.get("cost", 0),
+            DEFAULT_VOLUME, tier=component.get("tier"), category=component.get("type"))
+
+    for component_id, component in SHIP_COMPONENTS.items():
+        items[component_id] = ItemRecord(
+            component_id, "ship_component", component.get("name", component_id), component.get("cost", 0),
+            _ship_component_volume(component_id, component), tier=component.get("tier"),
+            category=component.get("type"))
+
+    for ship_id, ship in VESSEL_CLASSES.items():
+        tier = ship.get('tier_num', 1)
+        items[ship_id] = ItemRecord(
+            ship_id, "ship", ship.get("name", ship_id), ship.get("cost", 0),
+            SHIP_CLASS_VOLUMES.get(ship.get('class_type', 'scout'), 500) * tier,
+            tier=tier, category=ship.get("class_type"))
+
+    return items
+
+
+ITEMS: Dict[str, ItemRecord] = build_registry()
+
+
+def rebuild_registry():
+    """Rebuild every record (after catalog entries are added or edited)"""
+    ITEMS.clear()
+    ITEMS.update(build_registry())
+
+
+def get_item(item_id: str) -> Optional[ItemRecord]:
+    """Record for an item id, or None if no catalog has it"""
+    return ITEMS.get(item_id)
+
+
+def get_item_name(item_id: str) -> str:
+    """Display name of any item (the id itself if unknown)"""
+    item = ITEMS.get(item_id)
+    return item.name if item is not None else item_id
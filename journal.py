@@ -0,0 +1,104 @@
+"""
+Command Journal
+Append-only log of engine commands for crash recovery.
+Each line is one JSON record: the command, its arguments, the game clocks
+when it ran and the raw random draws it consumed, so replaying it on top
+of the last checkpoint reproduces the same outcome.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class CommandJournal:
+    """Append-only journal of the commands issued in one game"""
+
+    def __init__(self, game_id: str, filename: str, start_seq: int = 0):
+        """start_seq: sequence already covered by the loaded save - numbering continues after it"""
+        self.game_id = game_id
+        self.filename = filename
+        self.lock = threading.Lock()  # Appends happen on the game thread, compaction in the background
+        self.last_seq = start_seq
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        for record in read_journal(filename):
+            if record.get("game") == game_id:
+                self.last_seq = max(self.last_seq, record.get("seq", 0))
+
+    def append(self, command: str, args: tuple = (), kwargs: Optional[Dict] = None,
+               clock: Optional[Dict] = None, rng: Optional[Dict] = None) -> int:
+        """Append a command record and flush it to disk. Returns its sequence number."""
+        with self.lock:
+            self.last_seq += 1
+            record = {
+                "game": self.game_id,
+                "seq": self.last_seq,
+                "command": command,
+                "args": list(args),
+                "kwargs": dict(kwargs or {}),
+                "clock": clock or {},
+                "rng": rng or {}
+            }
+            with open(self.filename, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return self.last_seq
+
+    def records(self) -> List[Dict]:
+        """Records for this game, in order"""
+        with self.lock:
+            return [r for r in read_journal(self.filename) if r.get("game") == self.game_id]
+
+    def reset(self):
+        """Drop every record (including other games') and start a new sequence"""
+        with self.lock:
+            self.last_seq = 0
+            self._rewrite([])
+
+    def truncate_through(self, seq: int):
+        """Drop records already covered by a checkpoint taken at seq"""
+        with self.lock:
+            keep = [r for r in read_journal(self.filename)
+                    if r.get("game") == self.game_id and r.get("seq", 0) > seq]
+            self._rewrite(keep)
+
+    def discard(self):
+        """Delete the journal file"""
+        with self.lock:
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+
+    def _rewrite(self, records: List[Dict]):
+        """Atomically replace the journal file"""
+        temp_file = self.filename + ".tmp"
+        with open(temp_file, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.filename)
+
+
+def read_journal(filename: str) -> List[Dict]:
+    """
+    Read all records from a journal file.
+    A torn final line (crash mid-write) is ignored.
+    """
+    if not os.path.exists(filename):
+        return []
+
+    records = []
+    with open(filename, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
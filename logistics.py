@@ -0,0 +1,154 @@
+"""
+Logistics
+Plans for moving stored items between stations. The consolidation planner
+gathers a recipe's inputs at one manufacturing station: it picks the
+fewest stations to collect from (greedy set cover over the inventory
+ledger's item locations), orders the pickups along shortest travel routes
+and chooses the target station needing the fewest trips.
+"""
+
+import heapq
+import math
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data import LOCATIONS
+from travel_system import get_travel_distance
+from inventory_ledger import InventoryLedger
+from volume_system import get_item_volume
+
+
+@lru_cache(maxsize=None)
+def _distances_from(origin: str) -> Dict[str, float]:
+    """Shortest travel distance from origin to every reachable location (Dijkstra)"""
+    distances = {origin: 0.0}
+    queue = [(0.0, origin)]
+    while queue:
+        distance, location_id = heapq.heappop(queue)
+        if distance > distances[location_id]:
+            continue
+        for neighbour in LOCATIONS[location_id].get("connections", []):
+            if neighbour not in LOCATIONS:
+                continue
+            candidate = distance + get_travel_distance(location_id, neighbour)
+            if candidate < distances.get(neighbour, math.inf):
+                distances[neighbour] = candidate
+                heapq.heappush(queue, (candidate, neighbour))
+    return distances
+
+
+def route_distance(location_a: str, location_b: str) -> float:
+    """Shortest travel distance between two locations (inf if unreachable)"""
+    return _distances_from(location_a).get(location_b, math.inf)
+
+
+def manufacturing_stations() -> List[str]:
+    """Locations with a manufacturing facility"""
+    return [location_id for location_id, location in LOCATIONS.items()
+            if "manufacturing" in location.get("services", [])]
+
+
+def _order_pickups(origin: str, target: str, pickups: Iterable[str]) -> Tuple[List[str], float]:
+    """Visit pickups nearest-first from origin, then go to target. Returns (stops, distance)."""
+    remaining = set(pickups)
+    route, distance, here = [], 0.0, origin
+    while remaining:
+        nearest = min(remaining, key=lambda location_id: (route_distance(here, location_id), location_id))
+        distance += route_distance(here, nearest)
+        route.append(nearest)
+        remaining.discard(nearest)
+        here = nearest
+    return route, distance + route_distance(here, target)
+
+
+def _plan_for_target(ledger: InventoryLedger, shortfall: Dict[str, int], origin: str, target: str,
+                     free_capacity: float) -> Optional[Dict]:
+    """Pickups that cover shortfall for delivery to target, or None if it cannot be covered"""
+    remaining = {}
+    for item_id, quantity in shortfall.items():
+        short = quantity - ledger.quantity(item_id, target)
+        if short > 0:
+            remaining[item_id] = short
+
+    # Stock at every other station that holds something still needed
+    stock: Dict[str, Dict[str, int]] = {}
+    for item_id in remaining:
+        for location_id, quantity in ledger.locations(item_id).items():
+            if location_id != target:
+                stock.setdefault(location_id, {})[item_id] = quantity
+
+    pickups: Dict[str, Dict[str, int]] = {}
+    while remaining:
+        best, best_key = None, None
+        for location_id, held in stock.items():
+            covered = sum(min(quantity, remaining[item_id]) for item_id, quantity in held.items()
+                          if item_id in remaining)
+            if covered <= 0:
+                continue
+            key = (covered, -route_distance(location_id, target))
+            if best_key is None or key > best_key:
+                best, best_key = location_id, key
+        if best is None:
+            return None
+
+        taken = {}
+        for item_id, quantity in stock.pop(best).items():
+            if item_id in remaining:
+                take = min(quantity, remaining[item_id])
+                taken[item_id] = take
+                remaining[item_id] -= take
+                if not remaining[item_id]:
+                    del remaining[item_id]
+        pickups[best] = taken
+
+    route, distance = _order_pickups(origin, target, pickups)
+    if math.isinf(distance):
+        return None
+
+    volume = sum(get_item_volume(item_id) * quantity for taken in pickups.values() for item_id, quantity in taken.items())
+    if volume > 0 and free_capacity <= 0:
+        return None
+    trips = math.ceil(volume / free_capacity) if volume > 0 else 0
+
+    return {
+        "target": target,
+        "stops": [{"location_id": location_id, "items": pickups[location_id]} for location_id in route],
+        "distance": distance,
+        "volume": volume,
+        "trips": trips
+    }
+
+
+def plan_consolidation(ledger: InventoryLedger, requirements: Dict[str, int], origin: str,
+                       free_capacity: float, targets: Optional[Iterable[str]] = None) -> Tuple[bool, object]:
+    """
+    Plan gathering requirements (item_id -> quantity) at one station. Ship
+    cargo counts towards the requirements wherever the ship goes. Targets
+    default to every manufacturing station; the plan with the fewest trips,
+    then fewest stops, then shortest distance wins.
+    Returns: (success, plan dict or error message)
+    """
+    shortfall = {}
+    missing = []
+    for item_id, quantity in requirements.items():
+        short = quantity - ledger.quantity(item_id)
+        if short <= 0:
+            continue
+        if ledger.total(item_id) < quantity:
+            missing.append(f"{item_id}: {ledger.total(item_id)}/{quantity}")
+        shortfall[item_id] = short
+    if missing:
+        return False, f"Not enough in storage anywhere: {', '.join(missing)}"
+
+    best, best_key = None, None
+    for target in (targets if targets is not None else manufacturing_stations()):
+        plan = _plan_for_target(ledger, shortfall, origin, target, free_capacity)
+        if plan is None:
+            continue
+        key = (plan["trips"], len(plan["stops"]), plan["distance"])
+        if best_key is None or key < best_key:
+            best, best_key = plan, key
+
+    if best is None:
+        return False, "No station can gather these items (check cargo space and routes)"
+    return True, best
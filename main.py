@@ -5,9 +5,11 @@ Main entry point
 """
 
 import sys
+from typing import Optional
 from game_engine import GameEngine
 from ui import GameUI
-from save_system import save_exists
+from save_system import list_save_slots
+from universe import prepare_universe
 from config import GAME_NAME, VERSION
 
 
@@ -27,18 +29,39 @@ def print_title():
     print(title)
 
 
-def main_menu() -> str:
+def format_save_slot(slot: dict) -> str:
+    """One-line description of a save slot from its header"""
+    if slot.get("recovery"):
+        return f"{slot['commander']} - unsaved game (recoverable)"
+
+    hours, remainder = divmod(int(slot.get("play_time", 0)), 3600)
+    return (f"{slot['commander']} - {slot['location_name']} - "
+            f"{slot['credits']:,} CR - {hours}h {remainder // 60:02d}m played")
+
+
+def choose_save_slot(slots: list) -> Optional[str]:
+    """Let the player pick a save slot. Returns its path."""
+    print("\n=== LOAD GAME ===\n")
+    for i, slot in enumerate(slots, 1):
+        print(f"{i}. {format_save_slot(slot)}")
+
+    choice = input("\nSelect save: ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(slots):
+        return slots[int(choice) - 1]["path"]
+    return None
+
+
+def main_menu(slots: list) -> str:
     """Show main menu and get choice"""
     print("\n=== MAIN MENU ===\n")
 
-    has_save = save_exists()
-
-    if has_save:
-        print("1. Continue Game")
-        print("2. New Game")
-        print("3. Exit")
+    if slots:
+        print(f"1. Continue Game ({format_save_slot(slots[0])})")
+        print("2. Load Game")
+        print("3. New Game")
+        print("4. Exit")
         choice = input("\nSelect option: ").strip()
-        return choice
+        return {"1": "1", "2": "4", "3": "2", "4": "3"}.get(choice, choice)
     else:
         print("1. New Game")
         print("2. Exit")
@@ -85,12 +108,22 @@ def main():
 
     engine = GameEngine()
 
-    # Main menu
-    choice = main_menu()
+    # Main menu (slot listing reads only the save headers)
+    slots = list_save_slots()
+    choice = main_menu(slots)
+
+    save_path = None
+    if choice == "4":
+        save_path = choose_save_slot(slots)
+        if not save_path:
+            print("Invalid choice")
+            return
+        choice = "1"
 
     if choice == "1":
         # Continue game
-        if engine.load_saved_game():
+        if engine.load_saved_game(save_path):
+            engine.enable_journal()
             ui = GameUI(engine)
             game_loop(engine, ui)
         else:
@@ -100,12 +133,16 @@ def main():
     elif choice == "2":
         # New game
         print("\n=== NEW GAME ===\n")
+        # Build the starting universe before the name prompt - this only moves
+        # the build cost earlier, so new_game just clones the template
+        prepare_universe()
         player_name = input("Enter your commander name: ").strip()
 
         if not player_name:
             player_name = "Commander"
 
         engine.new_game(player_name)
+        engine.enable_journal()
         ui = GameUI(engine)
         game_loop(engine, ui)
 
@@ -118,6 +155,8 @@ def main():
         print("Invalid choice")
         return
 
+    engine.close_journal()
+
     print("\n" + "=" * 60)
     print("Thank you for playing Void Dominion!")
     print("=" * 60 + "\n")
@@ -3,26 +3,34 @@ Manufacturing System
 Handles crafting modules, ship components, and complete ships from resources
 """
 
+import heapq
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from data import (
     MODULES, RESOURCES, MANUFACTURING_RECIPES,
     SHIP_COMPONENTS, COMPONENT_RECIPES,
     MODULE_COMPONENTS, MODULE_COMPONENT_RECIPES,
     VESSEL_CLASSES, SHIP_RECIPES
 )
+from item_registry import ITEMS, get_item_name
+
+# Item kinds made on production lines
+MANUFACTURED_KINDS = ("module", "module_component", "ship_component", "ship")
 
 
 class ManufacturingJob:
     """Represents an active manufacturing job"""
 
-    def __init__(self, item_id: str, quantity: int, duration: float, item_type: str = "module"):
+    def __init__(self, item_id: str, quantity: int, duration: float, item_type: str = "module",
+                 plan_id: Optional[int] = None, step: Optional[int] = None):
         self.item_id = item_id
         self.quantity = quantity
         self.duration = duration
         self.item_type = item_type  # "module", "module_component", "ship_component", or "ship"
         self.start_time = time.time()
         self.completed = 0
+        self.plan_id = plan_id  # Production plan this job belongs to (None for a single craft)
+        self.step = step  # Index of the plan step the job runs
 
     def get_progress(self) -> float:
         """Get progress percentage (0-100)"""
@@ -48,6 +56,8 @@ class ManufacturingJob:
             "item_type": self.item_type,
             "start_time": self.start_time,
             "completed": self.completed,
+            "plan_id": self.plan_id,
+            "step": self.step,
             # Backwards compatibility
             "module_id": self.item_id
         }
@@ -58,42 +68,185 @@ class ManufacturingJob:
         # Backwards compatibility - check for old "module_id" key
         item_id = data.get("item_id", data.get("module_id"))
         item_type = data.get("item_type", "module")
-        job = cls(item_id, data["quantity"], data["duration"], item_type)
+        job = cls(item_id, data["quantity"], data["duration"], item_type,
+                  data.get("plan_id"), data.get("step"))
         job.start_time = data["start_time"]
         job.completed = data.get("completed", 0)
         return job
 
 
+class ProductionStep:
+    """One batch of a production plan, run as a single job on a production line"""
+
+    __slots__ = ("item_id", "quantity", "item_type", "depends_on", "priority", "state")
+
+    def __init__(self, item_id: str, quantity: int, item_type: str, depends_on: List[int],
+                 priority: float = 0.0, state: str = "pending"):
+        self.item_id = item_id
+        self.quantity = quantity
+        self.item_type = item_type
+        self.depends_on = depends_on  # Steps whose output this step consumes
+        self.priority = priority  # Longest run of work from this step to the plan's target
+        self.state = state  # "pending", "running" or "done"
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "item_id": self.item_id,
+            "quantity": self.quantity,
+            "item_type": self.item_type,
+            "depends_on": self.depends_on,
+            "priority": self.priority,
+            "state": self.state
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProductionStep':
+        """Create from dictionary"""
+        return cls(data["item_id"], data["quantity"], data["item_type"], data["depends_on"],
+                   data.get("priority", 0.0), data.get("state", "pending"))
+
+
+class ProductionPlan:
+    """
+    A target item expanded into its bill of materials. Inputs are reserved
+    into the plan's stock when it is created; each step takes its inputs
+    from that stock when it starts and puts its output back when it
+    finishes, so sub-builds never pass through the cargo hold.
+    """
+
+    def __init__(self, plan_id: int, target_id: str, quantity: int,
+                 steps: List[ProductionStep], stock: Dict[str, int]):
+        self.plan_id = plan_id
+        self.target_id = target_id
+        self.quantity = quantity
+        self.steps = steps
+        self.stock = stock  # Reserved inputs and finished sub-builds
+
+    def ready_steps(self) -> List[int]:
+        """Pending steps whose inputs have all been built"""
+        steps = self.steps
+        return [index for index, step in enumerate(steps)
+                if step.state == "pending" and all(steps[d].state == "done" for d in step.depends_on)]
+
+    def is_complete(self) -> bool:
+        return all(step.state == "done" for step in self.steps)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "plan_id": self.plan_id,
+            "target_id": self.target_id,
+            "quantity": self.quantity,
+            "steps": [step.to_dict() for step in self.steps],
+            "stock": self.stock
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProductionPlan':
+        """Create from dictionary"""
+        return cls(data["plan_id"], data["target_id"], data["quantity"],
+                   [ProductionStep.from_dict(step) for step in data.get("steps", [])],
+                   data.get("stock", {}))
+
+
+def recipe_inputs(recipe: Dict) -> Dict[str, int]:
+    """Materials and components a recipe consumes per unit"""
+    inputs = dict(recipe.get("materials", {}))
+    for component_id, quantity in recipe.get("components", {}).items():
+        inputs[component_id] = inputs.get(component_id, 0) + quantity
+    return inputs
+
+
+class RecipeIndex:
+    """
+    How many of each recipe can be built from an inventory. Counts are
+    kept per recipe and refreshed only for recipes whose inputs changed
+    since the last sync, so rendering the manufacturing view is a lookup.
+    Full bill-of-materials expansions down to raw inputs are memoized.
+    """
+
+    def __init__(self):
+        # Same precedence as ManufacturingManager.get_recipe
+        self.recipes: Dict[str, Dict] = {}
+        for catalog in (SHIP_RECIPES, COMPONENT_RECIPES, MODULE_COMPONENT_RECIPES, MANUFACTURING_RECIPES):
+            self.recipes.update(catalog)
+
+        self.inputs = {item_id: recipe_inputs(recipe) for item_id, recipe in self.recipes.items()}
+        self.used_by: Dict[str, List[str]] = {}
+        for item_id, inputs in self.inputs.items():
+            for input_id in inputs:
+                self.used_by.setdefault(input_id, []).append(item_id)
+
+        self._raw_boms: Dict[str, Dict[str, int]] = {}
+        self.counts: Dict[str, int] = {}  # Inventory as of the last sync
+        self.craftable: Dict[str, int] = {item_id: 0 for item_id in self.recipes}
+
+    def raw_bill_of_materials(self, item_id: str) -> Dict[str, int]:
+        """Raw inputs (items without a recipe) consumed building one item from scratch"""
+        bom = self._raw_boms.get(item_id)
+        if bom is not None:
+            return bom
+
+        inputs = self.inputs.get(item_id)
+        if inputs is None:
+            bom = {item_id: 1}
+        else:
+            self._raw_boms[item_id] = {}  # Guards against recipe cycles
+            bom = {}
+            for input_id, quantity in inputs.items():
+                for raw_id, raw_quantity in self.raw_bill_of_materials(input_id).items():
+                    bom[raw_id] = bom.get(raw_id, 0) + raw_quantity * quantity
+        self._raw_boms[item_id] = bom
+        return bom
+
+    def sync(self, inventory: Dict[str, int]):
+        """Bring counts up to date with inventory, recounting only affected recipes"""
+        changed = [item_id for item_id, quantity in inventory.items() if self.counts.get(item_id) != quantity]
+        changed.extend(item_id for item_id in self.counts if item_id not in inventory)
+        if not changed:
+            return
+
+        self.counts = dict(inventory)
+        stale = {recipe_id for item_id in changed for recipe_id in self.used_by.get(item_id, ())}
+        for recipe_id in stale:
+            self.craftable[recipe_id] = self._count(self.inputs[recipe_id])
+
+    def _count(self, requirements: Dict[str, int]) -> int:
+        counts = self.counts
+        return min((counts.get(item_id, 0) // quantity for item_id, quantity in requirements.items() if quantity > 0),
+                   default=0)
+
+    def craftable_now(self, item_id: str) -> int:
+        """Units of item_id its direct inputs on hand are enough for"""
+        return self.craftable.get(item_id, 0)
+
+    def buildable_from_raw(self, item_id: str) -> int:
+        """Units of item_id the raw inputs on hand are enough for, building every sub-component"""
+        if item_id not in self.recipes:
+            return 0
+        return self._count(self.raw_bill_of_materials(item_id))
+
+
 class ManufacturingManager:
     """Manages manufacturing operations"""
 
     def __init__(self):
         self.active_jobs: List[ManufacturingJob] = []
+        self.plans: List[ProductionPlan] = []
+        self.next_plan_id = 1
+        self.recipe_index = RecipeIndex()
 
     def detect_item_type(self, item_id: str) -> Optional[str]:
-        """Detect what type of item this is"""
-        if item_id in MODULES:
-            return "module"
-        elif item_id in MODULE_COMPONENTS:
-            return "module_component"
-        elif item_id in SHIP_COMPONENTS:
-            return "ship_component"
-        elif item_id in VESSEL_CLASSES:
-            return "ship"
+        """Detect what type of item this is (None for anything that is not manufactured)"""
+        item = ITEMS.get(item_id)
+        if item is not None and item.kind in MANUFACTURED_KINDS:
+            return item.kind
         return None
 
     def get_item_name(self, item_id: str) -> str:
         """Get display name for any item"""
-        item_type = self.detect_item_type(item_id)
-        if item_type == "module":
-            return MODULES[item_id].get("name", item_id)
-        elif item_type == "module_component":
-            return MODULE_COMPONENTS[item_id].get("name", item_id)
-        elif item_type == "ship_component":
-            return SHIP_COMPONENTS[item_id].get("name", item_id)
-        elif item_type == "ship":
-            return VESSEL_CLASSES[item_id].get("name", item_id)
-        return item_id
+        return get_item_name(item_id)
 
     def can_manufacture(self, item_id: str, location_services: List[str]) -> bool:
         """Check if player can manufacture at current location"""
@@ -115,16 +268,10 @@ class ManufacturingManager:
             return SHIP_RECIPES[item_id]
         return None
 
-    def check_requirements(
-        self,
-        item_id: str,
-        player_inventory: Dict[str, int],
-        player_level: int,
-        skill_level: int
-    ) -> Tuple[bool, str]:
+    def check_unlocked(self, item_id: str, player_level: int, skill_level: int) -> Tuple[bool, str]:
         """
-        Check if player meets requirements to manufacture
-        Returns: (can_manufacture, message)
+        Check level, recipe and skill requirements (not materials)
+        Returns: (unlocked, message)
         """
         item_type = self.detect_item_type(item_id)
         if not item_type:
@@ -168,6 +315,25 @@ class ManufacturingManager:
                 f"Look for '{skill_name}' in the Industrial skills category."
             )
 
+        return True, "Unlocked"
+
+    def check_requirements(
+        self,
+        item_id: str,
+        player_inventory: Dict[str, int],
+        player_level: int,
+        skill_level: int
+    ) -> Tuple[bool, str]:
+        """
+        Check if player meets requirements to manufacture
+        Returns: (can_manufacture, message)
+        """
+        can_make, msg = self.check_unlocked(item_id, player_level, skill_level)
+        if not can_make:
+            return False, msg
+
+        recipe = self.get_recipe(item_id)
+
         # Check materials (for modules and components)
         if "materials" in recipe:
             required_materials = recipe["materials"]
@@ -233,7 +399,8 @@ class ManufacturingManager:
         player_level: int,
         skill_level: int,
         skill_bonus: float,
-        remove_items_func
+        remove_items_func,
+        lines: int = 1
     ) -> Tuple[bool, str]:
         """
         Start a manufacturing job
@@ -249,9 +416,9 @@ class ManufacturingManager:
         if not can_make:
             return False, msg
 
-        # Check if already manufacturing
-        if len(self.active_jobs) >= 1:  # Limit to 1 job at a time for now
-            return False, "Already manufacturing. Complete current job first."
+        # Check for a free production line
+        if len(self.active_jobs) >= lines:
+            return False, f"All {lines} production line(s) busy. Wait for a job to finish."
 
         recipe = self.get_recipe(item_id)
 
@@ -277,18 +444,242 @@ class ManufacturingManager:
         item_name = self.get_item_name(item_id)
         return True, f"Started manufacturing {quantity}x {item_name} (ETA: {int(duration)}s)"
 
+    def expand_bill_of_materials(
+        self,
+        item_id: str,
+        quantity: int,
+        player_inventory: Dict[str, int]
+    ) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+        """
+        Expand item_id down its recipe DAG to raw materials. Items already in
+        the inventory are used before more are built (the target itself is
+        always built).
+        Returns: (builds, consumed, missing) - quantity to build per item in
+        topological order (target first), quantity taken from the inventory,
+        and quantity short of items that cannot be built
+        """
+        inputs_of = self.recipe_index.inputs
+        order = []
+        visiting, visited = set(), set()
+
+        def visit(node: str):
+            if node in visited:
+                return
+            if node in visiting:
+                raise ValueError(f"Recipe cycle through {node}")
+            visiting.add(node)
+            for input_id in inputs_of.get(node, ()):
+                visit(input_id)
+            visiting.discard(node)
+            visited.add(node)
+            order.append(node)
+
+        visit(item_id)
+        order.reverse()
+
+        need = {item_id: quantity}
+        builds, consumed, missing = {}, {}, {}
+        for node in order:
+            required = need.get(node, 0)
+            if required <= 0:
+                continue
+            used = 0 if node == item_id else min(required, player_inventory.get(node, 0))
+            if used:
+                consumed[node] = used
+            short = required - used
+            if not short:
+                continue
+
+            inputs = inputs_of.get(node)
+            if inputs is None:
+                missing[node] = short
+                continue
+            builds[node] = short
+            for input_id, per_unit in inputs.items():
+                need[input_id] = need.get(input_id, 0) + per_unit * short
+
+        return builds, consumed, missing
+
+    def _build_steps(
+        self,
+        builds: Dict[str, int],
+        lines: int,
+        skill_for: Callable[[str], Tuple[int, float]]
+    ) -> Tuple[List[ProductionStep], List[float]]:
+        """
+        Split each build into up to one batch per line and link every batch to
+        the batches of its inputs. A step's priority is the longest chain of
+        work from it to the target, so scheduling by priority runs the
+        critical path first (longest-path list scheduling).
+        Returns: (steps, estimated duration per step)
+        """
+        steps: List[ProductionStep] = []
+        batches_of: Dict[str, List[int]] = {}
+
+        # Inputs before the items that use them
+        for item_id, total in reversed(list(builds.items())):
+            item_type = self.detect_item_type(item_id)
+            recipe = self.get_recipe(item_id)
+            depends_on = [index for input_id in recipe_inputs(recipe)
+                          for index in batches_of.get(input_id, [])]
+
+            batch_count = min(total, max(1, lines))
+            base, extra = divmod(total, batch_count)
+            first = len(steps)
+            for batch in range(batch_count):
+                steps.append(ProductionStep(item_id, base + (1 if batch < extra else 0), item_type, depends_on))
+            batches_of[item_id] = list(range(first, len(steps)))
+
+        durations = [self.calculate_manufacturing_time(step.item_id, step.quantity, *skill_for(step.item_type))
+                     for step in steps]
+
+        dependents: List[List[int]] = [[] for _ in steps]
+        for index, step in enumerate(steps):
+            for dependency in step.depends_on:
+                dependents[dependency].append(index)
+
+        # Dependents always come later in the list
+        for index in range(len(steps) - 1, -1, -1):
+            steps[index].priority = durations[index] + max(
+                (steps[d].priority for d in dependents[index]), default=0.0)
+
+        return steps, durations
+
+    @staticmethod
+    def estimate_makespan(steps: List[ProductionStep], durations: List[float], lines: int) -> float:
+        """Seconds to run every step on the given lines, highest priority first"""
+        lines = max(1, lines)
+        pending = set(range(len(steps)))
+        done = set()
+        running: List[Tuple[float, int]] = []
+        now = 0.0
+
+        while pending or running:
+            ready = sorted((i for i in pending if all(d in done for d in steps[i].depends_on)),
+                           key=lambda i: -steps[i].priority)
+            for index in ready[:lines - len(running)]:
+                pending.discard(index)
+                heapq.heappush(running, (now + durations[index], index))
+            if not running:
+                break  # Unreachable steps
+            now, index = heapq.heappop(running)
+            done.add(index)
+
+        return now
+
+    def plan_production(
+        self,
+        item_id: str,
+        quantity: int,
+        player_inventory: Dict[str, int],
+        player_level: int,
+        skill_for: Callable[[str], Tuple[int, float]],
+        remove_items_func,
+        lines: int
+    ) -> Tuple[bool, str]:
+        """
+        Build item_id from whatever is in the inventory, making every missing
+        sub-component along the way. skill_for(item_type) returns the
+        (skill_level, skill_bonus) used for that kind of item.
+        Returns: (success, message)
+        """
+        if not self.detect_item_type(item_id):
+            return False, "Invalid item"
+        if quantity < 1:
+            return False, "Quantity must be at least 1"
+
+        try:
+            builds, consumed, missing = self.expand_bill_of_materials(item_id, quantity, player_inventory)
+        except ValueError as e:
+            return False, str(e)
+
+        for build_id in builds:
+            unlocked, msg = self.check_unlocked(build_id, player_level,
+                                                skill_for(self.detect_item_type(build_id))[0])
+            if not unlocked:
+                return False, f"{self.get_item_name(build_id)}: {msg}"
+
+        if missing:
+            shortages = []
+            for missing_id, short in missing.items():
+                name = self.get_item_name(missing_id)
+                have = player_inventory.get(missing_id, 0)
+                shortages.append(f"{name}: {have}/{have + short}")
+            return False, f"Missing materials: {', '.join(shortages)}"
+
+        # Reserve every input the plan takes from the inventory
+        for input_id, used in consumed.items():
+            remove_items_func(input_id, used)
+
+        steps, durations = self._build_steps(builds, lines, skill_for)
+        plan = ProductionPlan(self.next_plan_id, item_id, quantity, steps, dict(consumed))
+        self.next_plan_id += 1
+        self.plans.append(plan)
+
+        makespan = self.estimate_makespan(steps, durations, lines)
+        started = self.dispatch(lines, skill_for)
+
+        return True, (
+            f"Planned {quantity}x {self.get_item_name(item_id)}: {len(steps)} job(s) across {lines} "
+            f"production line(s), {started} started (ETA: {int(makespan)}s)"
+        )
+
+    def dispatch(self, lines: int, skill_for: Callable[[str], Tuple[int, float]]) -> int:
+        """
+        Start ready plan steps on free production lines, highest priority
+        first. Each step takes its inputs from its plan's stock as it starts.
+        Returns: number of jobs started
+        """
+        started = 0
+        while len(self.active_jobs) < lines:
+            best = None
+            for plan in self.plans:
+                for index in plan.ready_steps():
+                    if best is None or plan.steps[index].priority > best[0].steps[best[1]].priority:
+                        best = (plan, index)
+            if best is None:
+                break
+
+            plan, index = best
+            step = plan.steps[index]
+            for input_id, per_unit in recipe_inputs(self.get_recipe(step.item_id)).items():
+                remaining = plan.stock.get(input_id, 0) - per_unit * step.quantity
+                if remaining > 0:
+                    plan.stock[input_id] = remaining
+                else:
+                    plan.stock.pop(input_id, None)
+            step.state = "running"
+
+            duration = self.calculate_manufacturing_time(step.item_id, step.quantity, *skill_for(step.item_type))
+            self.active_jobs.append(ManufacturingJob(step.item_id, step.quantity, duration, step.item_type,
+                                                     plan.plan_id, index))
+            started += 1
+
+        return started
+
     def check_completed_jobs(self) -> List[Tuple[str, int, str]]:
         """
         Check for completed jobs and return completed items
         Returns: List of (item_id, quantity, item_type) tuples
         """
         completed = []
+        plans = {plan.plan_id: plan for plan in self.plans}
 
         for job in self.active_jobs[:]:
             if job.is_complete():
-                completed.append((job.item_id, job.quantity, job.item_type))
                 self.active_jobs.remove(job)
-
+                plan = plans.get(job.plan_id)
+                if plan is None:
+                    completed.append((job.item_id, job.quantity, job.item_type))
+                    continue
+
+                plan.steps[job.step].state = "done"
+                if job.item_id == plan.target_id:
+                    completed.append((job.item_id, job.quantity, job.item_type))
+                else:
+                    plan.stock[job.item_id] = plan.stock.get(job.item_id, 0) + job.quantity
+
+        self.plans = [plan for plan in self.plans if not plan.is_complete()]
         return completed
 
     def get_active_job(self) -> Optional[ManufacturingJob]:
@@ -302,7 +693,22 @@ class ManufacturingManager:
         job = self.get_active_job()
         if not job:
             return None
-
+        return self._job_progress(job)
+
+    def get_jobs_progress(self) -> List[Dict]:
+        """Get progress of the job on every busy production line"""
+        return [self._job_progress(job) for job in self.active_jobs]
+
+    def get_plans_status(self) -> List[Dict]:
+        """Production plans still running, for display"""
+        return [{
+            "item_name": self.get_item_name(plan.target_id),
+            "quantity": plan.quantity,
+            "steps_done": sum(1 for step in plan.steps if step.state == "done"),
+            "steps_total": len(plan.steps)
+        } for plan in self.plans]
+
+    def _job_progress(self, job: ManufacturingJob) -> Dict:
         item_name = self.get_item_name(job.item_id)
 
         return {
@@ -317,22 +723,47 @@ class ManufacturingManager:
             "module_id": job.item_id
         }
 
-    def cancel_job(self) -> Tuple[bool, str]:
-        """Cancel active manufacturing job (loses materials)"""
-        if not self.active_jobs:
-            return False, "No active manufacturing job"
-
-        job = self.active_jobs[0]
-        item_name = self.get_item_name(job.item_id)
-
-        self.active_jobs.clear()
-
-        return True, f"Cancelled manufacturing of {job.quantity}x {item_name}"
+    def cancel_job(self, index: int, add_items_func) -> Tuple[bool, str]:
+        """
+        Cancel the job on one production line (index into active_jobs). A
+        single craft loses the materials it took. A job that belongs to a
+        production plan cancels that plan: its other running jobs stop too,
+        and the inputs still reserved in its stock, plus sub-builds already
+        finished, go back through add_items_func(item_id, quantity).
+        Returns: (success, message)
+        """
+        if not 0 <= index < len(self.active_jobs):
+            return False, "No such manufacturing job"
+
+        job = self.active_jobs[index]
+        if job.plan_id is None:
+            del self.active_jobs[index]
+            return True, f"Cancelled manufacturing of {job.quantity}x {self.get_item_name(job.item_id)} (materials lost)"
+
+        stopped = [j for j in self.active_jobs if j.plan_id == job.plan_id]
+        self.active_jobs = [j for j in self.active_jobs if j.plan_id != job.plan_id]
+        plan = next((p for p in self.plans if p.plan_id == job.plan_id), None)
+        returned = {}
+        if plan is not None:
+            self.plans.remove(plan)
+            returned = plan.stock
+            for item_id, quantity in returned.items():
+                add_items_func(item_id, quantity)
+
+        target = f"{plan.quantity}x {self.get_item_name(plan.target_id)}" if plan else f"plan {job.plan_id}"
+        message = f"Cancelled production of {target}. Stopped: " + ", ".join(
+            f"{j.quantity}x {self.get_item_name(j.item_id)}" for j in stopped)
+        if returned:
+            message += ". Returned to cargo: " + ", ".join(
+                f"{quantity}x {self.get_item_name(item_id)}" for item_id, quantity in returned.items())
+        return True, message
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for saving"""
         return {
-            "active_jobs": [job.to_dict() for job in self.active_jobs]
+            "active_jobs": [job.to_dict() for job in self.active_jobs],
+            "plans": [plan.to_dict() for plan in self.plans],
+            "next_plan_id": self.next_plan_id
         }
 
     @classmethod
@@ -341,4 +772,6 @@ class ManufacturingManager:
         manager = cls()
         manager.active_jobs = [ManufacturingJob.from_dict(job_data)
                               for job_data in data.get("active_jobs", [])]
+        manager.plans = [ProductionPlan.from_dict(plan_data) for plan_data in data.get("plans", [])]
+        manager.next_plan_id = data.get("next_plan_id", 1)
         return manager
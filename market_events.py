@@ -0,0 +1,215 @@
+"""
+Market Events
+Shortages, booms, embargoes and pirate blockades that push commodity
+prices up or down for a while. An event covers one location, a region
+(the locations of one faction, or the neutral ones) or the whole galaxy,
+optionally only one commodity category. Events only change quotes:
+CommodityMarket multiplies its prices by the combined modifier of the
+events in force, looked up through per-location, per-region and
+galaxy-wide indexes, so no market entry is rewritten when events come and
+go. Events are drawn per fixed period from the market seed, so they
+depend only on game time.
+"""
+
+import heapq
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data import COMMODITIES, COMMODITY_CATEGORIES, LOCATIONS
+from config import MARKET_EVENT_INTERVAL, MARKET_EVENT_CHANCE
+
+# Buy and sell price multipliers, duration range (game seconds) and how often each is drawn
+EVENT_TYPES = {
+    "shortage": {"name": "Shortage", "buy": 1.5, "sell": 1.4, "duration": (1800, 5400), "weight": 4},
+    "boom": {"name": "Boom", "buy": 1.2, "sell": 1.35, "duration": (3600, 7200), "weight": 3},
+    "embargo": {"name": "Embargo", "buy": 1.8, "sell": 0.7, "duration": (3600, 10800), "weight": 2},
+    "blockade": {"name": "Pirate Blockade", "buy": 1.4, "sell": 0.8, "duration": (1200, 3600), "weight": 2},
+}
+
+# Combined multipliers of overlapping events stay within this range
+MODIFIER_RANGE = (0.25, 4.0)
+
+# Periods to look back after a long gap - events drawn earlier would all have ended
+_LOOKBACK_PERIODS = max(info["duration"][1] for info in EVENT_TYPES.values()) // MARKET_EVENT_INTERVAL + 1
+
+
+def location_region(location_id: str) -> str:
+    """Region of a location: its faction, or "neutral\""""
+    return LOCATIONS.get(location_id, {}).get("faction") or "neutral"
+
+
+class MarketEvent:
+    """One scheduled or running event"""
+
+    __slots__ = ("event_id", "kind", "starts_at", "ends_at", "location_id", "region", "category")
+
+    def __init__(self, event_id: int, kind: str, starts_at: float, ends_at: float,
+                 location_id: Optional[str] = None, region: Optional[str] = None, category: Optional[str] = None):
+        self.event_id = event_id
+        self.kind = kind  # Key of EVENT_TYPES
+        self.starts_at = starts_at  # Game time
+        self.ends_at = ends_at
+        self.location_id = location_id  # Scope: one location, else one region, else everywhere
+        self.region = region
+        self.category = category  # Only this commodity category (None for all)
+
+    @property
+    def name(self) -> str:
+        return EVENT_TYPES[self.kind]["name"]
+
+    def describe(self) -> str:
+        """Event name with what it covers"""
+        if self.location_id:
+            where = LOCATIONS[self.location_id]["name"]
+        elif self.region:
+            where = "neutral space" if self.region == "neutral" else f"{self.region.replace('_', ' ').title()} space"
+        else:
+            where = "the galaxy"
+        what = f"{self.category.replace('_', ' ')} goods" if self.category else "all goods"
+        return f"{self.name} in {where} ({what})"
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "event_id": self.event_id,
+            "kind": self.kind,
+            "starts_at": self.starts_at,
+            "ends_at": self.ends_at,
+            "location_id": self.location_id,
+            "region": self.region,
+            "category": self.category
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MarketEvent':
+        """Create from dictionary"""
+        return cls(data["event_id"], data["kind"], data["starts_at"], data["ends_at"],
+                   data.get("location_id"), data.get("region"), data.get("category"))
+
+
+class MarketEventBoard:
+    """
+    Scheduled and running events. Scheduled events wait in a heap by start
+    time and running ones in a heap by deadline; running events are also
+    indexed by the scope they cover. Combined modifiers are cached per
+    (location, category) until an event starts or ends.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.events: Dict[int, MarketEvent] = {}  # Scheduled and running
+        self.next_period = 0  # First event period not drawn yet
+        self.next_id = 1
+        self._starts: List[Tuple[float, int]] = []
+        self._ends: List[Tuple[float, int]] = []
+        self.by_location: Dict[str, Dict[int, None]] = {}
+        self.by_region: Dict[str, Dict[int, None]] = {}
+        self.galaxy_wide: Dict[int, None] = {}
+        self._modifiers: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+    def _scope_index(self, event: MarketEvent) -> Dict[int, None]:
+        if event.location_id:
+            return self.by_location.setdefault(event.location_id, {})
+        if event.region:
+            return self.by_region.setdefault(event.region, {})
+        return self.galaxy_wide
+
+    def schedule(self, event: MarketEvent):
+        """Add an event; it starts at its start time"""
+        self.events[event.event_id] = event
+        self.next_id = max(self.next_id, event.event_id + 1)
+        heapq.heappush(self._starts, (event.starts_at, event.event_id))
+
+    def _roll_period(self, period: int, locations: List[str]):
+        """Draw the event (if any) starting during one period"""
+        rng = random.Random(f"{self.seed}:events:{period}")
+        if rng.random() >= MARKET_EVENT_CHANCE or not locations:
+            return
+
+        kinds = list(EVENT_TYPES)
+        kind = rng.choices(kinds, weights=[EVENT_TYPES[k]["weight"] for k in kinds])[0]
+        location_id = region = category = None
+        scope = rng.random()
+        if scope < 0.5:
+            location_id = rng.choice(locations)
+        elif scope < 0.8 or kind == "blockade":  # Pirates blockade a region at most
+            region = rng.choice(sorted({location_region(loc) for loc in locations}))
+        if (location_id is None and region is None) or rng.random() < 0.5:
+            category = rng.choice(sorted(COMMODITY_CATEGORIES))
+
+        starts_at = period * MARKET_EVENT_INTERVAL + rng.uniform(0, MARKET_EVENT_INTERVAL)
+        ends_at = starts_at + rng.uniform(*EVENT_TYPES[kind]["duration"])
+        self.schedule(MarketEvent(self.next_id, kind, starts_at, ends_at, location_id, region, category))
+
+    def advance(self, game_time: float, locations: Iterable[str]):
+        """Draw new periods, then start and end events due by game_time"""
+        period = int(game_time // MARKET_EVENT_INTERVAL)
+        if period >= self.next_period:
+            market_locations = sorted(locations)
+            for drawn in range(max(self.next_period, period - _LOOKBACK_PERIODS), period + 1):
+                self._roll_period(drawn, market_locations)
+            self.next_period = period + 1
+        self._apply_due(game_time)
+
+    def _apply_due(self, game_time: float):
+        """Start and end events due by game_time"""
+        changed = False
+        while self._starts and self._starts[0][0] <= game_time:
+            _, event_id = heapq.heappop(self._starts)
+            event = self.events.get(event_id)
+            if event is None:
+                continue
+            if event.ends_at <= game_time:
+                del self.events[event_id]  # Over before anyone looked
+                continue
+            self._scope_index(event)[event_id] = None
+            heapq.heappush(self._ends, (event.ends_at, event_id))
+            changed = True
+
+        while self._ends and self._ends[0][0] <= game_time:
+            _, event_id = heapq.heappop(self._ends)
+            event = self.events.pop(event_id, None)
+            if event is not None:
+                self._scope_index(event).pop(event_id, None)
+                changed = True
+
+        if changed:
+            self._modifiers.clear()
+
+    def _running_at(self, location_id: str) -> List[MarketEvent]:
+        ids = list(self.by_location.get(location_id, ())) + list(self.by_region.get(location_region(location_id), ())) \
+            + list(self.galaxy_wide)
+        return [self.events[event_id] for event_id in ids]
+
+    def modifier(self, location_id: str, commodity_id: str) -> Tuple[float, float]:
+        """(buy, sell) price multipliers for a commodity at a location"""
+        category = COMMODITIES[commodity_id]["category"]
+        key = (location_id, category)
+        cached = self._modifiers.get(key)
+        if cached is not None:
+            return cached
+
+        buy = sell = 1.0
+        for event in self._running_at(location_id):
+            if event.category is None or event.category == category:
+                buy *= EVENT_TYPES[event.kind]["buy"]
+                sell *= EVENT_TYPES[event.kind]["sell"]
+        low, high = MODIFIER_RANGE
+        cached = self._modifiers[key] = (max(low, min(high, buy)), max(low, min(high, sell)))
+        return cached
+
+    def running_at(self, location_id: str) -> List[MarketEvent]:
+        """Events affecting a location's market now"""
+        return sorted(self._running_at(location_id), key=lambda event: event.ends_at)
+
+    def to_list(self) -> List[Dict]:
+        """Scheduled and running events for saving"""
+        return [event.to_dict() for event in self.events.values()]
+
+    def load(self, events: List[Dict], next_period: int, game_time: float):
+        """Restore saved events and bring them up to game_time"""
+        for data in events:
+            if data.get("kind") in EVENT_TYPES:
+                self.schedule(MarketEvent.from_dict(data))
+        self.next_period = next_period
+        self._apply_due(game_time)
@@ -3,10 +3,12 @@ Mission and Contract System
 Handles procedural missions, objectives, and rewards
 """
 
-import random
 import time
 from typing import Dict, List, Optional
 from data import CONTRACT_TYPES, RESOURCES, LOCATIONS
+from rng_service import get_stream
+
+_rng = get_stream("missions")
 
 
 class Contract:
@@ -28,7 +30,7 @@ class Contract:
 
         # Calculate reward with progressive scaling
         min_reward, max_reward = template["reward_range"]
-        base_reward = random.randint(min_reward, max_reward)
+        base_reward = _rng.randint(min_reward, max_reward)
 
         # Apply multipliers for balanced progression
         progression_mult = self._calculate_progression_multiplier(contracts_completed)
@@ -60,14 +62,14 @@ class Contract:
         self.completed = False
         self.failed = False
 
-        self.contract_id = f"{contract_type}_{location_id}_{int(time.time())}"
+        self.contract_id = f"{contract_type}_{location_id}_{_rng.getrandbits(32):08x}"
 
     def _generate_objectives(self) -> Dict:
         """Generate specific objectives based on contract type"""
         if self.contract_type == "mining_contract":
             # Pick random resources to mine
-            resource_id = random.choice(list(RESOURCES.keys()))
-            quantity = random.randint(50, 200) * self.difficulty
+            resource_id = _rng.choice(list(RESOURCES.keys()))
+            quantity = _rng.randint(50, 200) * self.difficulty
 
             return {
                 "type": "collect_resource",
@@ -78,7 +80,7 @@ class Contract:
 
         elif self.contract_type == "combat_patrol":
             # Destroy enemies
-            enemy_count = random.randint(2, 5) * self.difficulty
+            enemy_count = _rng.randint(2, 5) * self.difficulty
 
             return {
                 "type": "destroy_enemies",
@@ -90,32 +92,32 @@ class Contract:
         elif self.contract_type == "cargo_transport":
             # Transport commodities to another location
             # 70% chance of commodity, 30% chance of resource
-            if random.random() < 0.7:
+            if _rng.random() < 0.7:
                 from data import COMMODITIES
-                item_id = random.choice(list(COMMODITIES.keys()))
+                item_id = _rng.choice(list(COMMODITIES.keys()))
                 # Get commodity data
                 commodity_data = COMMODITIES[item_id]
                 # Base quantity on value (cheaper = more, expensive = less)
                 if commodity_data["base_price"] < 50:
-                    base_qty = random.randint(50, 150)
+                    base_qty = _rng.randint(50, 150)
                 elif commodity_data["base_price"] < 200:
-                    base_qty = random.randint(20, 80)
+                    base_qty = _rng.randint(20, 80)
                 elif commodity_data["base_price"] < 1000:
-                    base_qty = random.randint(10, 40)
+                    base_qty = _rng.randint(10, 40)
                 else:
-                    base_qty = random.randint(5, 20)
+                    base_qty = _rng.randint(5, 20)
                 quantity = base_qty * self.difficulty
                 item_type = "commodity"
             else:
                 # Use resources for transport
-                item_id = random.choice(list(RESOURCES.keys()))
-                quantity = random.randint(50, 200) * self.difficulty
+                item_id = _rng.choice(list(RESOURCES.keys()))
+                quantity = _rng.randint(50, 200) * self.difficulty
                 item_type = "resource"
 
             # Pick a different destination
             all_locations = list(LOCATIONS.keys())
             all_locations.remove(self.location_id)
-            destination = random.choice(all_locations)
+            destination = _rng.choice(all_locations)
 
             return {
                 "type": "transport_cargo",
@@ -128,7 +130,7 @@ class Contract:
 
         elif self.contract_type == "reconnaissance":
             # Scan locations
-            scan_count = random.randint(3, 6)
+            scan_count = _rng.randint(3, 6)
 
             return {
                 "type": "scan_locations",
@@ -138,7 +140,7 @@ class Contract:
 
         elif self.contract_type == "research_data":
             # Collect data from anomalies
-            data_count = random.randint(5, 10) * self.difficulty
+            data_count = _rng.randint(5, 10) * self.difficulty
 
             return {
                 "type": "collect_data",
@@ -322,7 +324,11 @@ class Contract:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Contract':
         """Create from dictionary"""
-        contract = cls(data["contract_type"], data["location_id"], data["difficulty"])
+        # Skip __init__ - it would roll a new reward and objectives only to overwrite them
+        contract = cls.__new__(cls)
+        contract.contract_type = data["contract_type"]
+        contract.location_id = data["location_id"]
+        contract.difficulty = data["difficulty"]
         contract.contract_id = data["contract_id"]
         contract.name = data["name"]
         contract.description = data["description"]
@@ -350,7 +356,7 @@ class ContractBoard:
         for location_id, location_data in LOCATIONS.items():
             if "contracts" in location_data.get("services", []):
                 # Generate between min and max contracts per location
-                count = random.randint(min_per_location, max_per_location)
+                count = _rng.randint(min_per_location, max_per_location)
                 self.generate_contracts(location_id, count, contracts_completed)
 
     def generate_contracts(self, location_id: str, count: int = 3, contracts_completed: int = 0):
@@ -367,8 +373,8 @@ class ContractBoard:
         # Generate contracts
         contracts = []
         for _ in range(count):
-            contract_type = random.choice(list(CONTRACT_TYPES.keys()))
-            difficulty = random.randint(1, 3)
+            contract_type = _rng.choice(list(CONTRACT_TYPES.keys()))
+            difficulty = _rng.randint(1, 3)
 
             contract = Contract(contract_type, location_id, difficulty, contracts_completed)
             contracts.append(contract)
@@ -401,13 +407,7 @@ class ContractBoard:
                         location_id = contract.location_id
                         
                         # Add items to station inventory at contract location
-                        if location_id not in player.station_inventories:
-                            player.station_inventories[location_id] = {}
-                        
-                        if item_id not in player.station_inventories[location_id]:
-                            player.station_inventories[location_id][item_id] = 0
-                        
-                        player.station_inventories[location_id][item_id] += quantity
+                        player.add_station_item(location_id, item_id, quantity)
                     
                     # Remove from available contracts for this location
                     contracts.remove(contract)
@@ -458,18 +458,10 @@ class ContractBoard:
                     return False, f"You don't have enough {item_id} in your cargo"
                 
                 # Remove items from ship cargo
-                player.ship_cargo[item_id] -= quantity
-                if player.ship_cargo[item_id] == 0:
-                    del player.ship_cargo[item_id]
+                player.remove_item(item_id, quantity)
                 
                 # Add items to destination station inventory
-                if destination not in player.station_inventories:
-                    player.station_inventories[destination] = {}
-                
-                if item_id not in player.station_inventories[destination]:
-                    player.station_inventories[destination][item_id] = 0
-                
-                player.station_inventories[destination][item_id] += quantity
+                player.add_station_item(destination, item_id, quantity)
                 
                 # Mark contract as complete
                 contract.completed = True
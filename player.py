@@ -7,7 +7,8 @@ import time
 from typing import Dict, List, Optional, Tuple
 from data import SKILLS
 from config import BASE_SKILL_TRAIN_TIME, SKILL_TIME_MULTIPLIER
-from volume_system import calculate_cargo_volume, can_add_item
+from volume_system import check_capacity
+from inventory_ledger import InventoryLedger
 
 
 class Player:
@@ -30,12 +31,9 @@ class Player:
         self.skill_training: List[Dict] = []  # List of currently training skills
         self.recently_completed_skills: List[Dict] = []  # Last 3 completed skills (for status display)
 
-        # Inventory systems
-        self.ship_cargo: Dict[str, int] = {}  # Items in ship cargo hold
-        self.station_inventories: Dict[str, Dict[str, int]] = {}  # location_id: {item_id: quantity}
-
-        # Backwards compatibility - inventory now refers to ship_cargo
-        self.inventory = self.ship_cargo
+        # Inventory systems - change holds through self.ledger so its totals stay right
+        self.ledger = InventoryLedger()
+        self._bind_ledger()
 
         # Statistics
         self.stats = {
@@ -57,6 +55,7 @@ class Player:
             "technocrat_union": 0.0,
             "void_corsairs": -0.2  # Start slightly hostile with pirates
         }
+        self.standings_version = 0  # Bumped on every standing change (keys cached faction access)
 
         # Shipyard berths - track owned berths at each location
         # Structure: {location_id: {"berths": [ship_id or None, ...]}}
@@ -83,6 +82,14 @@ class Player:
             return True
         return False
 
+    def _bind_ledger(self):
+        """Point the hold attributes at the ledger's dicts"""
+        self.ship_cargo: Dict[str, int] = self.ledger.ship_cargo  # Items in ship cargo hold
+        self.station_inventories: Dict[str, Dict[str, int]] = self.ledger.station_inventories  # location_id: {item_id: quantity}
+
+        # Backwards compatibility - inventory now refers to ship_cargo
+        self.inventory = self.ship_cargo
+
     def add_item(self, item_id: str, quantity: int = 1, cargo_capacity: Optional[float] = None) -> Tuple[bool, str]:
         """
         Add items to inventory with optional cargo capacity check
@@ -90,26 +97,26 @@ class Player:
         """
         # If cargo capacity is provided, check if items fit
         if cargo_capacity is not None:
-            can_add, message = can_add_item(self.inventory, cargo_capacity, item_id, quantity)
+            can_add, message = check_capacity(self.ledger.cargo_volume, cargo_capacity, item_id, quantity)
             if not can_add:
                 return False, message
 
         # Add items to inventory
-        if item_id in self.inventory:
-            self.inventory[item_id] += quantity
-        else:
-            self.inventory[item_id] = quantity
+        self.ledger.add(item_id, quantity)
 
         return True, f"Added {quantity}x {item_id}"
 
     def remove_item(self, item_id: str, quantity: int = 1) -> bool:
         """Remove items from inventory. Returns True if successful."""
-        if item_id in self.inventory and self.inventory[item_id] >= quantity:
-            self.inventory[item_id] -= quantity
-            if self.inventory[item_id] == 0:
-                del self.inventory[item_id]
-            return True
-        return False
+        return self.ledger.remove(item_id, quantity)
+
+    def add_station_item(self, location_id: str, item_id: str, quantity: int):
+        """Put items in a station's storage"""
+        self.ledger.add(item_id, quantity, location_id)
+
+    def remove_station_item(self, location_id: str, item_id: str, quantity: int) -> bool:
+        """Take items from a station's storage. Returns True if successful."""
+        return self.ledger.remove(item_id, quantity, location_id)
 
     def remove_item_multi_source(self, item_id: str, quantity: int) -> tuple[bool, Dict[str, int]]:
         """
@@ -130,19 +137,14 @@ class Player:
         ship_available = quantities["ship"]
         if ship_available > 0:
             to_remove = min(remaining, ship_available)
-            self.ship_cargo[item_id] -= to_remove
-            if self.ship_cargo[item_id] == 0:
-                del self.ship_cargo[item_id]
+            self.ledger.remove(item_id, to_remove)
             removed_from_ship = to_remove
             remaining -= to_remove
 
         # Remove from station if needed
         if remaining > 0 and quantities["station"] > 0:
-            station_inv = self.get_station_inventory(self.location)
             to_remove = min(remaining, quantities["station"])
-            station_inv[item_id] -= to_remove
-            if station_inv[item_id] == 0:
-                del station_inv[item_id]
+            self.ledger.remove(item_id, to_remove, self.location)
             removed_from_station = to_remove
             remaining -= to_remove
 
@@ -150,7 +152,7 @@ class Player:
 
     def get_cargo_volume(self) -> float:
         """Get current cargo volume usage"""
-        return calculate_cargo_volume(self.inventory)
+        return self.ledger.cargo_volume
 
     def has_item(self, item_id: str, quantity: int = 1) -> bool:
         """Check if player has item in ship cargo"""
@@ -162,11 +164,9 @@ class Player:
         Returns: {"ship": qty, "station": qty, "total": qty}
         """
         ship_qty = self.ship_cargo.get(item_id, 0)
-        station_qty = 0
 
         # Get quantity from current location's station storage
-        if self.location in self.station_inventories:
-            station_qty = self.station_inventories[self.location].get(item_id, 0)
+        station_qty = self.ledger.quantity(item_id, self.location)
 
         return {
             "ship": ship_qty,
@@ -175,10 +175,8 @@ class Player:
         }
 
     def get_station_inventory(self, location_id: str) -> Dict[str, int]:
-        """Get inventory at a specific station"""
-        if location_id not in self.station_inventories:
-            self.station_inventories[location_id] = {}
-        return self.station_inventories[location_id]
+        """Get inventory at a specific station (read it; change it through the ledger)"""
+        return self.ledger.station(location_id)
 
     def can_access_remote_stations(self) -> bool:
         """Check if player can access remote station inventories"""
@@ -211,11 +209,7 @@ class Player:
         self.remove_item(item_id, quantity)
 
         # Add to station
-        station_inv = self.get_station_inventory(location_id)
-        if item_id in station_inv:
-            station_inv[item_id] += quantity
-        else:
-            station_inv[item_id] = quantity
+        self.ledger.add(item_id, quantity, location_id)
 
         return True, f"Transferred {quantity}x to station storage"
 
@@ -228,30 +222,27 @@ class Player:
         if location_id not in self.get_accessible_stations():
             return False, "Cannot access this station's inventory"
 
-        station_inv = self.get_station_inventory(location_id)
-
-        if item_id not in station_inv or station_inv[item_id] < quantity:
-            return False, "Insufficient items in station storage"
-
         # Remove from station
-        station_inv[item_id] -= quantity
-        if station_inv[item_id] == 0:
-            del station_inv[item_id]
+        if not self.ledger.remove(item_id, quantity, location_id):
+            return False, "Insufficient items in station storage"
 
         # Add to ship
         self.add_item(item_id, quantity)
 
         return True, f"Transferred {quantity}x to ship cargo"
 
+    def get_item_locations(self, item_id: str) -> Dict[str, int]:
+        """Accessible stations storing an item, with the quantity at each"""
+        if self.can_access_remote_stations():
+            return dict(self.ledger.locations(item_id))
+        quantity = self.ledger.quantity(item_id, self.location)
+        return {self.location: quantity} if quantity else {}
+
     def get_total_item_count(self, item_id: str) -> int:
         """Get total count of item across ship and all accessible stations"""
-        total = self.ship_cargo.get(item_id, 0)
-
-        for location_id in self.get_accessible_stations():
-            station_inv = self.get_station_inventory(location_id)
-            total += station_inv.get(item_id, 0)
-
-        return total
+        if self.can_access_remote_stations():
+            return self.ledger.total(item_id)
+        return self.ship_cargo.get(item_id, 0) + self.ledger.quantity(item_id, self.location)
 
     def get_skill_level(self, skill_id: str) -> int:
         """Get current level of a skill"""
@@ -398,6 +389,7 @@ class Player:
         if faction_id in self.faction_standings:
             self.faction_standings[faction_id] = max(-1.0, min(1.0,
                 self.faction_standings[faction_id] + change))
+            self.standings_version += 1
 
     def get_faction_status(self, faction_id: str) -> str:
         """Get relationship status with faction"""
@@ -496,14 +488,12 @@ class Player:
 
         # Handle backwards compatibility - old saves have "inventory", new saves have "ship_cargo"
         if "ship_cargo" in data:
-            player.ship_cargo = data["ship_cargo"]
-            player.station_inventories = data.get("station_inventories", {})
+            player.ledger = InventoryLedger(data["ship_cargo"], data.get("station_inventories", {}))
         else:
             # Old save format - treat inventory as ship cargo
-            player.ship_cargo = data.get("inventory", {})
-            player.station_inventories = {}
+            player.ledger = InventoryLedger(data.get("inventory", {}), {})
 
-        player.inventory = player.ship_cargo  # Keep reference for compatibility
+        player._bind_ledger()  # Keeps the inventory reference for compatibility
 
         player.stats = data["stats"]
         player.faction_standings = data["faction_standings"]
@@ -1,11 +1,30 @@
 """
 Recycling System
-Break down components and ships for materials
+Break down components and ships for materials. Recovered materials follow a
+multinomial split weighted by the recipe, so a batch of any size costs one
+sample per recipe.
 """
 
 import random
-from typing import Dict, Tuple
-from data import SHIP_COMPONENTS, COMPONENT_RECIPES, SHIP_RECIPES, VESSEL_CLASSES, RESOURCES
+from typing import Dict, Optional, Tuple
+from data import SHIP_COMPONENTS, COMPONENT_RECIPES, SHIP_RECIPES, VESSEL_CLASSES
+from item_registry import get_item_name
+from rng_service import get_stream
+from sampling import multinomial
+
+_rng = get_stream("recycling")
+
+
+class RecoveryWeights:
+    """Cached material split of one recyclable item"""
+
+    __slots__ = ("materials", "probabilities", "units_per_item")
+
+    def __init__(self, materials: Dict[str, int], recovery_rate: float):
+        total = sum(materials.values())
+        self.materials = tuple(materials)
+        self.probabilities = tuple(quantity / total for quantity in materials.values())
+        self.units_per_item = int(total * recovery_rate)  # Units recovered from one item
 
 
 class RecyclingSystem:
@@ -13,6 +32,85 @@ class RecyclingSystem:
 
     def __init__(self):
         self.recovery_rate = 0.80  # Return 80% of materials
+        self._weights: Dict[str, Optional[RecoveryWeights]] = {}
+
+    def _recipe_materials(self, item_id: str) -> Dict[str, int]:
+        """Materials that went into a component, or into all of a ship's components"""
+        if item_id in COMPONENT_RECIPES:
+            return dict(COMPONENT_RECIPES[item_id].get("materials", {}))
+
+        all_materials = {}
+        if item_id in SHIP_RECIPES:
+            for comp_id, quantity in SHIP_RECIPES[item_id].get("components", {}).items():
+                if comp_id in COMPONENT_RECIPES:
+                    for mat, mat_qty in COMPONENT_RECIPES[comp_id].get("materials", {}).items():
+                        all_materials[mat] = all_materials.get(mat, 0) + (mat_qty * quantity)
+        return all_materials
+
+    def get_weights(self, item_id: str) -> Optional[RecoveryWeights]:
+        """Material split for an item (None if it yields nothing), built once per recipe"""
+        if item_id not in self._weights:
+            materials = {mat: qty for mat, qty in self._recipe_materials(item_id).items() if qty > 0}
+            self._weights[item_id] = RecoveryWeights(materials, self.recovery_rate) if materials else None
+        return self._weights[item_id]
+
+    def check_recyclable(self, item_id: str) -> Tuple[bool, str]:
+        """Whether an item can be recycled. Returns (ok, reason)"""
+        if item_id in SHIP_COMPONENTS:
+            if item_id not in COMPONENT_RECIPES:
+                return False, "Component cannot be recycled"
+            if self.get_weights(item_id) is None:
+                return False, "Component has no materials to recover"
+        elif item_id in VESSEL_CLASSES:
+            if item_id not in SHIP_RECIPES:
+                return False, "Ship cannot be recycled"
+            if not SHIP_RECIPES[item_id].get("components"):
+                return False, "Ship has no components to recover"
+            if self.get_weights(item_id) is None:
+                return False, "Ship has no materials to recover"
+        else:
+            return False, "Invalid item"
+        return True, "Recyclable"
+
+    def recycle_batch(self, items: Dict[str, int]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Recycle quantities of recyclable items in one go. Every item type
+        draws its whole recovery from a single multinomial sample; the batch
+        takes one seed from the recycling stream. The sampler is pure Python,
+        so a seed recovers the same materials on every install.
+        Returns: (materials recovered, items recycled)
+        """
+        rng = random.Random(_rng.getrandbits(64))
+
+        recovered: Dict[str, int] = {}
+        recycled: Dict[str, int] = {}
+        for item_id, count in items.items():
+            weights = self.get_weights(item_id)
+            if weights is None or count <= 0:
+                continue
+            recycled[item_id] = count
+
+            units = weights.units_per_item * count
+            if units <= 0:
+                continue
+            counts = multinomial(rng, units, weights.probabilities)
+            for material, quantity in zip(weights.materials, counts):
+                if quantity:
+                    recovered[material] = recovered.get(material, 0) + quantity
+
+        return recovered, recycled
+
+    def expected_recovery(self, items: Dict[str, int]) -> Dict[str, float]:
+        """Mean materials recovered by recycle_batch(items) (units x recipe share)"""
+        expected: Dict[str, float] = {}
+        for item_id, count in items.items():
+            weights = self.get_weights(item_id)
+            if weights is None or count <= 0:
+                continue
+            units = weights.units_per_item * count
+            for material, probability in zip(weights.materials, weights.probabilities):
+                expected[material] = expected.get(material, 0.0) + units * probability
+        return expected
 
     def recycle_component(self, comp_id: str) -> Tuple[bool, str, Dict[str, int]]:
         """
@@ -22,26 +120,14 @@ class RecyclingSystem:
         if comp_id not in SHIP_COMPONENTS:
             return False, "Invalid component", {}
 
-        if comp_id not in COMPONENT_RECIPES:
-            return False, "Component cannot be recycled", {}
-
-        recipe = COMPONENT_RECIPES[comp_id]
-        materials_required = recipe.get("materials", {})
-
-        if not materials_required:
-            return False, "Component has no materials to recover", {}
-
-        # Calculate total material value
-        total_materials = sum(materials_required.values())
-        recovered_total = int(total_materials * self.recovery_rate)
+        recyclable, reason = self.check_recyclable(comp_id)
+        if not recyclable:
+            return False, reason, {}
 
         # Distribute recovered materials randomly among the recipe materials
-        recovered_materials = self._distribute_materials_randomly(
-            materials_required,
-            recovered_total
-        )
+        recovered_materials, _ = self.recycle_batch({comp_id: 1})
 
-        comp_name = SHIP_COMPONENTS[comp_id]["name"]
+        comp_name = get_item_name(comp_id)
         material_list = ", ".join([f"{qty}x {mat}" for mat, qty in recovered_materials.items()])
 
         return True, f"Recycled {comp_name}. Recovered: {material_list}", recovered_materials
@@ -54,87 +140,18 @@ class RecyclingSystem:
         if ship_id not in VESSEL_CLASSES:
             return False, "Invalid ship", {}
 
-        if ship_id not in SHIP_RECIPES:
-            return False, "Ship cannot be recycled", {}
-
-        ship_recipe = SHIP_RECIPES[ship_id]
-        required_components = ship_recipe.get("components", {})
-
-        if not required_components:
-            return False, "Ship has no components to recover", {}
+        recyclable, reason = self.check_recyclable(ship_id)
+        if not recyclable:
+            return False, reason, {}
 
-        # Collect all materials from all components
-        all_materials = {}
-
-        for comp_id, quantity in required_components.items():
-            if comp_id in COMPONENT_RECIPES:
-                comp_recipe = COMPONENT_RECIPES[comp_id]
-                comp_materials = comp_recipe.get("materials", {})
-
-                for mat, mat_qty in comp_materials.items():
-                    all_materials[mat] = all_materials.get(mat, 0) + (mat_qty * quantity)
-
-        if not all_materials:
-            return False, "Ship has no materials to recover", {}
-
-        # Calculate total material value
-        total_materials = sum(all_materials.values())
-        recovered_total = int(total_materials * self.recovery_rate)
+        # Distribute recovered materials randomly among all component materials
+        recovered_materials, _ = self.recycle_batch({ship_id: 1})
 
-        # Distribute recovered materials randomly
-        recovered_materials = self._distribute_materials_randomly(
-            all_materials,
-            recovered_total
-        )
-
-        ship_name = VESSEL_CLASSES[ship_id]["name"]
+        ship_name = get_item_name(ship_id)
         material_list = ", ".join([f"{qty}x {mat}" for mat, qty in recovered_materials.items()])
 
         return True, f"Recycled {ship_name}. Recovered: {material_list}", recovered_materials
 
-    def _distribute_materials_randomly(
-        self,
-        material_types: Dict[str, int],
-        total_to_distribute: int
-    ) -> Dict[str, int]:
-        """
-        Distribute a total amount randomly among material types
-        Each material type from the recipe has a chance to receive materials
-        """
-        if not material_types or total_to_distribute <= 0:
-            return {}
-
-        available_materials = list(material_types.keys())
-        distributed = {}
-        remaining = total_to_distribute
-
-        # Randomly distribute materials
-        for material in available_materials[:-1]:  # All but last
-            if remaining <= 0:
-                break
-
-            # Random amount (0 to remaining, weighted by original recipe)
-            original_weight = material_types[material]
-            total_weight = sum(material_types.values())
-            expected_share = int((original_weight / total_weight) * total_to_distribute)
-
-            # Add randomness: ±30% of expected share
-            min_amount = max(0, int(expected_share * 0.7))
-            max_amount = min(remaining, int(expected_share * 1.3))
-
-            if max_amount > 0:
-                amount = random.randint(min_amount, max_amount)
-                if amount > 0:
-                    distributed[material] = amount
-                    remaining -= amount
-
-        # Give remaining to last material (if any materials left)
-        if remaining > 0 and available_materials:
-            last_material = available_materials[-1]
-            distributed[last_material] = distributed.get(last_material, 0) + remaining
-
-        return distributed
-
     def get_recyclable_items(self, inventory: Dict[str, int]) -> Dict[str, list]:
         """
         Get list of recyclable items from player inventory
@@ -147,13 +164,13 @@ class RecyclingSystem:
                 if item_id in SHIP_COMPONENTS:
                     recyclable["components"].append({
                         "id": item_id,
-                        "name": SHIP_COMPONENTS[item_id]["name"],
+                        "name": get_item_name(item_id),
                         "quantity": quantity
                     })
                 elif item_id in VESSEL_CLASSES:
                     recyclable["ships"].append({
                         "id": item_id,
-                        "name": VESSEL_CLASSES[item_id]["name"],
+                        "name": get_item_name(item_id),
                         "quantity": quantity
                     })
 
@@ -179,15 +196,7 @@ class RecyclingSystem:
         if ship_id not in SHIP_RECIPES:
             return {}
 
-        ship_recipe = SHIP_RECIPES[ship_id]
-        required_components = ship_recipe.get("components", {})
-
-        all_materials = {}
-        for comp_id, quantity in required_components.items():
-            if comp_id in COMPONENT_RECIPES:
-                comp_materials = COMPONENT_RECIPES[comp_id].get("materials", {})
-                for mat, mat_qty in comp_materials.items():
-                    all_materials[mat] = all_materials.get(mat, 0) + (mat_qty * quantity)
+        all_materials = self._recipe_materials(ship_id)
 
         # Show expected recovery
         recovered = {}
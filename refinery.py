@@ -0,0 +1,110 @@
+"""
+Refinery System
+Queued refining jobs. A job takes a whole basket of raw ores, runs for
+game time proportional to the amount of ore and then delivers its
+refined output. Yields are rolled when the job is queued, so finishing a job
+draws no random numbers.
+"""
+
+from typing import Dict, List
+from config import REFINING_TIME_PER_UNIT
+
+
+class RefineryJob:
+    """A queued basket of raw ores and the refined output it will deliver"""
+
+    def __init__(self, location_id: str, basket: Dict[str, int], ship_output: Dict[str, int],
+                 station_output: Dict[str, int], start_time: float, duration: float):
+        self.location_id = location_id  # Station output is delivered here
+        self.basket = basket  # Raw ore -> quantity taken
+        self.ship_output = ship_output  # Refined resource -> quantity for ship cargo
+        self.station_output = station_output  # Refined resource -> quantity for station storage
+        self.start_time = start_time  # Game time
+        self.duration = duration
+
+    @property
+    def completes_at(self) -> float:
+        return self.start_time + self.duration
+
+    def get_progress(self, game_time: float) -> float:
+        """Get progress percentage (0-100)"""
+        if self.duration <= 0:
+            return 100.0
+        return max(0.0, min(100.0, (game_time - self.start_time) / self.duration * 100.0))
+
+    def get_remaining_time(self, game_time: float) -> float:
+        """Game seconds until the job finishes"""
+        return max(0.0, self.completes_at - game_time)
+
+    def total_output(self) -> Dict[str, int]:
+        """Refined output by resource, ship and station combined"""
+        total = dict(self.ship_output)
+        for resource_id, quantity in self.station_output.items():
+            total[resource_id] = total.get(resource_id, 0) + quantity
+        return total
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "location_id": self.location_id,
+            "basket": self.basket,
+            "ship_output": self.ship_output,
+            "station_output": self.station_output,
+            "start_time": self.start_time,
+            "duration": self.duration
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RefineryJob':
+        """Create from dictionary"""
+        return cls(data["location_id"], data["basket"], data["ship_output"], data["station_output"],
+                   data["start_time"], data["duration"])
+
+
+class RefineryManager:
+    """Refining queue - jobs run one after another"""
+
+    def __init__(self):
+        self.jobs: List[RefineryJob] = []
+
+    def queue_job(self, location_id: str, basket: Dict[str, int], ship_output: Dict[str, int],
+                  station_output: Dict[str, int], game_time: float) -> RefineryJob:
+        """Add a job; it starts when the previous one finishes"""
+        start_time = max(game_time, self.jobs[-1].completes_at) if self.jobs else game_time
+        duration = sum(basket.values()) * REFINING_TIME_PER_UNIT
+        job = RefineryJob(location_id, basket, ship_output, station_output, start_time, duration)
+        self.jobs.append(job)
+        return job
+
+    def pop_completed(self, game_time: float) -> List[RefineryJob]:
+        """Remove and return jobs finished by game_time"""
+        done = 0
+        while done < len(self.jobs) and self.jobs[done].completes_at <= game_time:
+            done += 1
+        completed, self.jobs = self.jobs[:done], self.jobs[done:]
+        return completed
+
+    def requeue_front(self, jobs: List[RefineryJob]):
+        """Put finished jobs that could not be delivered back at the front"""
+        self.jobs = jobs + self.jobs
+
+    def get_queue_status(self, game_time: float) -> List[Dict]:
+        """Queued jobs for display"""
+        return [{
+            "basket": job.basket,
+            "output": job.total_output(),
+            "location_id": job.location_id,
+            "progress": job.get_progress(game_time),
+            "remaining": job.get_remaining_time(game_time)
+        } for job in self.jobs]
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {"jobs": [job.to_dict() for job in self.jobs]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RefineryManager':
+        """Create from dictionary"""
+        manager = cls()
+        manager.jobs = [RefineryJob.from_dict(job) for job in data.get("jobs", [])]
+        return manager
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Replay Harness
+Re-executes a recorded command log against a seeded engine and reports
+per-command timings, so builds can be compared on identical workloads
+"""
+
+import contextlib
+import hashlib
+import io
+import sys
+import time
+from typing import Dict, List, Optional
+
+import yaml
+
+from game_engine import GameEngine
+
+
+class CommandLog:
+    """A seed plus the ordered list of engine commands issued in a session"""
+
+    def __init__(self, seed: int, player_name: str = "Commander"):
+        self.seed = seed
+        self.player_name = player_name
+        self.commands: List[Dict] = []
+
+    def record(self, command: str, args: tuple, kwargs: Dict, result=None):
+        """Engine command listener - append a command to the log"""
+        self.commands.append({
+            "command": command,
+            "args": list(args),
+            "kwargs": dict(kwargs)
+        })
+
+    def attach(self, engine: GameEngine):
+        """Start recording commands issued to an engine"""
+        engine.command_listeners.append(self.record)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "seed": self.seed,
+            "player_name": self.player_name,
+            "commands": self.commands
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CommandLog':
+        """Create from dictionary"""
+        log = cls(data["seed"], data.get("player_name", "Commander"))
+        log.commands = data.get("commands", [])
+        return log
+
+    def save(self, filename: str) -> bool:
+        """Write the log to a YAML file"""
+        try:
+            with open(filename, 'w') as f:
+                yaml.dump(self.to_dict(), f, default_flow_style=False, sort_keys=False)
+            return True
+        except Exception as e:
+            print(f"Error saving command log: {e}")
+            return False
+
+    @classmethod
+    def load(cls, filename: str) -> Optional['CommandLog']:
+        """Read a log from a YAML file"""
+        try:
+            with open(filename, 'r') as f:
+                return cls.from_dict(yaml.safe_load(f))
+        except Exception as e:
+            print(f"Error loading command log: {e}")
+            return None
+
+
+def start_recorded_game(engine: GameEngine, player_name: str, seed: int) -> CommandLog:
+    """Start a seeded new game and record every command issued to it"""
+    engine.new_game(player_name, seed=seed)
+    log = CommandLog(seed, player_name)
+    log.attach(engine)
+    return log
+
+
+def state_fingerprint(engine: GameEngine) -> str:
+    """Hash of the gameplay state that a deterministic replay must reproduce"""
+    player = engine.player
+    stats = {k: v for k, v in player.stats.items() if k != "time_played"}
+    state = {
+        "credits": player.credits,
+        "location": player.location,
+        "level": player.level,
+        "experience": player.experience,
+        "ship_cargo": player.ship_cargo,
+        "station_inventories": player.station_inventories,
+        "stats": stats,
+        "vessel": engine.vessel.to_dict(),
+    }
+    return hashlib.sha256(yaml.dump(state, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ReplayReport:
+    """Per-command timings and final state of a replay"""
+
+    def __init__(self):
+        self.timings: List[Dict] = []  # {"index", "command", "seconds", "success"}
+        self.fingerprint = ""
+
+    def get_total_time(self) -> float:
+        """Total time spent executing commands"""
+        return sum(t["seconds"] for t in self.timings)
+
+    def get_summary(self) -> Dict[str, Dict]:
+        """Aggregate timings per command name"""
+        summary = {}
+        for timing in self.timings:
+            entry = summary.setdefault(timing["command"], {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += timing["seconds"]
+            entry["max"] = max(entry["max"], timing["seconds"])
+
+        for entry in summary.values():
+            entry["mean"] = entry["total"] / entry["count"]
+
+        return summary
+
+    def format_report(self) -> str:
+        """Human-readable timing table"""
+        lines = [f"{'Command':<30} {'Count':>6} {'Total ms':>10} {'Mean ms':>10} {'Max ms':>10}"]
+        lines.append("-" * 70)
+
+        summary = self.get_summary()
+        for command in sorted(summary, key=lambda c: summary[c]["total"], reverse=True):
+            entry = summary[command]
+            lines.append(f"{command:<30} {entry['count']:>6} {entry['total'] * 1000:>10.3f} "
+                         f"{entry['mean'] * 1000:>10.3f} {entry['max'] * 1000:>10.3f}")
+
+        lines.append("-" * 70)
+        lines.append(f"{len(self.timings)} commands in {self.get_total_time() * 1000:.3f} ms")
+        lines.append(f"State fingerprint: {self.fingerprint}")
+        return "\n".join(lines)
+
+
+def replay(log: CommandLog, repeat: int = 1) -> ReplayReport:
+    """
+    Re-execute a command log against a freshly seeded engine.
+    With repeat > 1 the log is replayed several times and the fastest
+    time for each command is kept, which reduces timing noise.
+    """
+    report = ReplayReport()
+
+    for run in range(max(1, repeat)):
+        engine = GameEngine()
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.new_game(log.player_name, seed=log.seed)
+
+        for index, entry in enumerate(log.commands):
+            method = getattr(engine, entry["command"])
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = method(*entry.get("args", []), **entry.get("kwargs", {}))
+            elapsed = time.perf_counter() - start
+
+            success = bool(result[0]) if isinstance(result, tuple) else bool(result)
+
+            if run == 0:
+                report.timings.append({
+                    "index": index,
+                    "command": entry["command"],
+                    "seconds": elapsed,
+                    "success": success
+                })
+            else:
+                report.timings[index]["seconds"] = min(report.timings[index]["seconds"], elapsed)
+
+        fingerprint = state_fingerprint(engine)
+        if run > 0 and fingerprint != report.fingerprint:
+            print(f"Warning: replay {run + 1} diverged from the first run")
+        report.fingerprint = fingerprint
+
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python replay.py <command_log.yaml> [repeat]")
+        sys.exit(1)
+
+    command_log = CommandLog.load(sys.argv[1])
+    if not command_log:
+        sys.exit(1)
+
+    repeat_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print(replay(command_log, repeat_count).format_report())
@@ -0,0 +1,172 @@
+"""
+Random Number Service
+Seeded, per-subsystem random streams so game runs can be reproduced
+"""
+
+import hashlib
+import random
+from typing import Dict, List, Optional
+
+
+# Subsystems that draw random numbers through the service
+SUBSYSTEMS = (
+    "combat",
+    "missions",
+    "economy",
+    "commodity_market",
+    "recycling",
+    "game_engine",
+)
+
+
+class RecordingRandom(random.Random):
+    """
+    Random stream that can record the raw values it produces and play
+    recorded values back. Every higher-level draw (randint, choice,
+    uniform, gauss...) is built from random() and getrandbits(), so a
+    command's recorded draws reproduce its outcome exactly.
+    """
+
+    def __init__(self, x=None):
+        self.tape: Optional[List] = None  # Raw values drawn while recording
+        self.playback: List = []  # Raw values to return before generating new ones
+        self.playback_index = 0
+        super().__init__(x)
+
+    def _next_recorded(self, value_type: type):
+        """Next value from the playback tape, or None when exhausted or out of sync"""
+        if self.playback_index >= len(self.playback):
+            return None
+
+        value = self.playback[self.playback_index]
+        if type(value) is not value_type:
+            # Code no longer draws the way it did when recorded - go live
+            self.playback = []
+            return None
+
+        self.playback_index += 1
+        return value
+
+    # Played-back values still advance the generator, so the stream is where
+    # it was in the recorded run once playback ends
+
+    def random(self) -> float:
+        value = self._next_recorded(float) if self.playback else None
+        generated = super().random()
+        if value is None:
+            value = generated
+        if self.tape is not None:
+            self.tape.append(value)
+        return value
+
+    def getrandbits(self, k: int) -> int:
+        value = self._next_recorded(int) if self.playback else None
+        generated = super().getrandbits(k)
+        if value is None or value >> k:
+            value = generated
+        if self.tape is not None:
+            self.tape.append(value)
+        return value
+
+
+class RNGService:
+    """Hands out one independent seeded random stream per subsystem"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.streams: Dict[str, RecordingRandom] = {}
+        self.recording = False
+
+    def derive_seed(self, name: str) -> int:
+        """Derive a stable 64-bit seed for a named stream from the master seed"""
+        digest = hashlib.sha256(f"{self.seed}:{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def stream(self, name: str) -> random.Random:
+        """
+        Get the random stream for a subsystem.
+        The same object is returned for the lifetime of the service, so
+        modules can hold on to it; reseeding resets it in place.
+        """
+        if name not in self.streams:
+            self.streams[name] = RecordingRandom(self.derive_seed(name))
+            if self.recording:
+                self.streams[name].tape = []
+        return self.streams[name]
+
+    def reseed(self, seed: Optional[int] = None):
+        """Reset every stream from a new master seed (random if None)"""
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        for name, stream in self.streams.items():
+            stream.seed(self.derive_seed(name))
+
+    def start_recording(self):
+        """Start recording raw draws on every stream"""
+        self.recording = True
+        for stream in self.streams.values():
+            stream.tape = []
+
+    def stop_recording(self):
+        """Stop recording raw draws"""
+        self.recording = False
+        for stream in self.streams.values():
+            stream.tape = None
+
+    def take_draws(self) -> Dict[str, List]:
+        """Return the draws recorded since the last call, by stream, and reset"""
+        draws = {}
+        for name, stream in self.streams.items():
+            if stream.tape:
+                draws[name] = stream.tape
+                stream.tape = []
+        return draws
+
+    def start_playback(self, draws: Dict[str, List]):
+        """Make streams return previously recorded draws first"""
+        for name, values in draws.items():
+            stream = self.stream(name)
+            stream.playback = list(values)
+            stream.playback_index = 0
+
+    def stop_playback(self):
+        """Discard any remaining recorded draws"""
+        for stream in self.streams.values():
+            stream.playback = []
+            stream.playback_index = 0
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving (with each stream's position)"""
+        streams = {}
+        for name, stream in self.streams.items():
+            version, internal, gauss_next = stream.getstate()
+            streams[name] = [version, list(internal), gauss_next]
+        return {
+            "seed": self.seed,
+            "streams": streams
+        }
+
+    def load(self, data: Dict):
+        """
+        Restore a saved seed and stream positions. Streams missing from the
+        save (old saves, or streams first used later) start from the seed.
+        """
+        self.reseed(data.get("seed"))
+        for name, (version, internal, gauss_next) in data.get("streams", {}).items():
+            self.stream(name).setstate((version, tuple(internal), gauss_next))
+
+
+# Global service instance
+_rng_service: Optional[RNGService] = None
+
+
+def get_rng_service() -> RNGService:
+    """Get the global RNG service instance"""
+    global _rng_service
+    if _rng_service is None:
+        _rng_service = RNGService()
+    return _rng_service
+
+
+def get_stream(name: str) -> random.Random:
+    """Get the global random stream for a subsystem"""
+    return get_rng_service().stream(name)
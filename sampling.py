@@ -0,0 +1,223 @@
+"""
+Sampling Tables
+Precomputed alias tables for the random picks made over and over during
+play: loot drops, trader inventories, enemy names and ships, station ship
+stock. A table is built once from its catalog and then draws in O(1) with
+a single random number from the caller's stream. Binomial and multinomial
+counts are drawn here too, in pure Python so a seed gives the same counts
+on every install.
+"""
+
+import math
+import random
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from data import MODULES, RESOURCES, RAW_RESOURCES, COMMODITIES, VESSEL_CLASSES, NPC_ENEMY_TEMPLATES
+
+# Station shipyards stock lower tiers more often
+SHIP_TIER_WEIGHTS = {1: 35, 2: 30, 3: 20, 4: 12, 5: 6, 6: 3, 7: 1}
+
+TRADER_SHIPS = ["scout_standard_mk1", "scout_standard_mk2", "hauler_standard_mk1"]
+TRADER_NAMES = [
+    "Wandering Merchant", "Star Trader", "Nomadic Vendor", "Void Merchant",
+    "Freelance Trader", "Independent Dealer", "Cosmic Peddler", "Space Caravan"
+]
+
+
+class AliasTable:
+    """Weighted discrete distribution sampled with Vose's alias method"""
+
+    __slots__ = ("items", "prob", "alias")
+
+    def __init__(self, items: Sequence, weights: Optional[Sequence[float]] = None):
+        self.items = list(items)
+        n = len(self.items)
+        if weights is None:
+            weights = [1.0] * n
+        if len(weights) != n:
+            raise ValueError("items and weights differ in length")
+
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def draw(self, rng: random.Random):
+        """One item, using a single random() draw from rng"""
+        u = rng.random() * len(self.items)
+        column = int(u)
+        return self.items[column] if u - column < self.prob[column] else self.items[self.alias[column]]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def binomial(rng: random.Random, n: int, p: float) -> int:
+    """
+    Successes in n trials of probability p, from rng. Waits between
+    successes when n * p is small and uses Hormann's BTRS rejection
+    sampler otherwise, so any n costs a handful of draws.
+    """
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - binomial(rng, n, 1.0 - p)
+
+    if n * p < 10.0:
+        # Geometric gaps between successes
+        log_q = math.log(1.0 - p)
+        successes = trials = 0
+        while True:
+            trials += math.floor(math.log(1.0 - rng.random()) / log_q) + 1
+            if trials > n:
+                return successes
+            successes += 1
+
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    v_r = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / (1.0 - p))
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        u = rng.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = rng.random()
+        if us >= 0.07 and v <= v_r:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if v > 0.0 and math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+
+def multinomial(rng: random.Random, n: int, probabilities: Sequence[float]) -> List[int]:
+    """Split n draws among outcomes of the given probabilities, one binomial per outcome"""
+    counts = []
+    remaining, rest = n, 1.0
+    for probability in probabilities[:-1]:
+        count = binomial(rng, remaining, probability / rest) if rest > 0.0 else 0
+        counts.append(count)
+        remaining -= count
+        rest -= probability
+    counts.append(remaining)
+    return counts
+
+
+# Built tables by key, with the catalog sizes they were built from
+_tables: Dict[Hashable, Tuple[Tuple[int, ...], AliasTable]] = {}
+
+
+def get_table(key: Hashable, build: Callable[[], Tuple[List, Optional[List[float]]]],
+              sources: Sequence[Dict] = ()) -> AliasTable:
+    """
+    Cached table for key, built by build() -> (items, weights). The table
+    is rebuilt when one of its source catalogs gains or loses entries;
+    call invalidate_tables() after editing catalog entries in place.
+    """
+    stamp = tuple(len(source) for source in sources)
+    cached = _tables.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    items, weights = build()
+    table = AliasTable(items, weights)
+    _tables[key] = (stamp, table)
+    return table
+
+
+def invalidate_tables():
+    """Drop every built table (they rebuild on next use)"""
+    _tables.clear()
+
+
+def module_tier_for_level(player_level: int) -> str:
+    """Module tier dropped by pirates and carried by traders at a player level"""
+    return "t1" if player_level < 10 else "t2"
+
+
+def loot_module_table(player_level: int) -> AliasTable:
+    """Modules pirates can drop at a player level"""
+    tier = module_tier_for_level(player_level)
+    return get_table(("loot_modules", tier), lambda: (
+        [m_id for m_id, m_data in MODULES.items() if tier in m_id and m_data.get("tier", 1) <= 2], None
+    ), (MODULES,))
+
+
+def trader_module_table(player_level: int) -> AliasTable:
+    """Modules traders can carry at a player level"""
+    tier = module_tier_for_level(player_level)
+    return get_table(("trader_modules", tier), lambda: (
+        [m_id for m_id in MODULES if tier in m_id], None
+    ), (MODULES,))
+
+
+def raw_ore_table() -> AliasTable:
+    """Raw ores, equally likely"""
+    return get_table("raw_ores", lambda: (list(RAW_RESOURCES), None), (RAW_RESOURCES,))
+
+
+def refined_resource_table() -> AliasTable:
+    """Refined resources, equally likely"""
+    return get_table("refined_resources", lambda: (
+        [r_id for r_id in RESOURCES if r_id not in RAW_RESOURCES], None
+    ), (RESOURCES, RAW_RESOURCES))
+
+
+def resource_table() -> AliasTable:
+    """All resources (raw and refined), equally likely"""
+    return get_table("resources", lambda: (list(RESOURCES), None), (RESOURCES,))
+
+
+def commodity_table() -> AliasTable:
+    """Commodities, equally likely"""
+    return get_table("commodities", lambda: (list(COMMODITIES), None), (COMMODITIES,))
+
+
+def enemy_name_table(template_key: str) -> AliasTable:
+    """Pirate names of an NPC_ENEMY_TEMPLATES level bracket"""
+    return get_table(("enemy_names", template_key), lambda: (
+        list(NPC_ENEMY_TEMPLATES[template_key]["names"]), None
+    ), (NPC_ENEMY_TEMPLATES[template_key]["names"],))
+
+
+def enemy_ship_table(template_key: str) -> AliasTable:
+    """Pirate ship types of an NPC_ENEMY_TEMPLATES level bracket"""
+    return get_table(("enemy_ships", template_key), lambda: (
+        list(NPC_ENEMY_TEMPLATES[template_key]["ship_types"]), None
+    ), (NPC_ENEMY_TEMPLATES[template_key]["ship_types"],))
+
+
+def trader_name_table() -> AliasTable:
+    """Names of wandering traders"""
+    return get_table("trader_names", lambda: (list(TRADER_NAMES), None), (TRADER_NAMES,))
+
+
+def trader_ship_table() -> AliasTable:
+    """Ship types wandering traders fly"""
+    return get_table("trader_ships", lambda: (list(TRADER_SHIPS), None), (TRADER_SHIPS,))
+
+
+def station_ship_table() -> AliasTable:
+    """Ship types stocked by station shipyards, weighted by tier"""
+    def build():
+        ships = list(VESSEL_CLASSES)
+        weights = [SHIP_TIER_WEIGHTS.get(VESSEL_CLASSES[s].get("tier_num", 1), 1) for s in ships]
+        return ships, weights
+    return get_table("station_ships", build, (VESSEL_CLASSES,))
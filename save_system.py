@@ -1,31 +1,119 @@
 """
 Save and Load System
-Handles game state persistence
+Handles game state persistence.
+
+Each save file starts with a one-line header (a YAML comment holding a
+small JSON object) with the commander, credits, location, play time,
+game time, version and a checksum of the body. Listing save slots reads
+only these headers, so the load screen never parses a full save.
 """
 
-import yaml
+import hashlib
+import json
 import os
-from typing import Optional
-from config import SAVE_FILE
+import re
+import time
+import yaml
+from typing import Dict, List, Optional
+from config import SAVE_FILE, SAVE_DIR, VERSION
+
+HEADER_PREFIX = "# VOID_DOMINION_SAVE "
+SAVE_EXTENSION = ".yaml"
+JOURNAL_EXTENSION = ".journal"
+
+
+def slot_path(slot: str, save_dir: str = SAVE_DIR) -> str:
+    """Path of the save file for a named slot"""
+    return os.path.join(save_dir, slot + SAVE_EXTENSION)
+
+
+def journal_path(filename: str) -> str:
+    """Path of the command journal that belongs to a save file"""
+    return os.path.splitext(filename)[0] + JOURNAL_EXTENSION
+
+
+def new_slot_name(commander: str, save_dir: str = SAVE_DIR) -> str:
+    """Unused slot name derived from a commander name"""
+    base = re.sub(r"[^a-z0-9]+", "_", commander.lower()).strip("_") or "commander"
+    slot = base
+    suffix = 2
+    while os.path.exists(slot_path(slot, save_dir)) or os.path.exists(journal_path(slot_path(slot, save_dir))):
+        slot = f"{base}_{suffix}"
+        suffix += 1
+    return slot
+
+
+def build_save_header(game_state: dict, checksum: str) -> Dict:
+    """Metadata shown on the load screen"""
+    from data import LOCATIONS
+
+    player = game_state.get("player", {})
+    location_id = player.get("location", "")
+    return {
+        "commander": player.get("name", "Unknown"),
+        "credits": player.get("credits", 0),
+        "location": location_id,
+        "location_name": LOCATIONS.get(location_id, {}).get("name", location_id),
+        "play_time": player.get("stats", {}).get("time_played", 0),
+        "game_time": game_state.get("game_time", 0),
+        "version": VERSION,
+        "saved_at": time.time(),
+        "checksum": checksum
+    }
 
 
 def save_game(game_state: dict, filename: str = SAVE_FILE) -> bool:
     """
     Save game state to file.
+    The file is written to a temporary path and moved into place, so a
+    crash mid-save never leaves a half-written save behind.
     Returns True if successful.
     """
     try:
-        with open(filename, 'w') as f:
-            yaml.dump(game_state, f, default_flow_style=False, sort_keys=False)
+        body = yaml.dump(game_state, default_flow_style=False, sort_keys=False)
+        checksum = hashlib.sha256(body.encode()).hexdigest()
+        header = build_save_header(game_state, checksum)
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_file = filename + ".tmp"
+        with open(temp_file, 'w') as f:
+            f.write(HEADER_PREFIX + json.dumps(header) + "\n")
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, filename)
         return True
     except Exception as e:
         print(f"Error saving game: {e}")
         return False
 
 
+def read_save_header(filename: str = SAVE_FILE) -> Optional[Dict]:
+    """
+    Read only the header line of a save file.
+    Returns None for a missing file or a save written before headers existed.
+    """
+    try:
+        with open(filename, 'r') as f:
+            line = f.readline()
+    except OSError:
+        return None
+
+    if not line.startswith(HEADER_PREFIX):
+        return None
+
+    try:
+        return json.loads(line[len(HEADER_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+
+
 def load_game(filename: str = SAVE_FILE) -> Optional[dict]:
     """
-    Load game state from file.
+    Load game state from file, verifying its checksum.
     Returns game state dict if successful, None otherwise.
     """
     if not os.path.exists(filename):
@@ -33,23 +121,124 @@ def load_game(filename: str = SAVE_FILE) -> Optional[dict]:
 
     try:
         with open(filename, 'r') as f:
-            game_state = yaml.safe_load(f)
+            content = f.read()
+
+        header = None
+        body = content
+        if content.startswith(HEADER_PREFIX):
+            header_line, _, body = content.partition("\n")
+            header = json.loads(header_line[len(HEADER_PREFIX):])
+
+        if header and hashlib.sha256(body.encode()).hexdigest() != header.get("checksum"):
+            print(f"Error loading game: {filename} is corrupted (checksum mismatch)")
+            return None
+
+        game_state = yaml.safe_load(body)
         return game_state
     except Exception as e:
         print(f"Error loading game: {e}")
         return None
 
 
-def save_exists(filename: str = SAVE_FILE) -> bool:
-    """Check if save file exists"""
-    return os.path.exists(filename)
+def list_save_slots(save_dir: str = SAVE_DIR) -> List[Dict]:
+    """
+    List save slots, most recently saved first.
+    Each entry is the slot's header plus "slot" and "path". Slots that only
+    have a journal (a new game that crashed before its first save) are
+    listed with "recovery": True.
+    """
+    slots = []
+    if os.path.isdir(save_dir):
+        names = os.listdir(save_dir)
+        for name in names:
+            slot, extension = os.path.splitext(name)
+            path = os.path.join(save_dir, name)
+
+            if extension == SAVE_EXTENSION:
+                header = read_save_header(path)
+                if header is None:
+                    header = _legacy_header(path)
+                entry = dict(header)
+            elif extension == JOURNAL_EXTENSION and slot + SAVE_EXTENSION not in names:
+                entry = _journal_header(path)
+                if not entry:
+                    continue
+                path = slot_path(slot, save_dir)
+            else:
+                continue
+
+            entry["slot"] = slot
+            entry["path"] = path
+            slots.append(entry)
+
+    # Single save file from before save slots existed
+    if os.path.exists(SAVE_FILE) or os.path.exists(journal_path(SAVE_FILE)):
+        header = read_save_header(SAVE_FILE) or _legacy_header(SAVE_FILE) or _journal_header(journal_path(SAVE_FILE))
+        if header:
+            entry = dict(header)
+            entry["slot"] = os.path.splitext(os.path.basename(SAVE_FILE))[0]
+            entry["path"] = SAVE_FILE
+            slots.append(entry)
+
+    slots.sort(key=lambda s: s.get("saved_at", 0), reverse=True)
+    return slots
+
+
+def _legacy_header(filename: str) -> Dict:
+    """Header for a save without one (parses the whole file once)"""
+    if not os.path.exists(filename):
+        return {}
+
+    game_state = load_game(filename) or {}
+    header = build_save_header(game_state, "")
+    header["version"] = None
+    header["saved_at"] = os.path.getmtime(filename)
+    return header
+
+
+def _journal_header(filename: str) -> Dict:
+    """Header for an unsaved game that can be recovered from its journal"""
+    try:
+        with open(filename, 'r') as f:
+            first_record = json.loads(f.readline())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    if first_record.get("command") != "new_game":
+        return {}
+
+    return {
+        "commander": (first_record.get("args") or ["Unknown"])[0],
+        "credits": None,
+        "location": None,
+        "location_name": "Unsaved - recoverable",
+        "play_time": 0,
+        "game_time": first_record.get("clock", {}).get("game_time", 0),
+        "version": VERSION,
+        "saved_at": os.path.getmtime(filename),
+        "checksum": None,
+        "recovery": True
+    }
+
+
+def save_exists(filename: Optional[str] = None) -> bool:
+    """Check if a save file exists (any slot when no filename is given)"""
+    if filename is not None:
+        return os.path.exists(filename)
+
+    if os.path.exists(SAVE_FILE) or os.path.exists(journal_path(SAVE_FILE)):
+        return True
+    return os.path.isdir(SAVE_DIR) and any(
+        os.path.splitext(name)[1] in (SAVE_EXTENSION, JOURNAL_EXTENSION) for name in os.listdir(SAVE_DIR)
+    )
 
 
 def delete_save(filename: str = SAVE_FILE) -> bool:
-    """Delete save file"""
+    """Delete save file and its journal"""
     try:
-        if os.path.exists(filename):
-            os.remove(filename)
+        for path in (filename, journal_path(filename)):
+            if os.path.exists(path):
+                os.remove(path)
         return True
     except Exception as e:
         print(f"Error deleting save: {e}")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test that fleet haul jobs never take more than a market has in stock,
+even when the market's stock drifts down while it was not being watched
+"""
+
+import economy
+from data import RESOURCES
+from game_engine import GameEngine
+from vessels import Vessel
+
+print("=" * 60)
+print("FLEET HAUL STOCK BOUNDS TEST")
+print("=" * 60)
+
+engine = GameEngine()
+engine.new_game("Hauler", seed=4747)
+engine.player.add_credits(100000)
+success, msg, _ = engine.purchase_berth()
+assert success, msg
+success, msg, uid = engine.berth_manager.store_vessel("nexus_prime", Vessel("scout_standard_mk1"))
+assert success, msg
+
+source, destination = "nexus_prime", "forge_station"
+buy_market = engine.economy.get_market(source)
+sell_market = engine.economy.get_market(destination)
+item_id = next(r for r in sorted(RESOURCES) if r in buy_market.prices and r in sell_market.prices
+               and RESOURCES[r].get("volume", 1) <= 1)
+
+# A trade that always pays: cheap at the source, dear at the destination
+base_price = RESOURCES[item_id]["base_price"]
+buy_market.prices[item_id] = base_price * 0.5
+sell_market.prices[item_id] = base_price * 3.0
+
+success, msg = engine.assign_fleet_operation(uid, "haul", [source, destination], item_id)
+assert success, msg
+job = engine.fleet_ops.get(uid)
+
+# Force stock to drain while the markets are unobserved
+original_range = economy.STOCK_CHANGE_MIN, economy.STOCK_CHANGE_MAX
+economy.STOCK_CHANGE_MIN = economy.STOCK_CHANGE_MAX = -1000
+try:
+    for round_number in range(1, 6):
+        buy_market.stock[item_id] = 30
+        buy_market.catch_up()
+        elapsed = job.cycle_time * 3
+        engine.game_time += elapsed
+        engine.economy.update_markets(elapsed)
+
+        before = job.totals.get(item_id, 0)
+        engine.check_fleet_operations()
+        hauled = job.totals.get(item_id, 0) - before
+        stock = buy_market.stock.get(item_id, 0)
+        print(f"  Round {round_number}: hauled {hauled}, source stock now {stock}")
+        assert stock >= 0, f"source stock went negative ({stock})"
+        assert hauled <= 30, "hauled more than the market ever held"
+finally:
+    economy.STOCK_CHANGE_MIN, economy.STOCK_CHANGE_MAX = original_range
+
+# With stock to spare the job still hauls
+buy_market.stock[item_id] = 10000
+buy_market.catch_up()
+before = job.totals.get(item_id, 0)
+engine.game_time += job.cycle_time
+engine.economy.update_markets(job.cycle_time)
+engine.check_fleet_operations()
+assert job.totals.get(item_id, 0) > before, "haul job stopped trading"
+assert buy_market.stock[item_id] >= 0
+
+print(f"\n[OK] Haul jobs stay within market stock ({job.totals.get(item_id, 0)} units hauled in total)")
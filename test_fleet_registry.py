@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test that the fleet registry survives a save/load round-trip with every
+ship's state and indexes intact, and that old berth lists are migrated
+"""
+
+import yaml
+
+from berth_system import BerthManager
+from vessels import Vessel
+
+print("=" * 60)
+print("FLEET REGISTRY SAVE/LOAD TEST")
+print("=" * 60)
+
+manager = BerthManager()
+manager.initialize_shipyard("nexus_prime", "major_station", starting_berths=3)
+manager.initialize_shipyard("forge_station", "standard_station", starting_berths=2)
+
+# The piloted ship, damaged and renamed, with modules installed
+piloted = Vessel("scout_standard_mk1", "Wanderer")
+piloted.install_module("pulse_cannon_t1")
+piloted.install_module("aegis_shield_t1")
+piloted.current_hull_hp = piloted.max_hull_hp * 0.4
+piloted.current_shields = 10
+_, _, manager.fleet.active_uid = manager.store_vessel("nexus_prime", piloted)
+
+# Stored ships: a stock one, and one with a module at another station
+manager.store_ship("nexus_prime", "scout_standard_mk1")
+miner = Vessel("scout_standard_mk1")
+miner.install_module("harvester_drill_t1")
+manager.store_vessel("forge_station", miner)
+
+# Through the save file format and back
+loaded = BerthManager.from_dict(yaml.safe_load(yaml.dump(manager.to_dict())))
+fleet, restored = manager.fleet, loaded.fleet
+
+assert restored.to_dict() == fleet.to_dict(), "saved fleet differs after loading"
+assert restored.active_uid == fleet.active_uid, "piloted ship changed"
+assert restored.next_id == fleet.next_id, "id counter changed"
+assert restored.by_location == fleet.by_location, "location index differs"
+assert restored.by_class == fleet.by_class, "class index differs"
+
+for uid, vessel in fleet.ships.items():
+    copy = restored.get(uid)
+    assert copy.name == vessel.name, f"{uid} name differs"
+    assert abs(copy.current_hull_hp - vessel.current_hull_hp) < 1e-9, f"{uid} hull differs"
+    assert abs(copy.current_shields - vessel.current_shields) < 1e-9, f"{uid} shields differ"
+    assert copy.installed_modules == vessel.installed_modules, f"{uid} modules differ"
+    assert copy.get_stats().to_dict() == vessel.get_stats().to_dict(), f"{uid} stats differ"
+    print(f"  {uid}: {copy.name} at {restored.location_of(uid)} [OK]")
+
+assert restored.find("forge_station", "scout_standard_mk1") == fleet.find("forge_station", "scout_standard_mk1")
+assert loaded.get_berth_overview("nexus_prime")["used"] == 2
+
+# Saves from before the fleet registry list a class id per occupied berth
+legacy = {"shipyards": {"nexus_prime": dict(manager.shipyards["nexus_prime"])}}
+del legacy["shipyards"]["nexus_prime"]["berth_count"]
+legacy["shipyards"]["nexus_prime"]["berths"] = ["scout_standard_mk1", None, "scout_standard_mk1"]
+migrated = BerthManager.from_dict(legacy)
+assert migrated.shipyards["nexus_prime"]["berth_count"] == 3, "legacy berth count lost"
+assert migrated.fleet.count_at("nexus_prime") == 2, "legacy berthed ships not migrated"
+print("  legacy berths: 2 ships in 3 berths [OK]")
+
+print("\n[OK] Fleet registry round-trips through a save and migrates old berth lists")
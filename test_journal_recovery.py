@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test crash recovery from the command journal in a session that started
+from a loaded save: saves must still be written, and commands made after
+the load must be replayed after a crash
+"""
+
+import os
+import tempfile
+
+from data import LOCATIONS
+from game_engine import GameEngine
+
+print("=" * 60)
+print("JOURNAL RECOVERY AFTER LOAD TEST")
+print("=" * 60)
+
+save_dir = tempfile.mkdtemp()
+save_file = os.path.join(save_dir, "journal_test.yaml")
+
+
+def buy_something(engine: GameEngine):
+    """Run one journaled command that spends credits"""
+    commodity_id = next(item["id"] for item in engine.commodity_market.get_market_overview(engine.player.location)
+                        if item["stock"] > 0 and 0 < item["buy_price"] <= 2000 and item["volume"] <= 1)
+    success, msg = engine.buy_commodity(commodity_id, 1)
+    assert success, msg
+
+
+def fight_until_won(engine: GameEngine, max_steps: int = 500) -> int:
+    """Travel toward danger and fight until an encounter is won. Returns journaled steps taken."""
+    kills = engine.player.stats["enemies_destroyed"]
+    for step in range(max_steps):
+        if engine.current_combat:
+            engine.combat_attack()
+            if engine.player.stats["enemies_destroyed"] > kills:
+                return step
+        elif engine.current_trader:
+            engine.dismiss_trader()
+        else:
+            here = engine.player.location
+            destination = max(LOCATIONS[here]["connections"], key=lambda c: LOCATIONS[c].get("danger_level", 0))
+            success, _, _ = engine.travel_to_location(destination)
+            if success:
+                engine.complete_travel(destination)
+    raise AssertionError("no fight won")
+
+
+# Session 1: new game, a few commands, save and quit cleanly
+first = GameEngine()
+first.new_game("Tester", seed=777)
+first.save_file = save_file
+first.enable_journal()
+for _ in range(3):
+    buy_something(first)
+assert first.save_current_game(), "first save failed"
+first.close_journal()
+print(f"\nSession 1 saved at journal seq {first.checkpoint_seq} with {first.player.credits:,} CR")
+
+# Session 2: load, play, save, play on and crash (no close_journal)
+second = GameEngine()
+assert second.load_saved_game(save_file), "load failed"
+second.enable_journal()
+buy_something(second)
+assert second.save_current_game(), "second save failed"
+
+on_disk = GameEngine()
+assert on_disk.load_saved_game(save_file)
+print(f"Session 2 saved with {second.player.credits:,} CR - disk has {on_disk.player.credits:,} CR")
+assert on_disk.player.credits == second.player.credits, "save after load did not reach the disk"
+
+buy_something(second)
+steps = fight_until_won(second)
+crashed_credits = second.player.credits
+crashed_cargo = dict(second.player.inventory)
+crashed_kills = second.player.stats["enemies_destroyed"]
+crashed_location = second.player.location
+print(f"Won a fight after {steps} steps")
+
+# Session 3: recover the crashed session
+recovered = GameEngine()
+assert recovered.load_saved_game(save_file), "recovery load failed"
+print(f"Crashed with {crashed_credits:,} CR - recovered {recovered.player.credits:,} CR")
+assert recovered.player.credits == crashed_credits, "commands after the load were not recovered"
+assert dict(recovered.player.inventory) == crashed_cargo, "recovered cargo differs"
+assert recovered.player.stats["enemies_destroyed"] == crashed_kills, "recovered game is missing a kill"
+assert recovered.player.location == crashed_location, "recovered location differs"
+
+print("\n[OK] Saves after a load are written and later commands, fights included, are recovered")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test that lazy commodity markets reach the same state however often they are read
+"""
+
+from commodity_market import CommodityMarket
+
+LOCATION = "nexus_prime"
+
+print("=" * 60)
+print("LAZY MARKET CATCH-UP TEST")
+print("=" * 60)
+
+often = CommodityMarket(lazy=True, seed=1234)
+
+# Drain a few commodities so restocking has work to do
+drained = sorted(often.markets[LOCATION])[:5]
+for commodity_id in drained:
+    stock = often.markets[LOCATION][commodity_id]["stock"]
+    success, msg, _ = often.buy_commodity(LOCATION, commodity_id, stock)
+    assert success, msg
+once = often.clone()
+
+# Same ten minutes of game time: one market read every 10 seconds, the other read at the end
+for _ in range(60):
+    often.update_markets(10.0)
+    often.get_market_overview(LOCATION)
+once.update_markets(600.0)
+once.get_market_overview(LOCATION)
+
+mismatches = 0
+for commodity_id, read_often in often.markets[LOCATION].items():
+    read_once = once.markets[LOCATION][commodity_id]
+    same = (read_often["stock"] == read_once["stock"]
+            and abs(read_often["supply_level"] - read_once["supply_level"]) < 1e-9
+            and abs(read_often["demand_level"] - read_once["demand_level"]) < 1e-9
+            and abs(read_often["current_price"] - read_once["current_price"]) <= 1)
+    if not same:
+        mismatches += 1
+        print(f"  MISMATCH {commodity_id}: {read_often} vs {read_once}")
+
+for commodity_id in drained:
+    print(f"  {commodity_id}: restocked to {often.markets[LOCATION][commodity_id]['stock']} "
+          f"/ {once.markets[LOCATION][commodity_id]['stock']}")
+
+assert mismatches == 0, f"{mismatches} commodities depend on how often the market was read"
+print(f"\n[OK] {len(often.markets[LOCATION])} commodities match after 60 reads and after 1 read")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test that lazy resource markets reach the same prices and stock however
+often they are read
+"""
+
+from economy import EconomyManager
+
+print("=" * 60)
+print("LAZY RESOURCE MARKET CATCH-UP TEST")
+print("=" * 60)
+
+often = EconomyManager(lazy=True, seed=2626)
+once = often.clone()
+
+# Same ten hours of game time: markets read every 100 seconds, or once at the end
+for _ in range(360):
+    often.update_markets(100.0)
+    for market in often.markets.values():
+        market.get_market_listing()
+once.update_markets(36000.0)
+
+mismatches = 0
+for location_id, read_often in often.markets.items():
+    read_once = once.get_market(location_id)
+    read_once.catch_up()
+    for resource_id, price in read_often.prices.items():
+        if abs(price - read_once.prices[resource_id]) > 1e-9 or read_often.stock[resource_id] != read_once.stock[resource_id]:
+            mismatches += 1
+            print(f"  MISMATCH {location_id}/{resource_id}: {price:.2f} x{read_often.stock[resource_id]} "
+                  f"vs {read_once.prices[resource_id]:.2f} x{read_once.stock[resource_id]}")
+
+sample = next(iter(often.markets.values()))
+resource_id = sorted(sample.prices)[0]
+print(f"\n  {sample.location_id}/{resource_id}: {sample.prices[resource_id]:.2f} CR, {sample.stock[resource_id]} in stock")
+
+assert mismatches == 0, f"{mismatches} quotes depend on how often the market was read"
+print(f"\n[OK] {len(often.markets)} markets match after 360 reads and after 1 read")
@@ -7,6 +7,7 @@ from typing import Optional
 from game_engine import GameEngine
 from data import LOCATIONS, RESOURCES, MODULES, SKILLS, FACTIONS, VESSEL_CLASSES, RAW_RESOURCES
 from combat import create_enemy_vessel
+from combat_estimator import estimate_against_vessel
 from vessels import Vessel
 
 
@@ -133,6 +134,12 @@ class GameUI:
                   f"{self.format_credits(listing['sell_price']):>12} "
                   f"{listing['stock']:>10}")
 
+        events = self.engine.commodity_market.get_active_events(self.engine.player.location)
+        if events:
+            print("\nMarket events (commodity prices):")
+            for event in events:
+                print(f"  {event['description']} - {int(event['remaining'] // 60)}m left")
+
     def show_ships_for_sale(self):
         """Show ships for sale at current station"""
         location_data = LOCATIONS[self.engine.player.location]
@@ -292,8 +299,9 @@ class GameUI:
                 ("map", "Show connected locations"),
                 ("travel <location>", "Travel to location"),
                 ("scan", "Scan current area"),
-                ("mine", "Mine resources at current location"),
+                ("mine [cycles]", "Mine resources at current location"),
                 ("refine", "Refine raw ore into refined resources (interactive)"),
+                ("refine all", "Queue all raw ore in the hold at the refinery"),
                 ("anomaly", "Scan anomalies for research data")
             ],
             "Character": [
@@ -316,12 +324,25 @@ class GameUI:
             ],
             "Combat": [
                 ("attack", "Attack enemy in combat"),
-                ("retreat", "Attempt to flee combat")
+                ("retreat", "Attempt to flee combat"),
+                ("wing [size]", "Engage a pirate wing with your berthed ships")
             ],
             "Vessel": [
                 ("vessel", "Show vessel details"),
                 ("repair", "Repair vessel at station")
             ],
+            "Fleet": [
+                ("fleet", "List your ships and their jobs"),
+                ("fleet mine <ship> <location>", "Mine a field for the ship's home station"),
+                ("fleet haul <ship> <resource> <from> <to>", "Trade a resource between two markets"),
+                ("fleet ferry <ship> <item> <from> <to>", "Move stored items between stations"),
+                ("fleet recall <ship>", "Stop a ship's job")
+            ],
+            "Manufacturing": [
+                ("build <item> [amount]", "Build an item and all its sub-components across production lines"),
+                ("consolidate <item> [amount]", "Plan the fewest trips to gather an item's inputs at one station"),
+                ("recycle all", "Recycle every component and ship in cargo")
+            ],
             "Other": [
                 ("factions", "Show faction information"),
                 ("help", "Show this help text")
@@ -333,6 +354,33 @@ class GameUI:
             for cmd, desc in cmds:
                 print(f"  {cmd:<30} {desc}")
 
+    def handle_fleet_command(self, parts):
+        """Show fleet jobs, or assign and recall them"""
+        if len(parts) == 1:
+            self.print_section("Fleet")
+            for ship in self.engine.get_fleet_operations_status():
+                where = LOCATIONS[ship["location_id"]]["name"]
+                if ship["active"]:
+                    job = "piloting"
+                elif ship["job"]:
+                    job = f"{ship['job']} - {ship['cycles']} cycle(s), next in {ship['next_in']:.0f}s ({ship['totals']})"
+                else:
+                    job = "idle"
+                print(f"  {ship['uid']:<10} {ship['name']:<28} {where:<24} {job}")
+            return
+
+        action = parts[1]
+        if action == "recall" and len(parts) == 3:
+            success, message = self.engine.recall_fleet_ship(parts[2])
+        elif action == "mine" and len(parts) == 4:
+            success, message = self.engine.assign_fleet_operation(parts[2], "mine", [parts[3]])
+        elif action in ("haul", "ferry") and len(parts) == 6:
+            success, message = self.engine.assign_fleet_operation(parts[2], action, parts[4:6], parts[3])
+        else:
+            print("Usage: fleet | fleet mine <ship> <location> | fleet haul|ferry <ship> <item> <from> <to> | fleet recall <ship>")
+            return
+        print(message if success else f"Error: {message}")
+
     def handle_refine_interactive(self, parts):
         """Handle interactive ore refining"""
         # Get all raw ores in player inventory
@@ -345,6 +393,12 @@ class GameUI:
             print("You don't have any raw ore to refine. Go mining to collect raw ores!")
             return
 
+        # "refine all" queues every raw ore in the hold as one refinery job
+        if len(parts) == 2 and parts[1] == "all":
+            success, message = self.engine.queue_refining(raw_ores_available)
+            print(message)
+            return
+
         # If command was "refine <ore> <amount>" (old format), handle it
         if len(parts) >= 3:
             try:
@@ -441,55 +495,28 @@ class GameUI:
         print(f"\n--- Turn {status['turn']} ---")
         print(f"Your Vessel:  Hull {status['player']['hull']} | Shields {status['player']['shields']}")
         print(f"Enemy {status['enemy']['name']}:  Hull {status['enemy']['hull']} | Shields {status['enemy']['shields']}")
+        skill_bonus = self.engine.player.get_skill_bonus("weapons_mastery", "damage")
+        print(f"Estimate: {estimate_against_vessel(self.engine.vessel, combat.enemy_vessel, skill_bonus).get_summary()}")
         print()
 
         if command == "attack":
-            # Player attacks
-            skill_bonus = self.engine.player.get_skill_bonus("weapons_mastery", "damage")
-            result = combat.player_attack(0, skill_bonus)
-            print(result["message"])
-
-            # Enemy counterattacks if alive
-            if combat.is_active:
-                enemy_result = combat.enemy_attack()
-                print(enemy_result["message"])
-
-                # Check if player destroyed
-                if enemy_result.get("player_destroyed"):
-                    print("\n>>> YOU HAVE BEEN DESTROYED <<<")
-                    print("Game Over")
-                    self.running = False
-                    return
-
-            # If enemy destroyed
-            if result.get("enemy_destroyed"):
-                print(f"\n>>> VICTORY! <<<")
-
-                # Rewards
-                reward = combat.enemy_vessel.max_hull_hp * 10
-                self.engine.player.add_credits(reward)
-                self.engine.player.stats["enemies_destroyed"] += 1
-
-                print(f"Reward: {self.format_credits(reward)}")
-
-                # Update contracts
-                for contract in self.engine.contract_board.active_contracts:
-                    if contract.objectives.get("type") == "destroy_enemies":
-                        if contract.update_progress({"enemies_destroyed": 1}):
-                            print(f"Contract '{contract.name}' completed!")
-
-                self.engine.current_combat = None
+            success, message, outcome = self.engine.combat_attack()
+            print(message)
 
-            combat.next_turn()
+            if outcome.get("result") == "destroyed":
+                print("\n>>> YOU HAVE BEEN DESTROYED <<<")
+            elif outcome.get("result") == "victory":
+                print(f"\n>>> VICTORY! <<<")
+                print(f"Reward: {self.format_credits(outcome['credits'])} + {outcome['xp']} XP")
+                if outcome["traveled_to"]:
+                    print(f"Traveled to {LOCATIONS[outcome['traveled_to']]['name']}")
 
         elif command == "retreat":
-            result = combat.attempt_retreat()
-            print(result["message"])
+            success, message, outcome = self.engine.combat_retreat()
+            print(message)
 
-            if result.get("retreated"):
-                self.engine.current_combat = None
-            elif "enemy_attack" in result:
-                print(result["enemy_attack"]["message"])
+            if outcome.get("result") == "destroyed":
+                print("\n>>> YOU HAVE BEEN DESTROYED <<<")
 
         else:
             print("Invalid combat command. Use 'attack' or 'retreat'")
@@ -556,12 +583,39 @@ class GameUI:
             print(message)
 
         elif cmd == "mine":
-            success, message = self.engine.mine_resources()
+            cycles = int(parts[1]) if len(parts) >= 2 and parts[1].isdigit() else 1
+            success, message = self.engine.mine_batch(cycles)
             print(message)
 
+        elif cmd == "wing":
+            wing_size = int(parts[1]) if len(parts) >= 2 and parts[1].isdigit() else 3
+            success, message = self.engine.engage_pirate_wing(wing_size)
+            print(message if success else f"Error: {message}")
+
         elif cmd == "refine":
             self.handle_refine_interactive(parts)
 
+        elif cmd == "build" and len(parts) >= 2:
+            quantity = int(parts[2]) if len(parts) >= 3 and parts[2].isdigit() else 1
+            success, message = self.engine.plan_production(parts[1], quantity)
+            print(message if success else f"Error: {message}")
+
+        elif cmd == "consolidate" and len(parts) >= 2:
+            quantity = int(parts[2]) if len(parts) >= 3 and parts[2].isdigit() else 1
+            success, message = self.engine.plan_consolidation(parts[1], quantity)
+            print(message if success else f"Error: {message}")
+
+        elif cmd == "recycle" and len(parts) >= 2 and parts[1] == "all":
+            items = self.engine.get_recyclable_cargo()
+            expected = self.engine.recycling.expected_recovery(items)
+            if expected:
+                print("Expected: " + ", ".join(f"~{qty:.0f}x {mat}" for mat, qty in expected.items()))
+            success, message = self.engine.recycle_batch(items)
+            print(message if success else f"Error: {message}")
+
+        elif cmd == "fleet":
+            self.handle_fleet_command(parts)
+
         elif cmd == "repair":
             success, message = self.engine.repair_vessel()
             if success:
@@ -0,0 +1,117 @@
+"""
+Universe Templates
+Prebuilt "fresh universe" subsystems (markets, contracts, factions, berths)
+that new games clone instead of generating from scratch.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from economy import EconomyManager, ShipMarket
+from commodity_market import CommodityMarket
+from missions import ContractBoard
+from factions import FactionManager
+from berth_system import BerthManager
+from data import LOCATIONS
+from config import STARTING_LOCATION
+from rng_service import get_rng_service
+
+# Templates kept for reuse (repeated seeds: replays, bots, tests)
+TEMPLATE_CACHE_SIZE = 4
+
+
+class UniverseTemplate:
+    """Starting state of every seeded subsystem for one master seed"""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        rng = get_rng_service()
+        rng.reseed(seed)
+
+        self.economy = EconomyManager()
+        self.commodity_market = CommodityMarket()
+        self.faction_manager = FactionManager()
+
+        self.ship_market = ShipMarket()
+        self.ship_market.initialize_all_stations(LOCATIONS)
+
+        # Shipyards at all locations with shipyard service - 1 berth at the
+        # starting location, 0 elsewhere
+        self.berth_manager = BerthManager()
+        for location_id, location_data in LOCATIONS.items():
+            if "shipyard" in location_data.get("services", []):
+                location_type = "major_station" if location_id == STARTING_LOCATION else "standard_station"
+                starting_berths = 1 if location_id == STARTING_LOCATION else 0
+                self.berth_manager.initialize_shipyard(location_id, location_type, starting_berths)
+
+        # Initial contracts for all locations, at least 1 per location
+        self.contract_board = ContractBoard()
+        self.contract_board.generate_contracts_all_locations(min_per_location=1, max_per_location=3, contracts_completed=0)
+
+        # Where each stream stood after generation, so a clone continues
+        # exactly as a from-scratch build would have
+        self.stream_states = {name: stream.getstate() for name, stream in rng.streams.items()}
+
+    def instantiate(self) -> Dict:
+        """Fresh, independent copies of the template subsystems"""
+        rng = get_rng_service()
+        rng.reseed(self.seed)
+        for name, state in self.stream_states.items():
+            rng.stream(name).setstate(state)
+
+        contract_board = ContractBoard.from_dict(copy.deepcopy(self.contract_board.to_dict()))
+        contract_board.last_refresh = time.time()
+
+        return {
+            "economy": self.economy.clone(),
+            "commodity_market": self.commodity_market.clone(),
+            "faction_manager": FactionManager.from_dict(copy.deepcopy(self.faction_manager.to_dict())),
+            "ship_market": ShipMarket.from_dict(copy.deepcopy(self.ship_market.to_dict())),
+            "berth_manager": BerthManager.from_dict(copy.deepcopy(self.berth_manager.to_dict())),
+            "contract_board": contract_board,
+        }
+
+
+_templates: "OrderedDict[int, UniverseTemplate]" = OrderedDict()
+_prepared_seed: Optional[int] = None
+
+
+def get_universe_template(seed: int) -> UniverseTemplate:
+    """Cached template for a seed, built on first use"""
+    if seed in _templates:
+        _templates.move_to_end(seed)
+        return _templates[seed]
+
+    template = UniverseTemplate(seed)
+    _templates[seed] = template
+    while len(_templates) > TEMPLATE_CACHE_SIZE:
+        _templates.popitem(last=False)
+    return template
+
+
+def prepare_universe(seed: Optional[int] = None) -> int:
+    """
+    Build a template ahead of time (e.g. before asking for a name), so the
+    next unseeded new game starts from it. The build runs synchronously and
+    must not run while a game is in progress - building reseeds the shared
+    random streams.
+    Returns the template's seed.
+    """
+    global _prepared_seed
+    rng = get_rng_service()
+    if seed is None:
+        rng.reseed()
+        seed = rng.seed
+    get_universe_template(seed)
+    _prepared_seed = seed
+    return seed
+
+
+def claim_prepared_seed() -> Optional[int]:
+    """Seed of a prepared, unused template (each is handed out once)"""
+    global _prepared_seed
+    seed = _prepared_seed
+    _prepared_seed = None
+    return seed if seed in _templates else None
@@ -3,175 +3,114 @@ Vessel (Ship) System
 Handles ship stats, modules, damage, and upgrades
 """
 
+from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 from data import VESSEL_CLASSES, MODULES
 import copy
 
 
-class Vessel:
-    """Represents a player's vessel (ship)"""
+class VesselStats:
+    """
+    Derived stats of a vessel - hull values plus every installed module's
+    bonuses, summed in one pass. A read-only snapshot shared by the GUI
+    and combat; Vessel rebuilds it only after its modules change.
+    """
 
-    def __init__(self, vessel_class_id: str, custom_name: Optional[str] = None):
-        if vessel_class_id not in VESSEL_CLASSES:
-            raise ValueError(f"Invalid vessel class: {vessel_class_id}")
+    __slots__ = ("weapons", "weapon_damage", "shield_capacity", "shield_recharge", "armor",
+                 "armor_reduction", "evasion", "speed", "mining_efficiency", "mining_tier", "scan_range")
 
-        self.vessel_class_id = vessel_class_id
-        vessel_data = VESSEL_CLASSES[vessel_class_id]
+    def __init__(self, vessel: 'Vessel'):
+        modules = vessel.installed_modules
 
-        # Basic info
-        self.name = custom_name or vessel_data["name"]
-        self.class_name = vessel_data["name"]
-        self.description = vessel_data["description"]
-        self.class_type = vessel_data["class_type"]
-        self.tier_num = vessel_data.get("tier_num", 1)  # Ship tier (MK1=1, MK2=2, etc.)
+        # Weapons - module data in firing order
+        self.weapons = tuple(MODULES[module_id] for module_id in modules["weapon"])
+        self.weapon_damage = 0
+        for weapon_data in self.weapons:
+            self.weapon_damage += weapon_data.get("damage", 0)
 
-        # Stats
-        self.max_hull_hp = vessel_data["hull_hp"]
-        self.current_hull_hp = self.max_hull_hp
-        self.max_shield_capacity = vessel_data["shield_capacity"]
-        self.current_shields = self.max_shield_capacity
-        self.armor_rating = vessel_data["armor_rating"]
-        self.cargo_capacity = vessel_data["cargo_capacity"]
-        self.base_speed = vessel_data["base_speed"]
-
-        # Module system
-        self.module_slots = copy.deepcopy(vessel_data["module_slots"])
-        self.installed_modules: Dict[str, List[str]] = {
-            "weapon": [],
-            "defense": [],
-            "utility": [],
-            "engine": []
-        }
-
-    def install_module(self, module_id: str, replace_module_id: Optional[str] = None) -> tuple[bool, str, Optional[str]]:
-        """
-        Install a module in available slot
-        Returns: (success, message, replaced_module_id)
-        """
-        if module_id not in MODULES:
-            return False, "Invalid module", None
-
-        module_data = MODULES[module_id]
-        module_type = module_data["type"]
-
-        # Check ship tier restrictions
-        ship_tier_min = module_data.get("ship_tier_min", 1)
-        ship_tier_max = module_data.get("ship_tier_max", 99)
-
-        if self.tier_num < ship_tier_min:
-            return False, f"{module_data['name']} requires a Tier {ship_tier_min}+ ship (your ship is Tier {self.tier_num})", None
-
-        if self.tier_num > ship_tier_max:
-            return False, f"{module_data['name']} can only be installed on Tier {ship_tier_max} or lower ships (your ship is Tier {self.tier_num})", None
-
-        # Check if slot available
-        current_count = len(self.installed_modules[module_type])
-        max_slots = self.module_slots[module_type]
+        # Defense
+        self.shield_capacity = vessel.max_shield_capacity
+        self.shield_recharge = 0
+        self.armor = vessel.armor_rating
+        evasion = 0.1  # Base 10%
+        for module_id in modules["defense"]:
+            module_data = MODULES[module_id]
+            self.shield_capacity += module_data.get("shield_boost", 0)
+            self.shield_recharge += module_data.get("recharge_rate", 0)
+            self.armor += module_data.get("armor_boost", 0)
+            evasion += module_data.get("evasion_boost", 0)
+        self.evasion = min(evasion, 0.75)  # Cap at 75%
+        self.armor_reduction = 1.0 - (self.armor / (self.armor + 1000))
 
-        replaced_module = None
+        # Engines and utilities
+        speed_multiplier = 1.0
+        for module_id in modules["engine"]:
+            speed_multiplier += MODULES[module_id].get("speed_boost", 0)
 
-        if current_count >= max_slots:
-            # Slots are full, need to replace
-            if replace_module_id is None:
-                return False, f"No available {module_type} slots", None
+        self.mining_efficiency = 1.0
+        self.mining_tier = 0
+        self.scan_range = 500  # Base range
+        for module_id in modules["utility"]:
+            module_data = MODULES[module_id]
+            speed_multiplier += module_data.get("speed_boost", 0)
+            if "mining_yield" in module_data:
+                self.mining_efficiency *= module_data["mining_yield"]
+            if "mining_tier" in module_data:
+                self.mining_tier = max(self.mining_tier, module_data["mining_tier"])
+            self.scan_range += module_data.get("scan_range", 0)
+        self.speed = vessel.base_speed * speed_multiplier
 
-            # Verify the module to replace exists and is correct type
-            if replace_module_id not in self.installed_modules[module_type]:
-                return False, f"Module to replace not found in {module_type} slots", None
+    def to_dict(self) -> Dict:
+        """Stats as a dictionary (weapons by name)"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["weapons"] = [weapon["name"] for weapon in self.weapons]
+        return data
 
-            # Replace the module
-            self.installed_modules[module_type].remove(replace_module_id)
-            replaced_module = replace_module_id
 
-        self.installed_modules[module_type].append(module_id)
+class Combatant(ABC):
+    """
+    Combat behaviour shared by player vessels and NPC vessels.
+    Subclasses provide get_stats() plus max_hull_hp, current_hull_hp and
+    current_shields.
+    """
 
-        if replaced_module:
-            replaced_name = MODULES[replaced_module]["name"]
-            return True, f"Installed {module_data['name']}, replaced {replaced_name}", replaced_module
-        else:
-            return True, f"Installed {module_data['name']}", None
+    __slots__ = ()
 
-    def uninstall_module(self, module_id: str, module_type: str) -> tuple[bool, str]:
-        """Uninstall a module"""
-        if module_id in self.installed_modules[module_type]:
-            self.installed_modules[module_type].remove(module_id)
-            return True, f"Uninstalled module"
-        return False, "Module not found"
+    @abstractmethod
+    def get_stats(self) -> VesselStats:
+        """Derived stats of the vessel"""
 
     def get_total_weapon_damage(self) -> float:
         """Calculate total weapon damage"""
-        total_damage = 0
-        for module_id in self.installed_modules["weapon"]:
-            module_data = MODULES[module_id]
-            total_damage += module_data.get("damage", 0)
-        return total_damage
+        return self.get_stats().weapon_damage
 
     def get_total_shield_capacity(self) -> float:
         """Calculate total shield capacity with bonuses"""
-        total = self.max_shield_capacity
-        for module_id in self.installed_modules["defense"]:
-            module_data = MODULES[module_id]
-            total += module_data.get("shield_boost", 0)
-        return total
+        return self.get_stats().shield_capacity
 
     def get_total_armor(self) -> float:
         """Calculate total armor rating"""
-        total = self.armor_rating
-        for module_id in self.installed_modules["defense"]:
-            module_data = MODULES[module_id]
-            total += module_data.get("armor_boost", 0)
-        return total
+        return self.get_stats().armor
 
     def get_evasion_chance(self) -> float:
         """Calculate evasion chance"""
-        evasion = 0.1  # Base 10%
-        for module_id in self.installed_modules["defense"]:
-            module_data = MODULES[module_id]
-            evasion += module_data.get("evasion_boost", 0)
-        return min(evasion, 0.75)  # Cap at 75%
+        return self.get_stats().evasion
 
     def get_effective_speed(self) -> float:
         """Calculate effective speed with modules"""
-        speed = self.base_speed
-        speed_multiplier = 1.0
-
-        # Engine modules
-        for module_id in self.installed_modules["engine"]:
-            module_data = MODULES[module_id]
-            speed_multiplier += module_data.get("speed_boost", 0)
-
-        # Utility modules
-        for module_id in self.installed_modules["utility"]:
-            module_data = MODULES[module_id]
-            speed_multiplier += module_data.get("speed_boost", 0)
-
-        return speed * speed_multiplier
+        return self.get_stats().speed
 
     def get_mining_efficiency(self) -> float:
         """Calculate mining yield multiplier"""
-        efficiency = 1.0
-        for module_id in self.installed_modules["utility"]:
-            module_data = MODULES[module_id]
-            if "mining_yield" in module_data:
-                efficiency *= module_data["mining_yield"]
-        return efficiency
+        return self.get_stats().mining_efficiency
 
     def get_mining_tier(self) -> int:
         """Get the highest mining tier available from installed modules"""
-        max_tier = 0
-        for module_id in self.installed_modules["utility"]:
-            module_data = MODULES[module_id]
-            if "mining_tier" in module_data:
-                max_tier = max(max_tier, module_data["mining_tier"])
-        return max_tier
+        return self.get_stats().mining_tier
 
     def get_scan_range(self) -> float:
         """Calculate sensor scan range"""
-        scan_range = 500  # Base range
-        for module_id in self.installed_modules["utility"]:
-            module_data = MODULES[module_id]
-            scan_range += module_data.get("scan_range", 0)
-        return scan_range
+        return self.get_stats().scan_range
 
     def take_damage(self, damage: float, damage_type: str = "normal") -> Dict:
         """Apply damage to vessel. Returns damage report."""
@@ -186,8 +125,7 @@ class Vessel:
             shield_damage = 0
 
         # Remaining damage goes to hull, reduced by armor
-        armor_reduction = 1.0 - (self.get_total_armor() / (self.get_total_armor() + 1000))
-        hull_damage = damage * armor_reduction
+        hull_damage = damage * self.get_stats().armor_reduction
 
         self.current_hull_hp -= hull_damage
         self.current_hull_hp = max(0, self.current_hull_hp)
@@ -227,6 +165,120 @@ class Vessel:
             return 0
         return (self.current_shields / max_shields) * 100
 
+
+class Vessel(Combatant):
+    """Represents a player's vessel (ship)"""
+
+    def __init__(self, vessel_class_id: str, custom_name: Optional[str] = None):
+        if vessel_class_id not in VESSEL_CLASSES:
+            raise ValueError(f"Invalid vessel class: {vessel_class_id}")
+
+        self.vessel_class_id = vessel_class_id
+        vessel_data = VESSEL_CLASSES[vessel_class_id]
+
+        # Basic info
+        self.name = custom_name or vessel_data["name"]
+        self.class_name = vessel_data["name"]
+        self.description = vessel_data["description"]
+        self.class_type = vessel_data["class_type"]
+        self.tier_num = vessel_data.get("tier_num", 1)  # Ship tier (MK1=1, MK2=2, etc.)
+
+        # Stats
+        self.max_hull_hp = vessel_data["hull_hp"]
+        self.current_hull_hp = self.max_hull_hp
+        self.max_shield_capacity = vessel_data["shield_capacity"]
+        self.current_shields = self.max_shield_capacity
+        self.armor_rating = vessel_data["armor_rating"]
+        self.cargo_capacity = vessel_data["cargo_capacity"]
+        self.base_speed = vessel_data["base_speed"]
+
+        # Module system - change modules through install_module/uninstall_module
+        # (or call invalidate_stats) so the derived stats stay current
+        self._stats: Optional[VesselStats] = None
+        self.module_slots = copy.deepcopy(vessel_data["module_slots"])
+        self.installed_modules: Dict[str, List[str]] = {
+            "weapon": [],
+            "defense": [],
+            "utility": [],
+            "engine": []
+        }
+
+    @property
+    def installed_modules(self) -> Dict[str, List[str]]:
+        return self._installed_modules
+
+    @installed_modules.setter
+    def installed_modules(self, modules: Dict[str, List[str]]):
+        self._installed_modules = modules
+        self._stats = None
+
+    def get_stats(self) -> VesselStats:
+        """Derived stats snapshot, rebuilt only after module changes"""
+        if self._stats is None:
+            self._stats = VesselStats(self)
+        return self._stats
+
+    def invalidate_stats(self):
+        """Discard the derived stats after changing modules or hull values"""
+        self._stats = None
+
+    def install_module(self, module_id: str, replace_module_id: Optional[str] = None) -> tuple[bool, str, Optional[str]]:
+        """
+        Install a module in available slot
+        Returns: (success, message, replaced_module_id)
+        """
+        if module_id not in MODULES:
+            return False, "Invalid module", None
+
+        module_data = MODULES[module_id]
+        module_type = module_data["type"]
+
+        # Check ship tier restrictions
+        ship_tier_min = module_data.get("ship_tier_min", 1)
+        ship_tier_max = module_data.get("ship_tier_max", 99)
+
+        if self.tier_num < ship_tier_min:
+            return False, f"{module_data['name']} requires a Tier {ship_tier_min}+ ship (your ship is Tier {self.tier_num})", None
+
+        if self.tier_num > ship_tier_max:
+            return False, f"{module_data['name']} can only be installed on Tier {ship_tier_max} or lower ships (your ship is Tier {self.tier_num})", None
+
+        # Check if slot available
+        current_count = len(self.installed_modules[module_type])
+        max_slots = self.module_slots[module_type]
+
+        replaced_module = None
+
+        if current_count >= max_slots:
+            # Slots are full, need to replace
+            if replace_module_id is None:
+                return False, f"No available {module_type} slots", None
+
+            # Verify the module to replace exists and is correct type
+            if replace_module_id not in self.installed_modules[module_type]:
+                return False, f"Module to replace not found in {module_type} slots", None
+
+            # Replace the module
+            self.installed_modules[module_type].remove(replace_module_id)
+            replaced_module = replace_module_id
+
+        self.installed_modules[module_type].append(module_id)
+        self._stats = None
+
+        if replaced_module:
+            replaced_name = MODULES[replaced_module]["name"]
+            return True, f"Installed {module_data['name']}, replaced {replaced_name}", replaced_module
+        else:
+            return True, f"Installed {module_data['name']}", None
+
+    def uninstall_module(self, module_id: str, module_type: str) -> tuple[bool, str]:
+        """Uninstall a module"""
+        if module_id in self.installed_modules[module_type]:
+            self.installed_modules[module_type].remove(module_id)
+            self._stats = None
+            return True, f"Uninstalled module"
+        return False, "Module not found"
+
     def get_total_cargo_volume(self) -> float:
         """Calculate used cargo volume"""
         # This would be calculated from actual cargo in a full implementation
@@ -273,3 +325,54 @@ class Vessel:
         vessel.current_shields = data["current_shields"]
         vessel.installed_modules = data["installed_modules"]
         return vessel
+
+
+class NPCVessel(Combatant):
+    """
+    Compact vessel for NPCs (pirates, traders). Holds only what combat
+    needs; the installed modules and derived stats are shared with the
+    prototype it was cloned from and never change.
+    """
+
+    __slots__ = ("vessel_class_id", "name", "class_name", "installed_modules", "_stats",
+                 "max_hull_hp", "current_hull_hp", "current_shields")
+
+    def __init__(self, vessel_class_id: str, installed_modules: Dict[str, List[str]], stats: VesselStats,
+                 max_hull_hp: float, current_shields: float):
+        class_name = VESSEL_CLASSES[vessel_class_id]["name"]
+        self.vessel_class_id = vessel_class_id
+        self.name = class_name
+        self.class_name = class_name
+        self.installed_modules = installed_modules
+        self._stats = stats
+        self.max_hull_hp = max_hull_hp
+        self.current_hull_hp = max_hull_hp
+        self.current_shields = current_shields
+
+    @classmethod
+    def from_vessel(cls, vessel: Vessel) -> 'NPCVessel':
+        """Prototype from a fully built vessel"""
+        npc = cls(vessel.vessel_class_id, vessel.installed_modules, vessel.get_stats(),
+                  vessel.max_hull_hp, vessel.current_shields)
+        npc.current_hull_hp = vessel.current_hull_hp
+        return npc
+
+    def get_stats(self) -> VesselStats:
+        return self._stats
+
+    def clone(self, hull_scale: float = 1.0, shield_scale: float = 1.0) -> 'NPCVessel':
+        """Fresh copy with scaled hull and shields"""
+        npc = NPCVessel(self.vessel_class_id, self.installed_modules, self._stats,
+                        self.max_hull_hp * hull_scale, self.current_shields * shield_scale)
+        npc.current_hull_hp = self.current_hull_hp * hull_scale
+        return npc
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for saving"""
+        return {
+            "vessel_class_id": self.vessel_class_id,
+            "installed_modules": self.installed_modules,
+            "max_hull_hp": self.max_hull_hp,
+            "current_hull_hp": self.current_hull_hp,
+            "current_shields": self.current_shields
+        }